@@ -0,0 +1,289 @@
+"""
+Asyncio transaction pipeline for GrowPod Empire
+Async suggested params, submission, confirmation and state reads, plus async
+versions of the pod operations, so thousands of operations can be in flight
+from one event loop.
+
+algosdk's HTTP calls are blocking; AsyncAlgod runs them on its own thread pool
+and never on the loop. Work shared by every in-flight operation is done once:
+- suggested params are fetched at most once per PARAMS_TTL seconds;
+- one round watcher (status_after_block) wakes every operation waiting for the
+  next round, so confirmation costs one pending-info read per operation per round.
+
+AsyncAlgod.connect accepts the same ALGOD_ADDRESS as the scripts: one URL, or a
+comma-separated list that is served through a multinode.MultiNodeClient.
+
+The operations raise instead of printing or exiting, and keep the scripts'
+leases, fees and metrics phases.
+"""
+from algosdk import account, mnemonic
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import ApplicationNoOpTxn, AssetTransferTxn, PaymentTxn, assign_group_id
+from concurrent.futures import ThreadPoolExecutor
+from fees import set_group_fees
+from functools import partial
+from metrics import phase, record_success
+from model import BREED_BURN, CLEANUP_BURN, pod_key
+from multinode import connect
+from statecodec import LocalState, read_local
+from submit import (
+    align_lease_window,
+    broadcast,
+    call_with_retry,
+    confirmed_in_blocks,
+    operation_lease,
+    outcome_step,
+    OperationExpiredError,
+    TransactionRejectedError,
+    MAX_ATTEMPTS,
+    CONFIRMED,
+    EXPIRED,
+    IN_LEDGER,
+    LOOKUP,
+    REJECTED,
+    RESEND
+)
+import asyncio
+import copy
+import time
+
+MAX_THREADS = 64  # Concurrent blocking HTTP calls
+PARAMS_TTL = 1.0  # Seconds suggested params are shared between operations
+CLEANUP_ALGO_FEE = 1_000_000  # 1 ALGO in microAlgos (mirrored from clean.py)
+
+
+class AsyncAlgod:
+    """Asyncio facade over an algosdk AlgodClient (or a multinode.MultiNodeClient)."""
+
+    def __init__(self, algod_client, max_threads: int = MAX_THREADS):
+        self.client = algod_client
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="algod")
+        self.last_round = None
+        self._round_task = None
+        self._params_task = None
+        self._params_at = 0.0
+
+    @classmethod
+    def connect(cls, addresses: str, token: str = "", max_threads: int = MAX_THREADS) -> "AsyncAlgod":
+        """Build an AsyncAlgod for one algod URL or a comma-separated list of them."""
+        return cls(connect(addresses, token), max_threads)
+
+    async def __aenter__(self) -> "AsyncAlgod":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+    async def call(self, fn, *args, max_attempts: int = MAX_ATTEMPTS, **kwargs):
+        """Run a blocking algod call (with transient retries) off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(call_with_retry, fn, *args, max_attempts=max_attempts, **kwargs)
+        )
+
+    # ---------- params and rounds ----------
+
+    async def suggested_params(self):
+        """Suggested params, shared by all callers within PARAMS_TTL seconds."""
+        if self._params_task is None or (self._params_task.done() and time.monotonic() - self._params_at > PARAMS_TTL):
+            self._params_at = time.monotonic()
+            self._params_task = asyncio.ensure_future(self.call(self.client.suggested_params))
+        try:
+            params = await asyncio.shield(self._params_task)
+        except Exception:
+            self._params_task = None  # Let the next caller retry
+            raise
+        return copy.copy(params)
+
+    async def leased_params(self):
+        """Suggested params aligned to the lease bucket (see submit.leased_params)."""
+        return align_lease_window(await self.suggested_params())
+
+    async def _next_round(self) -> int:
+        if self.last_round is None:
+            status = await self.call(self.client.status)
+        else:
+            status = await self.call(self.client.status_after_block, self.last_round)
+        self.last_round = max(self.last_round or 0, status['last-round'])
+        return self.last_round
+
+    async def current_round(self) -> int:
+        """Latest round seen by the watcher (read once if not yet known)."""
+        if self.last_round is None:
+            await self.wait_for_round_after(-1)
+        return self.last_round
+
+    async def wait_for_round_after(self, round_num: int) -> int:
+        """Wait until a round after `round_num`; one status call serves all waiters."""
+        while self.last_round is None or self.last_round <= round_num:
+            if self._round_task is None or self._round_task.done():
+                self._round_task = asyncio.ensure_future(self._next_round())
+            await asyncio.shield(self._round_task)
+        return self.last_round
+
+    # ---------- submission ----------
+
+    async def send(self, signed_txns: list, method: str = None) -> str:
+        """Broadcast a signed group; returns submit.broadcast's SENT, IN_POOL or IN_LEDGER."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(broadcast, self.client, signed_txns, method=method))
+
+    async def confirm(self, signed_txns: list, method: str = None, in_ledger: bool = False) -> dict:
+        """
+        Wait for a sent group's outcome, rebroadcasting if the node loses it.
+
+        Each round is decided by submit.outcome_step, as in submit_with_retry.
+
+        Raises:
+            TransactionRejectedError: The node rejected the group
+            OperationExpiredError: The window passed; the group did not execute
+            OutcomeUnknownError: Reported committed but not found in its blocks
+        """
+        txid = signed_txns[0].get_txid()
+        last_valid = max(stxn.transaction.last_valid_round for stxn in signed_txns)
+        current_round = await self.current_round()
+        while True:
+            if not in_ledger:
+                # Nothing confirms before the next round; don't poll for it
+                current_round = await self.wait_for_round_after(current_round)
+            try:
+                pending = await self.call(self.client.pending_transaction_info, txid)
+            except AlgodHTTPError as e:
+                if e.code != 404:
+                    raise
+                pending = {}
+
+            step = outcome_step(pending, current_round, last_valid, in_ledger)
+            if step == CONFIRMED:
+                return pending
+            if step == REJECTED:
+                raise TransactionRejectedError(f"Transaction rejected: {pending['pool-error']}")
+            if step == LOOKUP:
+                latest = (await self.call(self.client.status))['last-round']
+                return await self.call(confirmed_in_blocks, self.client, signed_txns, max(current_round, latest))
+            if step == EXPIRED:
+                raise OperationExpiredError(f"{txid} not confirmed by round {last_valid}; safe to rebuild")
+            if step == RESEND:
+                in_ledger = await self.send(signed_txns, method) == IN_LEDGER
+
+    async def submit(self, signed_txns: list, method: str = "submit") -> dict:
+        """Send a signed group and wait for it, at most once (see submit.submit_with_retry)."""
+        with phase(method, "send_transaction"):
+            sent = await self.send(signed_txns, method)
+        with phase(method, "wait_for_confirmation"):
+            confirmed = await self.confirm(signed_txns, method, sent == IN_LEDGER)
+        record_success(method)
+        return confirmed
+
+    # ---------- state ----------
+
+    async def account_info(self, address: str) -> dict:
+        return await self.call(self.client.account_info, address)
+
+    async def application_info(self, app_id: int) -> dict:
+        return await self.call(self.client.application_info, app_id)
+
+    async def local_state(self, address: str, app_id: int) -> LocalState:
+        """Typed local state of an account (all zero if not opted in), from one msgpack read."""
+        return await self.call(read_local, self.client, address, app_id) or LocalState()
+
+
+def _keys(user_mnemonic: str) -> tuple:
+    private_key = mnemonic.to_private_key(user_mnemonic)
+    return private_key, account.address_from_private_key(private_key)
+
+
+async def _app_call(algod: AsyncAlgod, user_mnemonic: str, app_id: int, method: str) -> dict:
+    """Single NoOp call with no arguments, signed and confirmed."""
+    private_key, sender = _keys(user_mnemonic)
+    with phase(method, "suggested_params"):
+        params = await algod.suggested_params()
+    txn = ApplicationNoOpTxn(sender, params, app_id, app_args=[method])
+    set_group_fees([txn], params)
+    with phase(method, "sign"):
+        signed_txn = txn.sign(private_key)
+    return await algod.submit([signed_txn], method)
+
+
+async def plant_mystery_seed(algod: AsyncAlgod, user_mnemonic: str, app_id: int, pod: int = 1) -> dict:
+    """Async mint.plant_mystery_seed: call mint_pod to start a growth cycle."""
+    return await _app_call(algod, user_mnemonic, app_id, pod_key("mint_pod", pod))
+
+
+async def water_plant(algod: AsyncAlgod, user_mnemonic: str, app_id: int, pod: int = 1) -> dict:
+    """Async water.water_plant (the contract enforces stage and cooldown)."""
+    return await _app_call(algod, user_mnemonic, app_id, pod_key("water", pod))
+
+
+async def harvest_plant(algod: AsyncAlgod, user_mnemonic: str, app_id: int, pod: int = 1) -> dict:
+    """Async harvest.harvest_plant: mint the pod's $BUD yield."""
+    return await _app_call(algod, user_mnemonic, app_id, pod_key("harvest", pod))
+
+
+async def cleanup_pod(algod: AsyncAlgod, user_mnemonic: str, app_id: int, bud_asset_id: int,
+                      app_address: str, pod: int = 1) -> dict:
+    """
+    Async clean.cleanup_pod: pay 1 ALGO + burn 500 $BUD and reset the pod.
+
+    The burn is leased on the pod's DNA like the script, so a rerun of the same
+    cycle raises DuplicateOperationError instead of burning again.
+    """
+    private_key, sender = _keys(user_mnemonic)
+    with phase("cleanup", "suggested_params"):
+        params, state = await asyncio.gather(algod.leased_params(), algod.local_state(sender, app_id))
+    lease = operation_lease(sender, app_id, "cleanup", pod, cycle=state.get(pod_key("dna", pod), b""))
+
+    txn_group = [
+        PaymentTxn(sender, params, app_address, CLEANUP_ALGO_FEE),
+        # Must sit directly before the app call: the contract checks Gtxn[index - 1]
+        AssetTransferTxn(sender, params, app_address, CLEANUP_BURN, bud_asset_id, lease=lease),
+        ApplicationNoOpTxn(sender, params, app_id, app_args=[pod_key("cleanup", pod)]),
+    ]
+    set_group_fees(txn_group, params)
+    assign_group_id(txn_group)
+    with phase("cleanup", "sign"):
+        signed = [txn.sign(private_key) for txn in txn_group]
+    return await algod.submit(signed, "cleanup")
+
+
+async def breed_plants(algod: AsyncAlgod, user_mnemonic: str, app_id: int, parent1_id: int,
+                       parent2_id: int, bud_asset_id: int, app_address: str, nonce: int = 0) -> dict:
+    """Async breed.breed_plants: burn 1,000 $BUD, leased on (parents, nonce)."""
+    private_key, sender = _keys(user_mnemonic)
+    with phase("breed", "suggested_params"):
+        params = await algod.leased_params()
+    lease = operation_lease(
+        sender, app_id, "breed",
+        cycle=parent1_id.to_bytes(8, 'big') + parent2_id.to_bytes(8, 'big') + nonce.to_bytes(8, 'big')
+    )
+
+    txn_group = [
+        AssetTransferTxn(sender, params, app_address, BREED_BURN, bud_asset_id, lease=lease),
+        ApplicationNoOpTxn(sender, params, app_id, app_args=[
+            "breed", parent1_id.to_bytes(8, 'big'), parent2_id.to_bytes(8, 'big')
+        ]),
+    ]
+    set_group_fees(txn_group, params)
+    assign_group_id(txn_group)
+    with phase("breed", "sign"):
+        signed = [txn.sign(private_key) for txn in txn_group]
+    return await algod.submit(signed, "breed")
+
+
+async def gather_limited(coros, limit: int) -> list:
+    """
+    Run coroutines with at most `limit` in flight.
+
+    Returns:
+        list: Result or raised exception per coroutine, in order
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
@@ -0,0 +1,129 @@
+"""
+App configuration resolver for GrowPod Empire
+Resolves everything the scripts need from just the app ID: the app address is
+derived locally, and owner, asset IDs and costs come from one global-state read.
+
+Results are cached on disk per (algod address, app ID). A cached entry is used
+without any round trip for CONFIG_TTL seconds; after that one application read
+revalidates it, and a changed approval program hash (app update) replaces it.
+Deploy and set_asa_ids write/invalidate the cache directly.
+"""
+from algosdk import encoding
+from algosdk.logic import get_application_address
+from typing import NamedTuple
+import hashlib
+import json
+import os
+import time
+
+CACHE_PATH = os.getenv(
+    "GROWPOD_CONFIG_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".growpod_config.json")
+)
+CONFIG_TTL = int(os.getenv("GROWPOD_CONFIG_TTL", "600"))
+
+
+class AppConfig(NamedTuple):
+    app_id: int
+    app_address: str
+    owner: str
+    bud_asset: int
+    terp_asset: int
+    slot_asset: int
+    cleanup_cost: int
+    breed_cost: int
+    approval_hash: str  # sha256 of the approval program, hex
+
+
+def decode_state(key_values: list) -> dict:
+    """Decode an algod global/local state list into {key: int or bytes}."""
+    state = {}
+    for kv in key_values:
+        key = encoding.base64.b64decode(kv['key']).decode('utf-8', errors='replace')
+        value = kv['value']
+        state[key] = value.get('uint', 0) if value['type'] == 2 else encoding.base64.b64decode(value.get('bytes', ''))
+    return state
+
+
+def config_from_state(app_id: int, state, approval_program: bytes) -> AppConfig:
+    """Build the config from decoded global state (dict or statecodec.GlobalState)."""
+    owner = state.get('owner', b"")
+    return AppConfig(
+        app_id,
+        get_application_address(app_id),
+        encoding.encode_address(owner) if len(owner) == 32 else "",
+        state.get('bud_asset', 0),
+        state.get('terp_asset', 0),
+        state.get('slot_asset', 0),
+        state.get('cleanup_cost', 0),
+        state.get('breed_cost', 0),
+        hashlib.sha256(approval_program).hexdigest(),
+    )
+
+
+def config_from_app_info(app_info: dict) -> AppConfig:
+    """Build the config from an application_info response."""
+    params = app_info['params']
+    return config_from_state(
+        app_info['id'],
+        decode_state(params.get('global-state', [])),
+        encoding.base64.b64decode(params['approval-program']),
+    )
+
+
+def _cache_key(algod_client, app_id: int) -> str:
+    return f"{getattr(algod_client, 'algod_address', '')}#{app_id}"
+
+
+def _load_cache(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(path: str, cache: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def store(algod_client, config: AppConfig, path: str = CACHE_PATH) -> None:
+    """Write a freshly read config to the cache."""
+    cache = _load_cache(path)
+    cache[_cache_key(algod_client, config.app_id)] = {"resolved_at": int(time.time()), **config._asdict()}
+    _write_cache(path, cache)
+
+
+def invalidate(algod_client, app_id: int, path: str = CACHE_PATH) -> None:
+    """Drop the cached config (e.g. after set_asa_ids changes global state)."""
+    cache = _load_cache(path)
+    if cache.pop(_cache_key(algod_client, app_id), None) is not None:
+        _write_cache(path, cache)
+
+
+def resolve(algod_client, app_id: int, refresh: bool = False, path: str = CACHE_PATH) -> AppConfig:
+    """
+    Resolve the app's configuration, from cache when fresh.
+
+    Args:
+        algod_client: Algod client (its address scopes the cache entry)
+        app_id: GrowPod smart contract application ID
+        refresh: Ignore the TTL and re-read global state
+        path: Cache file
+
+    Returns:
+        AppConfig: Resolved configuration
+    """
+    cache = _load_cache(path)
+    entry = cache.get(_cache_key(algod_client, app_id))
+    if entry and not refresh and time.time() - entry["resolved_at"] < CONFIG_TTL:
+        return AppConfig(**{field: entry[field] for field in AppConfig._fields})
+
+    config = config_from_app_info(algod_client.application_info(app_id))
+    if entry and entry.get("approval_hash") != config.approval_hash:
+        print(f"Note: app {app_id} was updated since it was cached; configuration refreshed.")
+    store(algod_client, config, path)
+    return config
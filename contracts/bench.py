@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for GrowPod Empire
+Drives the pod lifecycle through the real scripts against the local algod
+stand-in and writes throughput, latency, RPC and memory figures to a JSON file
+that can be compared between commits.
+
+Each scenario simulates N accounts; every operation runs for all accounts
+concurrently before the next one starts:
+    mint_pod_nft -> plant_mystery_seed -> water_plant x10 -> harvest_plant
+    -> check_and_mint_terp -> cleanup_pod -> breed_plants
+"""
+from algosdk import account, mnemonic
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from localnode import LocalNode
+from metrics import Histogram, failure_reason
+from model import WATER_COOLDOWN, initial_local_state
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_SCALES = (1, 100, 10_000)
+DEFAULT_WORKERS = 32
+DEFAULT_ROUND_TIME = 0.05
+
+# $BUD units credited to every simulated account (covers cleanup + breed)
+ACCOUNT_BUD = 10_000_000_000
+WATER_PASSES = 10
+
+
+def load_scripts(algod_address: str) -> dict:
+    """
+    Import the scripts with their module-level clients pointed at the stand-in.
+
+    Their journal and config cache go to a scratch directory, so a run leaves
+    no stand-in groups or app configs next to the real ones.
+    """
+    os.environ["ALGOD_ADDRESS"] = algod_address
+    os.environ["ALGOD_TOKEN"] = ""
+    state_dir = tempfile.mkdtemp(prefix="growpod-bench-")
+    os.environ["GROWPOD_JOURNAL"] = os.path.join(state_dir, "journal")
+    os.environ["GROWPOD_CONFIG_CACHE"] = os.path.join(state_dir, "config.json")
+    return {name: importlib.import_module(name) for name in ("deploy", "mint", "water", "harvest", "clean", "breed")}
+
+
+def lifecycle(scripts: dict, app: dict) -> list:
+    """(operation, transactions per call, passes, callable(mnemonic)) in lifecycle order."""
+    mint, water, harvest = scripts["mint"], scripts["water"], scripts["harvest"]
+    clean, breed = scripts["clean"], scripts["breed"]
+    return [
+        ("mint_pod_nft", 1, 1, lambda mn: mint.mint_pod_nft(mn, 1, app["address"])),
+        ("plant_mystery_seed", 1, 1, lambda mn: mint.plant_mystery_seed(mn, app["id"])),
+        ("water_plant", 1, WATER_PASSES, lambda mn: water.water_plant(mn, app["id"])),
+        ("harvest_plant", 1, 1, lambda mn: harvest.harvest_plant(mn, app["id"])),
+        ("check_and_mint_terp", 1, 1, lambda mn: harvest.check_and_mint_terp(mn, app["id"])),
+        ("cleanup_pod", 3, 1, lambda mn: clean.cleanup_pod(mn, app["id"], app["bud"], app["address"])),
+        ("breed_plants", 2, 1, lambda mn: breed.breed_plants(mn, app["id"], 1, 2, app["bud"], app["address"])),
+    ]
+
+
+def deploy_app(node: LocalNode, scripts: dict) -> dict:
+    """Deploy and bootstrap the contract from a freshly funded creator."""
+    deploy = scripts["deploy"]
+    private_key, address = account.generate_account()
+    creator = mnemonic.from_private_key(private_key)
+    node.ledger.fund(address)
+
+    approval_path, clear_path = deploy.compile_contract()
+    app_id, app_address = deploy.deploy_contract(creator, approval_path, clear_path)
+    deploy.fund_app_address(creator, app_address, 1.0)
+    bud, terp, slot = deploy.bootstrap_tokens(creator, app_id)
+    return {"id": app_id, "address": app_address, "bud": bud, "terp": terp, "slot": slot}
+
+
+def create_accounts(node: LocalNode, app: dict, count: int) -> list:
+    """
+    Create funded accounts already opted in to the app and its assets.
+
+    Setup is written straight into the stand-in's ledger so it stays out of
+    the measurements.
+    """
+    mnemonics = []
+    for _ in range(count):
+        private_key, address = account.generate_account()
+        node.ledger.fund(address)
+        with node.ledger.cond:
+            acct = node.ledger.accounts[address]
+            acct["assets"].update({app["bud"]: ACCOUNT_BUD, app["terp"]: 0, app["slot"]: 0})
+            acct["apps"][app["id"]] = initial_local_state()
+        mnemonics.append(mnemonic.from_private_key(private_key))
+    return mnemonics
+
+
+def run_operation(node: LocalNode, fn, mnemonics: list, workers: int, passes: int) -> dict:
+    """Run one operation for every account, `passes` times; returns raw samples."""
+    hist = Histogram()
+    errors = {}
+
+    def timed(user_mnemonic):
+        start = time.perf_counter_ns()
+        try:
+            fn(user_mnemonic)
+        except BaseException as e:  # scripts sys.exit() on failed preconditions
+            return None, failure_reason(e)
+        return (time.perf_counter_ns() - start) // 1000, None
+
+    requests_before = node.ledger.requests
+    elapsed = 0.0
+    for n in range(passes):
+        if n:
+            node.ledger.advance_time(WATER_COOLDOWN + 1)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for latency_us, reason in pool.map(timed, mnemonics):
+                if reason:
+                    errors[reason] = errors.get(reason, 0) + 1
+                else:
+                    hist.record(latency_us)
+        elapsed += time.perf_counter() - start
+
+    return {
+        "hist": hist,
+        "errors": errors,
+        "elapsed": elapsed,
+        "requests": node.ledger.requests - requests_before,
+    }
+
+
+def run_scenario(node: LocalNode, scripts: dict, app: dict, accounts: int, workers: int) -> dict:
+    """Simulate `accounts` players through one full lifecycle."""
+    mnemonics = create_accounts(node, app, accounts)
+    operations = {}
+    total_txns = 0
+    total_elapsed = 0.0
+
+    for name, txns_per_call, passes, fn in lifecycle(scripts, app):
+        print(f"  {name} x {accounts * passes}...", end=" ", flush=True)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            sample = run_operation(node, fn, mnemonics, workers, passes)
+        hist, calls = sample["hist"], accounts * passes
+        txns = hist.count * txns_per_call
+        total_txns += txns
+        total_elapsed += sample["elapsed"]
+        operations[name] = {
+            "calls": calls,
+            "ok": hist.count,
+            "errors": sample["errors"],
+            "txns": txns,
+            "txns_per_sec": round(txns / sample["elapsed"], 2) if sample["elapsed"] else 0.0,
+            "p50_ms": hist.quantile(0.5) / 1000,
+            "p99_ms": hist.quantile(0.99) / 1000,
+            "max_ms": hist.max / 1000,
+            "rpc_per_op": round(sample["requests"] / calls, 2),
+        }
+        print(f"{hist.count}/{calls} ok, p50 {operations[name]['p50_ms']:.1f} ms")
+
+    return {
+        "accounts": accounts,
+        "wall_seconds": round(total_elapsed, 3),
+        "txns": total_txns,
+        "txns_per_sec": round(total_txns / total_elapsed, 2) if total_elapsed else 0.0,
+        # ru_maxrss is KiB on Linux; includes the in-process stand-in
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "operations": operations,
+    }
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit (None outside a git checkout)."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, workers: int = DEFAULT_WORKERS,
+                   round_time: float = DEFAULT_ROUND_TIME) -> dict:
+    """
+    Run every scenario against one in-process stand-in.
+
+    Args:
+        scales: Simulated account counts, one scenario each
+        workers: Concurrent script calls per operation
+        round_time: Stand-in block time in seconds
+
+    Returns:
+        dict: JSON-serialisable results
+    """
+    node = LocalNode(round_time=round_time).start()
+    # Start the ledger clock a day back so the scripts' wall-clock cooldown
+    # checks pass as the benchmark advances it past each water cooldown
+    node.ledger.advance_time(-86400)
+    try:
+        scripts = load_scripts(node.address)
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            app = deploy_app(node, scripts)
+
+        scenarios = {}
+        for accounts in scales:
+            print(f"\nScenario: {accounts} account(s)")
+            scenarios[str(accounts)] = run_scenario(node, scripts, app, accounts, workers)
+    finally:
+        node.stop()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": workers,
+        "round_time": round_time,
+        "scenarios": scenarios,
+    }
+
+
+def compare(baseline: dict, results: dict) -> None:
+    """Print per-operation changes against an earlier results file."""
+    print(f"\nChanges vs {baseline.get('commit') or 'baseline'}:")
+    for scale, scenario in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scale)
+        if not before:
+            continue
+        print(f"  {scale} account(s): {before['txns_per_sec']} -> {scenario['txns_per_sec']} txns/sec, "
+              f"peak RSS {before['peak_rss_mb']} -> {scenario['peak_rss_mb']} MB")
+        for name, op in scenario["operations"].items():
+            old = before["operations"].get(name)
+            if not old:
+                continue
+            print(f"    {name:20s} p50 {old['p50_ms']:8.1f} -> {op['p50_ms']:8.1f} ms   "
+                  f"p99 {old['p99_ms']:8.1f} -> {op['p99_ms']:8.1f} ms   "
+                  f"rpc/op {old['rpc_per_op']} -> {op['rpc_per_op']}")
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    scales = [int(n) for n in os.getenv("BENCH_ACCOUNTS", ",".join(map(str, DEFAULT_SCALES))).split(",")]
+    workers = int(os.getenv("BENCH_WORKERS", str(DEFAULT_WORKERS)))
+    round_time = float(os.getenv("BENCH_ROUND_TIME", str(DEFAULT_ROUND_TIME)))
+    output = os.getenv("BENCH_OUTPUT", os.path.join(script_dir, "bench_results.json"))
+    baseline_path = os.getenv("BENCH_BASELINE")
+
+    print("=" * 50)
+    print("GrowPod Empire - Benchmark")
+    print("=" * 50)
+    print(f"Scenarios: {', '.join(map(str, scales))} account(s)")
+    print(f"Workers: {workers}, block time: {round_time}s")
+
+    results = run_benchmarks(scales, workers, round_time)
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if baseline_path:
+        if not os.path.exists(baseline_path):
+            print(f"ERROR: Baseline {baseline_path} not found.")
+            sys.exit(1)
+        with open(baseline_path) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,17 @@ Creates $BUD and $TERP tokens on Algorand TestNet
 """
 from algosdk import account, mnemonic
 from algosdk.transaction import AssetConfigTxn, wait_for_confirmation, ApplicationNoOpTxn
-from algosdk.v2client import algod
+from appconfig import invalidate
+from fees import set_group_fees
+from metrics import phase, record_success
+from multinode import connect
 import os
 import sys
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
 
 # Token specifications
 BUD_SPEC = {
@@ -38,7 +41,8 @@ def create_asa(creator_mnemonic: str, spec: dict) -> int:
     """Create an Algorand Standard Asset (ASA) with given specifications."""
     private_key = mnemonic.to_private_key(creator_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("create_asa", "suggested_params"):
+        params = algod_client.suggested_params()
 
     txn = AssetConfigTxn(
         sender=sender,
@@ -54,12 +58,17 @@ def create_asa(creator_mnemonic: str, spec: dict) -> int:
         url=spec["url"],
         decimals=spec["decimals"]
     )
+    set_group_fees([txn], params)
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("create_asa", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("create_asa", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Creating {spec['name']}... TXID: {txid}")
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("create_asa", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("create_asa")
     asset_id = confirmed_txn['asset-index']
     print(f"  Created! Asset ID: {asset_id}")
     return asset_id
@@ -69,7 +78,8 @@ def set_app_asa_ids(creator_mnemonic: str, app_id: int, bud_id: int, terp_id: in
     """Call the smart contract to set ASA IDs in global state."""
     private_key = mnemonic.to_private_key(creator_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("set_asa_ids", "suggested_params"):
+        params = algod_client.suggested_params()
 
     txn = ApplicationNoOpTxn(
         sender=sender,
@@ -77,11 +87,17 @@ def set_app_asa_ids(creator_mnemonic: str, app_id: int, bud_id: int, terp_id: in
         index=app_id,
         app_args=["set_asa_ids", bud_id.to_bytes(8, 'big'), terp_id.to_bytes(8, 'big')]
     )
+    set_group_fees([txn], params)
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("set_asa_ids", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("set_asa_ids", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Setting ASA IDs in contract... TXID: {txid}")
-    wait_for_confirmation(algod_client, txid, 4)
+    with phase("set_asa_ids", "wait_for_confirmation"):
+        wait_for_confirmation(algod_client, txid, 4)
+    record_success("set_asa_ids")
+    invalidate(algod_client, app_id)  # Cached asset IDs are now stale
     print("  ASA IDs set successfully!")
 
 
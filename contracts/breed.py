@@ -8,29 +8,53 @@ from algosdk import account, mnemonic
 from algosdk.transaction import (
     ApplicationNoOpTxn, 
     AssetTransferTxn,
-    wait_for_confirmation,
     assign_group_id
 )
-from algosdk.v2client import algod
+from genetics import GENE_BYTES, cross, read_parent
+from appconfig import resolve
+from fees import set_group_fees
+from journal import Journal, recover, report
+from metrics import phase
+from multinode import connect
+from submit import (
+    call_with_retry,
+    operation_lease,
+    leased_params,
+    submit_with_retry,
+    DuplicateOperationError,
+    OperationExpiredError,
+    OutcomeUnknownError,
+    TransactionRejectedError
+)
 import os
 import sys
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
+journal = Journal()  # Write-ahead record of every submitted group (GROWPOD_JOURNAL)
 
 # Breeding cost: 1000 $BUD (1000 * 10^6 = 1,000,000,000 units)
 BREED_BUD_BURN = 1_000_000_000
 
 
+def breed_lease(sender: str, app_id: int, parent1_id: int, parent2_id: int, nonce: int = 0) -> bytes:
+    """Lease of one cross: (sender, app, parents, nonce)."""
+    return operation_lease(
+        sender, app_id, "breed",
+        cycle=parent1_id.to_bytes(8, 'big') + parent2_id.to_bytes(8, 'big') + nonce.to_bytes(8, 'big')
+    )
+
+
 def breed_plants(
     user_mnemonic: str, 
     app_id: int, 
     parent1_id: int, 
     parent2_id: int,
     bud_asset_id: int,
-    app_address: str
+    app_address: str,
+    nonce: int = 0
 ) -> dict:
     """
     Breed two plants to create a hybrid seed.
@@ -45,6 +69,12 @@ def breed_plants(
     - Burns 1000 $BUD
     - Creates new hybrid seed NFT
     
+    The burn is leased on (sender, app, parents, nonce), so a rerun within the
+    lease window (until the earlier group's LastValid round) cannot burn another
+    1000 $BUD for the same cross. The contract does not guard breed by state, so
+    main() also refuses a cross the journal already holds. Pass a new nonce to
+    deliberately breed the same pair again.
+    
     Args:
         user_mnemonic: 25-word Algorand wallet mnemonic
         app_id: GrowPod smart contract application ID
@@ -52,24 +82,35 @@ def breed_plants(
         parent2_id: Second parent plant/pod ID
         bud_asset_id: $BUD ASA ID
         app_address: Contract application address
+        nonce: Distinguishes repeated crosses of the same parents
         
     Returns:
         dict: Transaction confirmation details
     """
     private_key = mnemonic.to_private_key(user_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("breed", "suggested_params"):
+        params = leased_params(algod_client)
+    lease = breed_lease(sender, app_id, parent1_id, parent2_id, nonce)
 
     print(f"Breeding Parent #{parent1_id} x Parent #{parent2_id}")
     print(f"Cost: 1000 $BUD")
 
+    # Hybrid genes are fixed by (parents, nonce), like the lease
+    dna1, terp1 = read_parent(algod_client, sender, app_id, parent1_id)
+    dna2, terp2 = read_parent(algod_client, sender, app_id, parent2_id)
+    hybrid = None
+    if all(len(gene) == GENE_BYTES for gene in (dna1, terp1, dna2, terp2)):
+        hybrid = cross(dna1, terp1, dna2, terp2, nonce)
+
     # Transaction 1: Transfer $BUD to contract (burn for breeding)
     burn_txn = AssetTransferTxn(
         sender=sender,
         sp=params,
         receiver=app_address,
         amt=BREED_BUD_BURN,
-        index=bud_asset_id
+        index=bud_asset_id,
+        lease=lease
     )
     
     # Transaction 2: Call breed on contract with parent IDs
@@ -86,17 +127,34 @@ def breed_plants(
     
     # Group the transactions
     txn_group = [burn_txn, breed_txn]
+    set_group_fees(txn_group, params)
     assign_group_id(txn_group)
     
     # Sign both transactions
-    signed_burn = burn_txn.sign(private_key)
-    signed_breed = breed_txn.sign(private_key)
-    
-    # Send grouped transactions
-    txid = algod_client.send_transactions([signed_burn, signed_breed])
-    print(f"Breeding in Combiner Lab... TXID: {txid}")
-    
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("breed", "sign"):
+        signed_burn = burn_txn.sign(private_key)
+        signed_breed = breed_txn.sign(private_key)
+    
+    # Send grouped transactions (retried safely under the lease)
+    print(f"Breeding in Combiner Lab... TXID: {signed_burn.get_txid()}")
+    try:
+        confirmed_txn = submit_with_retry(
+            algod_client, [signed_burn, signed_breed], method="breed", journal=journal
+        )
+    except DuplicateOperationError:
+        print("\nThis cross was already submitted; nothing was burned again.")
+        print("  Set BREED_NONCE to breed the same parents again.")
+        sys.exit(1)
+    except TransactionRejectedError as e:
+        print(f"\nERROR: Breeding rejected by the node ({e}). No $BUD was burned.")
+        sys.exit(1)
+    except OperationExpiredError as e:
+        print(f"\nERROR: Breeding expired without confirming ({e}). No $BUD was burned.")
+        sys.exit(1)
+    except OutcomeUnknownError as e:
+        print(f"\nERROR: {e}")
+        print("  The node reported this group committed. Check the account before running again.")
+        sys.exit(1)
     
     print("\nBreeding successful!")
     print(f"  Parents: #{parent1_id} x #{parent2_id}")
@@ -106,6 +164,11 @@ def breed_plants(
     print(f"  60% from Parent #{parent1_id} (dominant)")
     print(f"  30% from Parent #{parent2_id} (recessive)")
     print(f"  10% random mutation")
+    if hybrid:
+        print(f"  Hybrid DNA: {hybrid[0].hex()}")
+        print(f"  Hybrid terpene profile: {hybrid[1].hex()}")
+    else:
+        print("  (Parent genes not found in local state; hybrid not derived)")
     
     return confirmed_txn
 
@@ -117,19 +180,20 @@ def main():
         sys.exit(1)
     
     app_id = os.getenv("GROWPOD_APP_ID")
-    bud_asset_id = os.getenv("BUD_ASSET_ID")
-    app_address = os.getenv("GROWPOD_APP_ADDRESS")
-    
-    if not all([app_id, bud_asset_id, app_address]):
-        print("ERROR: Required environment variables not set:")
-        print("  GROWPOD_APP_ID - Contract application ID")
-        print("  BUD_ASSET_ID - $BUD ASA ID")
-        print("  GROWPOD_APP_ADDRESS - Contract application address")
+    if not app_id:
+        print("ERROR: GROWPOD_APP_ID environment variable not set.")
+        sys.exit(1)
+    
+    # App address and $BUD ID come from the (cached) app configuration
+    config = resolve(algod_client, int(app_id))
+    if not config.bud_asset:
+        print("ERROR: Contract has no $BUD asset configured. Run the bootstrap first.")
         sys.exit(1)
     
     # Get parent IDs from command line or environment
     parent1 = int(os.getenv("PARENT1_ID", "0"))
     parent2 = int(os.getenv("PARENT2_ID", "0"))
+    nonce = int(os.getenv("BREED_NONCE", "0"))
     
     if parent1 == 0 or parent2 == 0:
         print("ERROR: Set PARENT1_ID and PARENT2_ID environment variables")
@@ -139,14 +203,37 @@ def main():
     print("=" * 50)
     print("GrowPod Empire - Combiner Lab")
     print("=" * 50)
+
+    # Settle groups an earlier run left unconfirmed before sending a new one
+    outcomes = recover(algod_client, journal)
+    if outcomes:
+        print("Groups left by an earlier run:")
+        report(outcomes)
+        print()
+
+    # A lease stops a rerun only within its window, and the contract does not guard breed
+    sender = account.address_from_private_key(mnemonic.to_private_key(mnemonic_phrase))
+    earlier = journal.find_lease(
+        "breed", breed_lease(sender, config.app_id, parent1, parent2, nonce),
+        call_with_retry(algod_client.suggested_params).gh
+    )
+    if earlier:
+        status, txid, confirmed_round = earlier
+        if status == "confirmed":
+            print(f"This cross was already bred in round {confirmed_round} (TXID: {txid}); nothing was burned again.")
+            print("  Set BREED_NONCE to breed the same parents again.")
+        else:
+            print(f"This cross is still unsettled in the journal (TXID: {txid}); run again once it settles.")
+        sys.exit(1)
     
     breed_plants(
         mnemonic_phrase,
-        int(app_id),
+        config.app_id,
         parent1,
         parent2,
-        int(bud_asset_id),
-        app_address
+        config.bud_asset,
+        config.app_address,
+        nonce
     )
 
 
@@ -8,17 +8,31 @@ from algosdk.transaction import (
     ApplicationNoOpTxn, 
     AssetTransferTxn,
     PaymentTxn,
-    wait_for_confirmation,
     assign_group_id
 )
-from algosdk.v2client import algod
+from appconfig import resolve
+from fees import set_group_fees
+from journal import Journal, recover, report
+from metrics import phase
+from multinode import connect
+from submit import (
+    operation_lease,
+    pod_cycle,
+    leased_params,
+    submit_with_retry,
+    DuplicateOperationError,
+    OperationExpiredError,
+    OutcomeUnknownError,
+    TransactionRejectedError
+)
 import os
 import sys
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
+journal = Journal()  # Write-ahead record of every submitted group (GROWPOD_JOURNAL)
 
 # Cleanup costs
 CLEANUP_BUD_BURN = 500_000_000  # 500 $BUD (500 * 10^6)
@@ -45,26 +59,32 @@ def cleanup_pod(user_mnemonic: str, app_id: int, bud_asset_id: int, app_address:
     """
     private_key = mnemonic.to_private_key(user_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("cleanup", "suggested_params"):
+        params = leased_params(algod_client)
+    lease = operation_lease(
+        sender, app_id, "cleanup", cycle=pod_cycle(algod_client, sender, app_id)
+    )
 
     print(f"Sender: {sender}")
     print(f"Burning 500 $BUD + paying 1 ALGO cleanup fee...")
 
-    # Transaction 1: Transfer $BUD to contract (burn)
-    burn_txn = AssetTransferTxn(
+    # Transaction 1: Pay 1 ALGO fee
+    fee_txn = PaymentTxn(
         sender=sender,
         sp=params,
         receiver=app_address,
-        amt=CLEANUP_BUD_BURN,
-        index=bud_asset_id
+        amt=CLEANUP_ALGO_FEE
     )
     
-    # Transaction 2: Pay 1 ALGO fee
-    fee_txn = PaymentTxn(
+    # Transaction 2: Transfer $BUD to contract (burn)
+    # Must sit directly before the app call: the contract checks Gtxn[index - 1]
+    burn_txn = AssetTransferTxn(
         sender=sender,
         sp=params,
         receiver=app_address,
-        amt=CLEANUP_ALGO_FEE
+        amt=CLEANUP_BUD_BURN,
+        index=bud_asset_id,
+        lease=lease
     )
     
     # Transaction 3: Call cleanup on contract
@@ -76,19 +96,35 @@ def cleanup_pod(user_mnemonic: str, app_id: int, bud_asset_id: int, app_address:
     )
     
     # Group the transactions (must be atomic)
-    txn_group = [burn_txn, fee_txn, cleanup_txn]
+    txn_group = [fee_txn, burn_txn, cleanup_txn]
+    set_group_fees(txn_group, params)
     assign_group_id(txn_group)
     
     # Sign all transactions
-    signed_burn = burn_txn.sign(private_key)
-    signed_fee = fee_txn.sign(private_key)
-    signed_cleanup = cleanup_txn.sign(private_key)
-    
-    # Send grouped transactions
-    txid = algod_client.send_transactions([signed_burn, signed_fee, signed_cleanup])
-    print(f"Cleaning up pod... TXID: {txid}")
+    with phase("cleanup", "sign"):
+        signed_fee = fee_txn.sign(private_key)
+        signed_burn = burn_txn.sign(private_key)
+        signed_cleanup = cleanup_txn.sign(private_key)
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    # Send grouped transactions (retried safely under the lease)
+    print(f"Cleaning up pod... TXID: {signed_fee.get_txid()}")
+    try:
+        confirmed_txn = submit_with_retry(
+            algod_client, [signed_fee, signed_burn, signed_cleanup], method="cleanup", journal=journal
+        )
+    except DuplicateOperationError:
+        print("\nThis cleanup was already submitted; nothing was burned again.")
+        sys.exit(1)
+    except TransactionRejectedError as e:
+        print(f"\nERROR: Cleanup rejected by the node ({e}). No $BUD was burned.")
+        sys.exit(1)
+    except OperationExpiredError as e:
+        print(f"\nERROR: Cleanup expired without confirming ({e}). No $BUD was burned.")
+        sys.exit(1)
+    except OutcomeUnknownError as e:
+        print(f"\nERROR: {e}")
+        print("  The node reported this group committed. Check the account before running again.")
+        sys.exit(1)
     
     print("\nCleanup successful!")
     print(f"  Burned: 500 $BUD")
@@ -105,26 +141,33 @@ def main():
         sys.exit(1)
     
     app_id = os.getenv("GROWPOD_APP_ID")
-    bud_asset_id = os.getenv("BUD_ASSET_ID")
-    app_address = os.getenv("GROWPOD_APP_ADDRESS")
+    if not app_id:
+        print("ERROR: GROWPOD_APP_ID environment variable not set.")
+        sys.exit(1)
     
-    if not all([app_id, bud_asset_id, app_address]):
-        print("ERROR: Required environment variables not set:")
-        print("  GROWPOD_APP_ID - Contract application ID")
-        print("  BUD_ASSET_ID - $BUD ASA ID")
-        print("  GROWPOD_APP_ADDRESS - Contract application address")
+    # App address and $BUD ID come from the (cached) app configuration
+    config = resolve(algod_client, int(app_id))
+    if not config.bud_asset:
+        print("ERROR: Contract has no $BUD asset configured. Run the bootstrap first.")
         sys.exit(1)
     
     print("=" * 50)
     print("GrowPod Empire - Pod Cleanup")
     print("=" * 50)
     print("This will burn 500 $BUD + 1 ALGO to reset your pod.\n")
+
+    # Settle groups an earlier run left unconfirmed before sending a new one
+    outcomes = recover(algod_client, journal)
+    if outcomes:
+        print("Groups left by an earlier run:")
+        report(outcomes)
+        print()
     
     cleanup_pod(
         mnemonic_phrase, 
-        int(app_id), 
-        int(bud_asset_id),
-        app_address
+        config.app_id, 
+        config.bud_asset,
+        config.app_address
     )
 
 
@@ -1,4 +1,5 @@
 from pyteal import *
+from events import METHOD_IDS
 
 # Global State Keys
 GlobalOwner = Bytes("owner")
@@ -47,6 +48,18 @@ HARVESTS_FOR_SLOT = Int(5)  # 5 harvests required to claim slot token
 MAX_POD_SLOTS = Int(5)  # Maximum 5 pod slots per player
 
 
+def log_event(method: str, pod: int, stage, amount=Int(0), counter=Int(0)):
+    """Log a fixed-width event record (layout documented in events.py)."""
+    if isinstance(stage, int):
+        return Log(Concat(Bytes(bytes([METHOD_IDS[method], pod, stage])), Itob(amount), Itob(counter)))
+    return Log(Concat(
+        Bytes(bytes([METHOD_IDS[method], pod])),
+        Extract(Itob(stage), Int(7), Int(1)),
+        Itob(amount),
+        Itob(counter)
+    ))
+
+
 def approval_program():
     # Scratch space for intermediate calculations
     scratch_yield = ScratchVar(TealType.uint64)
@@ -173,6 +186,7 @@ def approval_program():
             Txn.sender(),
             Itob(Global.latest_timestamp())
         ))),
+        log_event("mint_pod", 1, 1),
         Approve()
     )
 
@@ -222,6 +236,8 @@ def approval_program():
                 )
             )
         ),
+        log_event("water", 1, App.localGet(Txn.sender(), LocalStage),
+                  counter=App.localGet(Txn.sender(), LocalWaterCount)),
         Approve()
     )
 
@@ -238,6 +254,8 @@ def approval_program():
         
         App.localPut(Txn.sender(), LocalLastNutrients, Global.latest_timestamp()),
         App.localPut(Txn.sender(), LocalNutrientCount, App.localGet(Txn.sender(), LocalNutrientCount) + Int(1)),
+        log_event("nutrients", 1, App.localGet(Txn.sender(), LocalStage),
+                  counter=App.localGet(Txn.sender(), LocalNutrientCount)),
         Approve()
     )
 
@@ -269,6 +287,7 @@ def approval_program():
         App.localPut(Txn.sender(), LocalStage, Int(6)),
         # Increment total harvest count for slot progression
         App.localPut(Txn.sender(), LocalHarvestCount, App.localGet(Txn.sender(), LocalHarvestCount) + Int(1)),
+        log_event("harvest", 1, 6, scratch_yield.load(), App.localGet(Txn.sender(), LocalHarvestCount)),
         Approve()
     )
 
@@ -289,6 +308,7 @@ def approval_program():
         App.localPut(Txn.sender(), LocalLastNutrients, Int(0)),
         App.localPut(Txn.sender(), LocalDna, Bytes("")),
         App.localPut(Txn.sender(), LocalTerpeneProfile, Bytes("")),
+        log_event("cleanup", 1, 0, Gtxn[Txn.group_index() - Int(1)].asset_amount()),
         Approve()
     )
 
@@ -313,6 +333,7 @@ def approval_program():
             Txn.sender(),
             Itob(Global.latest_timestamp())
         ))),
+        log_event("mint_pod", 2, 1),
         Approve()
     )
 
@@ -361,6 +382,8 @@ def approval_program():
                 )
             )
         ),
+        log_event("water", 2, App.localGet(Txn.sender(), LocalStage2),
+                  counter=App.localGet(Txn.sender(), LocalWaterCount2)),
         Approve()
     )
 
@@ -377,6 +400,8 @@ def approval_program():
         
         App.localPut(Txn.sender(), LocalLastNutrients2, Global.latest_timestamp()),
         App.localPut(Txn.sender(), LocalNutrientCount2, App.localGet(Txn.sender(), LocalNutrientCount2) + Int(1)),
+        log_event("nutrients", 2, App.localGet(Txn.sender(), LocalStage2),
+                  counter=App.localGet(Txn.sender(), LocalNutrientCount2)),
         Approve()
     )
 
@@ -408,6 +433,7 @@ def approval_program():
         App.localPut(Txn.sender(), LocalStage2, Int(6)),
         # Increment total harvest count for slot progression
         App.localPut(Txn.sender(), LocalHarvestCount, App.localGet(Txn.sender(), LocalHarvestCount) + Int(1)),
+        log_event("harvest", 2, 6, scratch_yield.load(), App.localGet(Txn.sender(), LocalHarvestCount)),
         Approve()
     )
 
@@ -428,6 +454,7 @@ def approval_program():
         App.localPut(Txn.sender(), LocalLastNutrients2, Int(0)),
         App.localPut(Txn.sender(), LocalDna2, Bytes("")),
         App.localPut(Txn.sender(), LocalTerpeneProfile2, Bytes("")),
+        log_event("cleanup", 2, 0, Gtxn[Txn.group_index() - Int(1)].asset_amount()),
         Approve()
     )
 
@@ -441,6 +468,7 @@ def approval_program():
         scratch_profile_hash.store(Sha256(
             App.localGet(Txn.sender(), LocalTerpeneProfile)
         )),
+        scratch_terp_reward.store(Int(0)),
         
         If(
             GetByte(scratch_profile_hash.load(), Int(0)) < Int(32),
@@ -461,6 +489,7 @@ def approval_program():
                 InnerTxnBuilder.Submit(),
             )
         ),
+        log_event("check_terp", 1, 6, scratch_terp_reward.load(), GetByte(scratch_profile_hash.load(), Int(0))),
         Approve()
     )
 
@@ -472,6 +501,7 @@ def approval_program():
         scratch_profile_hash.store(Sha256(
             App.localGet(Txn.sender(), LocalTerpeneProfile2)
         )),
+        scratch_terp_reward.store(Int(0)),
         
         If(
             GetByte(scratch_profile_hash.load(), Int(0)) < Int(32),
@@ -492,6 +522,7 @@ def approval_program():
                 InnerTxnBuilder.Submit(),
             )
         ),
+        log_event("check_terp", 2, 6, scratch_terp_reward.load(), GetByte(scratch_profile_hash.load(), Int(0))),
         Approve()
     )
 
@@ -504,6 +535,7 @@ def approval_program():
         Assert(Gtxn[Txn.group_index() - Int(1)].asset_amount() >= BREED_BURN),
         Assert(Gtxn[Txn.group_index() - Int(1)].asset_receiver() == Global.current_application_address()),
         
+        log_event("breed", 0, 0, Gtxn[Txn.group_index() - Int(1)].asset_amount()),
         Approve()
     )
 
@@ -532,6 +564,8 @@ def approval_program():
         # Deduct 5 harvests (preserves carryover for players who harvested more)
         App.localPut(Txn.sender(), LocalHarvestCount, 
             App.localGet(Txn.sender(), LocalHarvestCount) - HARVESTS_FOR_SLOT),
+        log_event("claim_slot_token", 0, 0, Gtxn[Txn.group_index() - Int(1)].asset_amount(),
+                  App.localGet(Txn.sender(), LocalHarvestCount)),
         Approve()
     )
 
@@ -548,6 +582,7 @@ def approval_program():
         
         # Increment pod slots
         App.localPut(Txn.sender(), LocalPodSlots, App.localGet(Txn.sender(), LocalPodSlots) + Int(1)),
+        log_event("unlock_slot", 0, 0, Int(1), App.localGet(Txn.sender(), LocalPodSlots)),
         Approve()
     )
 
@@ -637,3 +672,4 @@ if __name__ == "__main__":
     print("  Pod 2: mint_pod_2, water_2, nutrients_2, harvest_2, cleanup_2")
     print("  Shared: check_terp, check_terp_2, breed, bootstrap, set_asa_ids")
     print("  Slots: claim_slot_token, unlock_slot")
+    print("\nEvents: 19-byte Log record per player method (decode with events.py)")
@@ -3,7 +3,7 @@
 Full Deployment Script for GrowPod Empire
 Compiles contract, deploys to TestNet, creates tokens, and outputs env vars.
 """
-from algosdk import account, mnemonic, encoding
+from algosdk import account, mnemonic
 from algosdk.transaction import (
     ApplicationCreateTxn, 
     StateSchema, 
@@ -12,17 +12,21 @@ from algosdk.transaction import (
     ApplicationNoOpTxn,
     PaymentTxn
 )
-from algosdk.v2client import algod
 from algosdk.logic import get_application_address
+from appconfig import config_from_app_info, config_from_state, store
+from fees import set_group_fees
+from metrics import phase, record_success
+from multinode import connect
+from statecodec import read_app
 import base64
 import os
 import sys
 import subprocess
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
 
 # Contract state schema
 # Global: 6 uints (period, cleanup_cost, breed_cost, bud_asset, terp_asset, slot_asset)
@@ -62,7 +66,8 @@ def compile_contract():
 
 def compile_teal_to_bytecode(teal_source: str) -> bytes:
     """Compile TEAL source to bytecode using algod."""
-    compile_response = algod_client.compile(teal_source)
+    with phase("deploy", "compile"):
+        compile_response = algod_client.compile(teal_source)
     return base64.b64decode(compile_response['result'])
 
 
@@ -81,7 +86,8 @@ def deploy_contract(creator_mnemonic: str, approval_path: str, clear_path: str)
     approval_bytecode = compile_teal_to_bytecode(approval_teal)
     clear_bytecode = compile_teal_to_bytecode(clear_teal)
     
-    params = algod_client.suggested_params()
+    with phase("deploy", "suggested_params"):
+        params = algod_client.suggested_params()
     
     txn = ApplicationCreateTxn(
         sender=sender,
@@ -93,16 +99,21 @@ def deploy_contract(creator_mnemonic: str, approval_path: str, clear_path: str)
         local_schema=LOCAL_SCHEMA,
         extra_pages=1
     )
+    set_group_fees([txn], params)
     
-    signed_txn = txn.sign(private_key)
+    with phase("deploy", "sign"):
+        signed_txn = txn.sign(private_key)
     try:
-        txid = algod_client.send_transaction(signed_txn)
+        with phase("deploy", "send_transaction"):
+            txid = algod_client.send_transaction(signed_txn)
         print(f"  Deployment TX: {txid}")
     except Exception as e:
         print(f"  ERROR sending transaction: {e}")
         raise
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("deploy", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("deploy")
     app_id = confirmed_txn['application-index']
     app_address = get_application_address(app_id)
     
@@ -119,7 +130,8 @@ def fund_app_address(creator_mnemonic: str, app_address: str, amount_algo: float
     
     private_key = mnemonic.to_private_key(creator_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("fund_app", "suggested_params"):
+        params = algod_client.suggested_params()
     
     amount_microalgo = int(amount_algo * 1_000_000)
     
@@ -129,11 +141,16 @@ def fund_app_address(creator_mnemonic: str, app_address: str, amount_algo: float
         receiver=app_address,
         amt=amount_microalgo
     )
+    set_group_fees([txn], params)
     
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("fund_app", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("fund_app", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"  Funding TX: {txid}")
-    wait_for_confirmation(algod_client, txid, 4)
+    with phase("fund_app", "wait_for_confirmation"):
+        wait_for_confirmation(algod_client, txid, 4)
+    record_success("fund_app")
     print(f"  Contract funded with {amount_algo} ALGO!")
 
 
@@ -143,9 +160,8 @@ def bootstrap_tokens(creator_mnemonic: str, app_id: int) -> tuple:
     
     private_key = mnemonic.to_private_key(creator_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
-    params.fee = 4000  # Extra fee for 3 inner txns
-    params.flat_fee = True
+    with phase("bootstrap", "suggested_params"):
+        params = algod_client.suggested_params()
     
     txn = ApplicationNoOpTxn(
         sender=sender,
@@ -153,28 +169,26 @@ def bootstrap_tokens(creator_mnemonic: str, app_id: int) -> tuple:
         index=app_id,
         app_args=["bootstrap"]
     )
+    set_group_fees([txn], params)  # Covers the 3 inner asset creations
     
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("bootstrap", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("bootstrap", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"  Bootstrap TX: {txid}")
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("bootstrap", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("bootstrap")
     
-    app_info = algod_client.application_info(app_id)
-    global_state = app_info['params']['global-state']
-    
-    bud_id = None
-    terp_id = None
-    slot_id = None
-    
-    for item in global_state:
-        key = encoding.base64.b64decode(item['key']).decode('utf-8')
-        if key == 'bud_asset':
-            bud_id = item['value']['uint']
-        elif key == 'terp_asset':
-            terp_id = item['value']['uint']
-        elif key == 'slot_asset':
-            slot_id = item['value']['uint']
+    # The creator's account serves global state as msgpack; fall back to the JSON app endpoint
+    glob, approval = read_app(algod_client, sender, app_id)
+    if glob is not None:
+        config = config_from_state(app_id, glob, approval)
+    else:
+        config = config_from_app_info(algod_client.application_info(app_id))
+    store(algod_client, config)
+    bud_id, terp_id, slot_id = config.bud_asset, config.terp_asset, config.slot_asset
     
     if bud_id and terp_id and slot_id:
         print(f"  $BUD Asset ID: {bud_id}")
@@ -182,7 +196,7 @@ def bootstrap_tokens(creator_mnemonic: str, app_id: int) -> tuple:
         print(f"  Slot Token Asset ID: {slot_id}")
     else:
         print("  WARNING: Could not retrieve all ASA IDs from global state")
-        print(f"  Global state: {global_state}")
+        print(f"  Config: {config}")
     
     return bud_id, terp_id, slot_id
 
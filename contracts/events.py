@@ -0,0 +1,73 @@
+"""
+Event log records for GrowPod Empire
+Layout and decoder for the fixed-width binary records the contract `Log`s
+from every player method, so results can be read from confirmed transactions.
+
+Record layout (19 bytes, big-endian):
+    [0]      method id (see METHOD_IDS)
+    [1]      pod number (0 for account-wide methods)
+    [2]      stage after the call (0 for account-wide methods)
+    [3:11]   amount (yield, burn, reward, ... depending on method)
+    [11:19]  counter (water/nutrient/harvest count, rarity byte, pod slots)
+"""
+from typing import NamedTuple
+import base64
+import struct
+
+EVENT_FORMAT = ">BBBQQ"
+EVENT_SIZE = struct.calcsize(EVENT_FORMAT)
+
+# Contract method -> event method id
+METHOD_IDS = {
+    "mint_pod": 1,
+    "water": 2,
+    "nutrients": 3,
+    "harvest": 4,
+    "cleanup": 5,
+    "check_terp": 6,
+    "breed": 7,
+    "claim_slot_token": 8,
+    "unlock_slot": 9,
+}
+METHOD_NAMES = {method_id: name for name, method_id in METHOD_IDS.items()}
+
+
+class GrowPodEvent(NamedTuple):
+    method: str
+    pod: int
+    stage: int
+    amount: int
+    counter: int
+
+
+def encode_event(method: str, pod: int, stage: int, amount: int = 0, counter: int = 0) -> bytes:
+    """Encode one log record exactly as the contract emits it."""
+    return struct.pack(EVENT_FORMAT, METHOD_IDS[method], pod, stage, amount, counter)
+
+
+def decode_event(record: bytes) -> GrowPodEvent:
+    """Decode one 19-byte log record."""
+    if len(record) != EVENT_SIZE:
+        raise ValueError(f"Expected {EVENT_SIZE}-byte event, got {len(record)}")
+    method_id, pod, stage, amount, counter = struct.unpack(EVENT_FORMAT, record)
+    if method_id not in METHOD_NAMES:
+        raise ValueError(f"Unknown event method id: {method_id}")
+    return GrowPodEvent(METHOD_NAMES[method_id], pod, stage, amount, counter)
+
+
+def events_from_txn(txn_info: dict) -> list:
+    """
+    Decode every GrowPod event in a confirmed transaction.
+
+    Args:
+        txn_info: Pending transaction info (as returned by wait_for_confirmation)
+
+    Returns:
+        list: GrowPodEvent records, in log order
+    """
+    events = []
+    for log in txn_info.get('logs', []):
+        record = base64.b64decode(log)
+        if len(record) == EVENT_SIZE and record[0] in METHOD_NAMES:
+            events.append(decode_event(record))
+    return events
@@ -0,0 +1,163 @@
+"""
+Fee planning for GrowPod Empire
+Sets the smallest flat fees that cover an atomic group, including the inner
+transactions each contract method issues.
+
+Inner transaction counts per router branch are read from the compiled
+approval.teal (itxn_begin / itxn_next on every path from the method's dispatch
+label, taking the most expensive path), falling back to the table in model.py.
+
+Fee rule per top-level transaction:
+    fee = max(min_fee, fee_per_byte * size) + inner_txns * min_fee
+where fee_per_byte is the suggested fee, non-zero only under congestion.
+"""
+from algosdk import constants
+from functools import lru_cache
+from model import INNER_TXN_COUNTS
+import os
+import re
+
+APPROVAL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "approval.teal")
+
+# Encoded size of the "grp" field assign_group_id adds after fees are set
+GROUP_ID_BYTES = 38
+
+_DISPATCH = re.compile(r'^byte "([^"]+)"$')
+
+
+def _parse(teal: str) -> tuple:
+    """(ops, labels) with comments, blank lines and the pragma stripped."""
+    ops = []
+    labels = {}
+    for line in teal.splitlines():
+        line = line.split("//")[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.endswith(":"):
+            labels[line[:-1]] = len(ops)
+        else:
+            ops.append(line)
+    return ops, labels
+
+
+def inner_txn_counts(teal: str) -> dict:
+    """
+    Most inner transactions any path of each router branch can issue.
+
+    Args:
+        teal: Approval program source (as written by contract.py)
+
+    Returns:
+        dict: method name -> inner transaction count (methods issuing none included)
+    """
+    ops, labels = _parse(teal)
+    memo = {}
+
+    def walk(pc: int, active: frozenset) -> int:
+        """Most inner transactions from pc to the end of this path."""
+        if pc in memo:
+            return memo[pc]
+        if pc in active:
+            return 0  # Back edge: the contract has no loops, ignore defensively
+        active = active | {pc}
+        start, count = pc, 0
+        while pc < len(ops):
+            op, _, arg = ops[pc].partition(" ")
+            if op in ("itxn_begin", "itxn_next"):
+                count += 1
+            elif op == "callsub":
+                count += walk(labels[arg], active)
+            elif op == "b":
+                count += walk(labels[arg], active)
+                break
+            elif op in ("bnz", "bz"):
+                count += max(walk(labels[arg], active), walk(pc + 1, active))
+                break
+            elif op in ("return", "err", "retsub"):
+                break
+            pc += 1
+        memo[start] = count
+        return count
+
+    counts = {}
+    for pc in range(len(ops) - 3):
+        match = _DISPATCH.match(ops[pc + 1])
+        if (ops[pc] == "txna ApplicationArgs 0" and match and ops[pc + 2] == "=="
+                and ops[pc + 3].startswith("bnz ")):
+            counts[match.group(1)] = walk(labels[ops[pc + 3].split(" ", 1)[1]], frozenset())
+    return counts
+
+
+@lru_cache(maxsize=None)
+def load_inner_counts(path: str = APPROVAL_PATH) -> dict:
+    """Inner transaction counts from the compiled program, or model.py's table."""
+    try:
+        with open(path) as f:
+            counts = inner_txn_counts(f.read())
+    except OSError:
+        counts = {}
+    return counts or dict(INNER_TXN_COUNTS)
+
+
+def inner_count(txn) -> int:
+    """Inner transactions a top-level transaction can trigger (0 for non-app calls)."""
+    app_args = getattr(txn, "app_args", None)
+    if not app_args:
+        return 0
+    method = app_args[0]
+    if isinstance(method, bytes):
+        method = method.decode('utf-8', errors='replace')
+    return load_inner_counts().get(method, INNER_TXN_COUNTS.get(method, 0))
+
+
+def required_fee(txn, params, extra_bytes: int = 0) -> int:
+    """Smallest fee covering one transaction and its inner transactions."""
+    min_fee = params.min_fee or constants.MIN_TXN_FEE
+    fee_per_byte = 0 if params.flat_fee else params.fee
+    size = txn.estimate_size() + extra_bytes
+    return max(min_fee, fee_per_byte * size) + inner_count(txn) * min_fee
+
+
+def set_group_fees(txns: list, params) -> int:
+    """
+    Set flat fees on unsigned transactions so the group pays exactly what it needs.
+
+    Call before assign_group_id/signing (the fee is part of the txid).
+
+    Args:
+        txns: Transactions of one atomic group (or a single transaction)
+        params: Suggested params the transactions were built with
+
+    Returns:
+        int: Total fee of the group in microAlgos
+    """
+    extra = GROUP_ID_BYTES if len(txns) > 1 and txns[0].group is None else 0
+    for txn in txns:
+        txn.fee = required_fee(txn, params, extra)
+    # A larger fee can lengthen the encoding; settle the per-byte estimate
+    for txn in txns:
+        txn.fee = max(txn.fee, required_fee(txn, params, extra))
+    return sum(txn.fee for txn in txns)
+
+
+def pool_group_fees(txns: list, params, payer: int = 0) -> int:
+    """
+    Put the fee for the whole group on one transaction; the others pay 0.
+
+    Lets one account cover a group whose other members hold no spare ALGO
+    (e.g. an operator packing calls from many accounts). Call before
+    assign_group_id/signing.
+
+    Returns:
+        int: Total fee of the group in microAlgos
+    """
+    extra = GROUP_ID_BYTES if len(txns) > 1 and txns[0].group is None else 0
+    for txn in txns:
+        txn.fee = 0
+    total = 0
+    # The payer's encoding grows with its fee; settle the per-byte estimate
+    for _ in range(3):
+        txns[payer].fee = total
+        total = sum(required_fee(txn, params, extra) for txn in txns)
+    txns[payer].fee = max(txns[payer].fee, total)
+    return txns[payer].fee
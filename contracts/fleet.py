@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Sharded fleet runner for GrowPod Empire
+Waters, feeds, harvests and cleans up every pod of a fleet of accounts in one
+pass: each account's due calls go out as one atomic group, planned from a
+single msgpack account read against the chain's latest block time.
+
+Accounts are split into shards by a hash of the address, so an account always
+lands in the same shard. Each shard runs in its own worker process with its own
+algod client, thread pool and adaptive rate limiter (ALGOD_READ_RATE and
+ALGOD_WRITE_RATE split evenly between shards), and signs and encodes its own
+transactions. The coordinator only merges outcomes, metrics registries and
+limiter reports, so signing throughput grows with cores.
+"""
+from algosdk import encoding, mnemonic
+from algosdk.transaction import ApplicationNoOpTxn, AssetTransferTxn, PaymentTxn, assign_group_id
+from appconfig import resolve
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from fees import set_group_fees
+from metrics import failure_reason, phase, record_success, registry
+from model import CLEANUP_BURN, NUTRIENT_COOLDOWN, WATER_COOLDOWN, pod_key
+from multinode import connect
+from ratelimit import READ_RATE, WRITE_RATE, Limiter, limited
+from slots import load_fleet
+from statecodec import AccountState, read_account
+from submit import broadcast, call_with_retry, confirm_groups, leased_params, operation_lease, DuplicateOperationError
+from typing import NamedTuple
+import hashlib
+import msgpack
+import multiprocessing
+import os
+import sys
+import time
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
+
+OPERATIONS = ("water", "nutrients", "harvest", "cleanup")
+PODS = (1, 2)  # Pods with contract methods
+CLEANUP_ALGO_FEE = 1_000_000  # 1 ALGO in microAlgos (mirrored from clean.py)
+
+THREADS = 16  # Concurrent reads/sends per shard
+MAX_ROUNDS = 4  # Rounds to wait for a group before giving up on it
+
+
+class PodCall(NamedTuple):
+    method: str  # On-chain method name ("water", "cleanup_2", ...)
+    operation: str  # Base operation ("water", "cleanup", ...)
+    pod: int
+    cycle: bytes  # Pod DNA; leases cleanups to the growth cycle
+
+
+class ShardReport(NamedTuple):
+    shard: int
+    results: dict  # address -> "ok", "nothing due" or the failure reason
+    txns: int  # Confirmed top-level transactions
+    seconds: float
+    registry: object  # metrics.Registry of the worker
+    limits: dict  # ratelimit.Limiter.report() of the worker
+
+
+def shard_of(address: str, shards: int) -> int:
+    """Stable shard index for an address."""
+    digest = hashlib.sha256(encoding.decode_address(address)).digest()
+    return int.from_bytes(digest[:8], 'big') % shards
+
+
+def split_fleet(fleet: dict, shards: int) -> list:
+    """Partition address -> mnemonic into `shards` dicts by address hash."""
+    parts = [{} for _ in range(shards)]
+    for address, user_mnemonic in fleet.items():
+        parts[shard_of(address, shards)][address] = user_mnemonic
+    return parts
+
+
+def chain_time(client) -> int:
+    """Latest block timestamp (what cooldowns are checked against), or local time."""
+    last_round = call_with_retry(client.status)['last-round']
+    try:
+        raw = call_with_retry(client.block_info, last_round, response_format="msgpack")
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)['block']['ts']
+    except Exception:
+        return int(time.time())
+
+
+def plan_account(account: AccountState, now: int, operations: tuple = OPERATIONS) -> list:
+    """
+    Calls due for one account, in group order.
+
+    Nutrients go before water, which may advance the pod to stage 5. Cleanups
+    are planned only while the account holds 500 $BUD for each.
+
+    Args:
+        account: statecodec.read_account result with asset_ids=(bud_asset,)
+        now: Chain time (latest block timestamp)
+        operations: Subset of OPERATIONS to plan
+
+    Returns:
+        list: PodCall entries (empty if nothing is due)
+    """
+    state = account.local
+    if state is None:
+        return []
+    bud = max(account.holdings[0], 0) if account.holdings else 0
+
+    calls = []
+    for pod in PODS:
+        def field(name):
+            return state.get(pod_key(name, pod), 0)
+
+        def due(last, cooldown):
+            return last == 0 or now - last >= cooldown
+
+        def add(operation):
+            method = pod_key(operation, pod)
+            calls.append(PodCall(method, operation, pod, state.get(pod_key("dna", pod), b"")))
+
+        stage = field("stage")
+        if 1 <= stage <= 4:
+            if "nutrients" in operations and due(field("last_nutrients"), NUTRIENT_COOLDOWN):
+                add("nutrients")
+            if "water" in operations and due(field("last_watered"), WATER_COOLDOWN):
+                add("water")
+        elif stage == 5 and "harvest" in operations:
+            add("harvest")
+        elif stage == 6 and "cleanup" in operations and bud >= CLEANUP_BURN:
+            bud -= CLEANUP_BURN
+            add("cleanup")
+    return calls
+
+
+def group_label(calls: list) -> str:
+    """Metrics label for a group ("nutrients+water", "cleanup", ...)."""
+    return "+".join(dict.fromkeys(call.operation for call in calls))
+
+
+def build_group(private_key: str, sender: str, calls: list, config, params) -> list:
+    """Signed atomic group for one account's due calls."""
+    txns = []
+    for call in calls:
+        if call.operation == "cleanup":
+            # The contract checks the $BUD burn at Gtxn[index - 1]
+            txns.append(PaymentTxn(sender, params, config.app_address, CLEANUP_ALGO_FEE))
+            txns.append(AssetTransferTxn(
+                sender, params, config.app_address, CLEANUP_BURN, config.bud_asset,
+                lease=operation_lease(sender, config.app_id, "cleanup", call.pod, call.cycle)
+            ))
+        txns.append(ApplicationNoOpTxn(sender, params, config.app_id, app_args=[call.method]))
+    set_group_fees(txns, params)  # Covers the harvest's $BUD inner transfer
+    if len(txns) > 1:
+        assign_group_id(txns)
+    with phase(group_label(calls), "sign"):
+        return [txn.sign(private_key) for txn in txns]
+
+
+def execute_plans(client, pool: ThreadPoolExecutor, plans: dict, fleet: dict, config) -> tuple:
+    """
+    Sign, send and confirm one group per planned account.
+
+    Args:
+        client: Algod client
+        pool: Thread pool for concurrent sends and confirmation reads
+        plans: address -> PodCall list (from plan_account)
+        fleet: address -> mnemonic
+        config: appconfig.AppConfig of the contract
+
+    Returns:
+        tuple: (address -> "ok" or the failure reason, confirmed top-level transactions)
+    """
+    results, sent, txns = {}, {}, 0
+    if not plans:
+        return results, txns
+    with phase("fleet", "suggested_params"):
+        params = call_with_retry(client.suggested_params)
+        leased = leased_params(client)
+
+    def send(item):
+        address, calls = item
+        label = group_label(calls)
+        # Fresh rounds for unleased calls: a byte-identical rerun would be a no-op
+        group_params = leased if any(c.operation == "cleanup" for c in calls) else params
+        signed = build_group(mnemonic.to_private_key(fleet[address]), address, calls, config, group_params)
+        try:
+            with phase(label, "send_transaction"):
+                broadcast(client, signed, max_attempts=4, method=label)
+            return address, signed[-1].get_txid(), None
+        except DuplicateOperationError:
+            return address, None, "already submitted"
+        except Exception as e:
+            return address, None, failure_reason(e)
+
+    for address, txid, error in pool.map(send, plans.items()):
+        if error is not None:
+            results[address] = error
+        else:
+            sent[address] = txid
+
+    for address, info in confirm_groups(client, pool, sent, MAX_ROUNDS, "fleet").items():
+        calls = plans[address]
+        if info.get('confirmed-round'):
+            results[address] = "ok"
+            txns += sum(3 if c.operation == "cleanup" else 1 for c in calls)
+            for c in calls:
+                record_success(c.operation)
+        else:
+            results[address] = failure_reason(Exception(info['pool-error']))
+            registry.count_failure(group_label(calls), results[address])
+        del sent[address]
+
+    for address in sent:
+        results[address] = "not confirmed"
+        registry.count_failure(group_label(plans[address]), "not_confirmed")
+    return results, txns
+
+
+def run_shard(shard: int, fleet: dict, config, algod_address: str, algod_token: str = "",
+              read_rate: float = 0, write_rate: float = 0, operations: tuple = OPERATIONS,
+              threads: int = THREADS) -> ShardReport:
+    """
+    One pass over a shard of the fleet (runs in a worker process).
+
+    Args:
+        shard: Shard index (for reporting)
+        fleet: address -> mnemonic for this shard
+        config: appconfig.AppConfig of the contract
+        algod_address: Algod endpoint (each shard opens its own client)
+        algod_token: Algod API token
+        read_rate: Read requests per second this shard may make (0 for no cap)
+        write_rate: Submissions per second this shard may make (0 for no cap)
+        operations: Subset of OPERATIONS to perform
+        threads: Concurrent reads/sends
+
+    Returns:
+        ShardReport: Outcomes, confirmed transaction count, duration, metrics and limits
+    """
+    start = time.perf_counter()
+    limiter = Limiter(read_rate, write_rate)
+    client = limited(connect(algod_address, algod_token), limiter)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        now = chain_time(client)
+        with phase("fleet", "read_state"):
+            accounts = list(pool.map(
+                lambda address: call_with_retry(read_account, client, address, config.app_id, (config.bud_asset,)),
+                fleet
+            ))
+        plans = {}
+        for account in accounts:
+            calls = plan_account(account, now, operations)
+            if calls:
+                plans[account.address] = calls
+            else:
+                results[account.address] = "nothing due"
+
+        executed, txns = execute_plans(client, pool, plans, fleet, config)
+        results.update(executed)
+
+    return ShardReport(shard, results, txns, time.perf_counter() - start, registry, limiter.report())
+
+
+def run_fleet(fleet: dict, config, shards: int, algod_address: str = ALGOD_ADDRESS,
+              algod_token: str = ALGOD_TOKEN, read_rate: float = READ_RATE,
+              write_rate: float = WRITE_RATE, operations: tuple = OPERATIONS,
+              threads: int = THREADS) -> list:
+    """
+    Run one pass over the whole fleet across `shards` worker processes.
+
+    Worker registries are merged into this process's metrics registry.
+
+    Args:
+        fleet: address -> mnemonic
+        config: appconfig.AppConfig of the contract
+        shards: Worker processes (1 runs in-process)
+        read_rate: Total read requests per second, split evenly between shards (0 for no cap)
+        write_rate: Total submissions per second, split evenly between shards (0 for no cap)
+
+    Returns:
+        list: ShardReport per non-empty shard, by shard index
+    """
+    parts = split_fleet(fleet, shards)
+    rates = (read_rate / shards, write_rate / shards)
+    if shards == 1:
+        return [run_shard(0, parts[0], config, algod_address, algod_token, *rates, operations, threads)]
+
+    # Workers report through the coordinator instead of their own exporters
+    for name in ("GROWPOD_METRICS_FILE", "GROWPOD_METRICS_PORT"):
+        os.environ.pop(name, None)
+
+    reports = []
+    with ProcessPoolExecutor(max_workers=shards, mp_context=multiprocessing.get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        futures = [
+            pool.submit(run_shard, index, part, config, algod_address, algod_token, *rates, operations, threads)
+            for index, part in enumerate(parts) if part
+        ]
+        for future in as_completed(futures):
+            report = future.result()
+            registry.merge(report.registry)
+            reports.append(report)
+    return sorted(reports, key=lambda report: report.shard)
+
+
+def main():
+    fleet_path = os.getenv("FLEET_FILE")
+    app_id = os.getenv("GROWPOD_APP_ID")
+
+    if not all([fleet_path, app_id]):
+        print("ERROR: Required environment variables not set:")
+        print("  FLEET_FILE - One account mnemonic per line")
+        print("  GROWPOD_APP_ID - Contract application ID")
+        sys.exit(1)
+
+    config = resolve(algod_client, int(app_id))
+    if not config.bud_asset:
+        print("ERROR: Contract has no $BUD asset configured. Run the bootstrap first.")
+        sys.exit(1)
+    shards = int(os.getenv("FLEET_SHARDS", str(os.cpu_count() or 1)))
+    operations = tuple(op.strip() for op in os.getenv("FLEET_OPERATIONS", ",".join(OPERATIONS)).split(","))
+    unknown = set(operations) - set(OPERATIONS)
+    if unknown:
+        print(f"ERROR: Unknown FLEET_OPERATIONS: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("GrowPod Empire - Fleet Runner")
+    print("=" * 50)
+
+    fleet = load_fleet(fleet_path)
+    print(f"Accounts: {len(fleet)}, shards: {shards}")
+    print(f"Operations: {', '.join(operations)}\n")
+
+    start = time.perf_counter()
+    reports = run_fleet(fleet, config, shards, operations=operations)
+    elapsed = time.perf_counter() - start
+
+    results = {address: outcome for report in reports for address, outcome in report.results.items()}
+    failed = {address: outcome for address, outcome in results.items() if outcome not in ("ok", "nothing due")}
+    for report in reports:
+        ok = sum(1 for outcome in report.results.values() if outcome == "ok")
+        print(f"  Shard {report.shard}: {len(report.results)} accounts, {ok} groups confirmed, "
+              f"{report.txns} txns in {report.seconds:.1f}s")
+    txns = sum(report.txns for report in reports)
+    print(f"\n  Confirmed: {sum(1 for outcome in results.values() if outcome == 'ok')}")
+    print(f"  Nothing due: {sum(1 for outcome in results.values() if outcome == 'nothing due')}")
+    print(f"  Failed: {len(failed)}")
+    print(f"  Throughput: {txns / elapsed if elapsed else 0:,.1f} txns/s")
+    for kind in ("read", "write"):
+        sustained = sum(report.limits[kind]["sustained_rate"] for report in reports)
+        congestion = sum(report.limits[kind]["congestion"] for report in reports)
+        print(f"  Sustained {kind}s: {sustained:,.1f} req/s ({congestion} congestion signal(s))")
+    for address, outcome in failed.items():
+        print(f"    {address[:8]}...  {outcome}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Block follower for GrowPod Empire
+Walks rounds from a checkpoint and yields every GrowPod app call as a typed event,
+including inner BUD/TERP/SLOT transfers and decoded contract event logs.
+"""
+from algosdk import encoding
+from typing import NamedTuple
+from events import EVENT_SIZE, METHOD_NAMES, decode_event
+from multinode import connect
+from submit import call_with_retry
+import msgpack
+import os
+import sys
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
+
+# Methods that act on the account rather than a single pod
+ACCOUNT_METHODS = ("breed", "claim_slot_token", "unlock_slot", "bootstrap", "set_asa_ids")
+
+
+class Transfer(NamedTuple):
+    asset: str  # "BUD", "TERP", "SLOT" or the raw asset ID as a string
+    amount: int
+    receiver: str
+
+
+class AppCallEvent(NamedTuple):
+    round: int
+    intra: int  # Position of the transaction within its block
+    timestamp: int
+    sender: str
+    method: str
+    pod: int  # 0 for account-wide methods
+    args: tuple
+    transfers: tuple  # Inner asset transfers issued by the contract
+    events: tuple  # Decoded GrowPodEvent log records
+
+
+def method_pod(method: str) -> int:
+    """Pod number a contract method acts on (0 for account-wide methods)."""
+    if method in ACCOUNT_METHODS:
+        return 0
+    return 2 if method.endswith("_2") else 1
+
+
+def load_checkpoint(path: str, default: int) -> int:
+    """Read the last fully processed round, or `default` if none was saved."""
+    try:
+        with open(path, 'r') as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def save_checkpoint(path: str, round_num: int) -> None:
+    """Atomically persist the last fully processed round."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(str(round_num))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def decode_app_calls(block: dict, app_id: int, asset_names: dict = None) -> list:
+    """
+    Decode the GrowPod app calls in one msgpack-decoded block.
+
+    Args:
+        block: The "block" object of a msgpack block response
+        app_id: GrowPod smart contract application ID
+        asset_names: Optional {asset_id: "BUD"/"TERP"/"SLOT"} labels
+
+    Returns:
+        list: AppCallEvent for each matching top-level transaction
+    """
+    asset_names = asset_names or {}
+    round_num = block.get('rnd', 0)
+    timestamp = block.get('ts', 0)
+    calls = []
+
+    for intra, stxn in enumerate(block.get('txns', [])):
+        txn = stxn['txn']
+        if txn.get('apid') != app_id:
+            continue
+        args = tuple(txn.get('apaa', []))
+        method = args[0].decode('utf-8', errors='replace') if args else ""
+        apply_data = stxn.get('dt', {})
+
+        transfers = []
+        for inner in apply_data.get('itx', []):
+            itxn = inner['txn']
+            if itxn.get('type') == 'axfer':
+                asset_id = itxn.get('xaid', 0)
+                transfers.append(Transfer(
+                    asset_names.get(asset_id, str(asset_id)),
+                    itxn.get('aamt', 0),
+                    encoding.encode_address(itxn['arcv']) if 'arcv' in itxn else ""
+                ))
+
+        events = tuple(
+            decode_event(log) for log in apply_data.get('lg', [])
+            if len(log) == EVENT_SIZE and log[0] in METHOD_NAMES
+        )
+
+        calls.append(AppCallEvent(
+            round_num,
+            intra,
+            timestamp,
+            encoding.encode_address(txn['snd']),
+            method,
+            method_pod(method),
+            args[1:],
+            tuple(transfers),
+            events
+        ))
+    return calls
+
+
+def follow_rounds(app_id: int, start_round: int, asset_names: dict = None, client=None):
+    """
+    Yield (round, [AppCallEvent, ...]) for every round from start_round on, forever.
+
+    Rounds with no GrowPod calls are yielded with an empty list, so callers can
+    checkpoint them alongside their own writes.
+    """
+    client = client or algod_client
+    last_round = call_with_retry(client.status)['last-round']
+    round_num = start_round
+
+    while True:
+        if round_num > last_round:
+            last_round = call_with_retry(client.status_after_block, round_num - 1)['last-round']
+            continue
+
+        raw = call_with_retry(client.block_info, round_num, response_format="msgpack")
+        block = msgpack.unpackb(raw, raw=False, strict_map_key=False)['block']
+        yield round_num, decode_app_calls(block, app_id, asset_names)
+        round_num += 1
+
+
+def follow(
+    app_id: int,
+    checkpoint_path: str,
+    start_round: int = None,
+    asset_names: dict = None,
+    client=None
+):
+    """
+    Yield GrowPod app-call events round by round, forever.
+
+    The checkpoint is advanced only after every event of a round has been
+    consumed, so a restart resumes at the first round not fully processed.
+    Consumers that must be exactly-once can dedupe on (round, intra).
+
+    Args:
+        app_id: GrowPod smart contract application ID
+        checkpoint_path: File holding the last fully processed round
+        start_round: First round to process when no checkpoint exists
+            (defaults to the current round)
+        asset_names: Optional {asset_id: "BUD"/"TERP"/"SLOT"} labels
+        client: Algod client (defaults to the TestNet client)
+
+    Yields:
+        AppCallEvent
+    """
+    client = client or algod_client
+    if start_round is None:
+        start_round = call_with_retry(client.status)['last-round']
+    first_round = load_checkpoint(checkpoint_path, start_round - 1) + 1
+
+    for round_num, calls in follow_rounds(app_id, first_round, asset_names, client):
+        yield from calls
+        save_checkpoint(checkpoint_path, round_num)
+
+
+def main():
+    app_id = os.getenv("GROWPOD_APP_ID")
+    if not app_id:
+        print("ERROR: GROWPOD_APP_ID environment variable not set.")
+        sys.exit(1)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    checkpoint_path = os.getenv("FOLLOWER_CHECKPOINT", os.path.join(script_dir, ".follower_round"))
+    start_round = os.getenv("START_ROUND")
+
+    asset_names = {}
+    for name in ("BUD", "TERP", "SLOT"):
+        asset_id = os.getenv(f"{name}_ASSET_ID")
+        if asset_id:
+            asset_names[int(asset_id)] = name
+
+    print("=" * 50)
+    print("GrowPod Empire - Block Follower")
+    print("=" * 50)
+    print(f"Checkpoint: {checkpoint_path}\n")
+
+    for event in follow(int(app_id), checkpoint_path, int(start_round) if start_round else None, asset_names):
+        transfers = ", ".join(f"{t.amount} {t.asset}" for t in event.transfers)
+        print(f"[{event.round}:{event.intra}] {event.sender[:8]}... {event.method} pod={event.pod}"
+              + (f" -> {transfers}" if transfers else ""))
+
+
+if __name__ == "__main__":
+    main()
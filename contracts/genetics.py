@@ -0,0 +1,235 @@
+"""
+Breeding genetics for GrowPod Empire
+Derives a hybrid's DNA and terpene profile from two parents, byte by byte:
+60% from parent1 (dominant), 30% from parent2 (recessive), 10% seeded mutation.
+
+The cross is fully deterministic. Its seed is sha256 of the domain tag, both
+parents' DNA and the breed nonce, so the same (parents, nonce) always yields the
+same 32-byte `dna` and `terpene_profile` values to store for the hybrid.
+
+For every byte position i of a field ("dna" or "terp"):
+    roll_i   = sha256(seed + field + b"select")[i] * 100 // 256   (0..99)
+    mutant_i = sha256(seed + field + b"mutate")[i]
+    hybrid_i = parent1_i if roll_i < 60 else parent2_i if roll_i < 90 else mutant_i
+
+`cross` is the scalar reference; `cross_many` evaluates thousands of crosses in
+one NumPy call and returns byte-identical results.
+"""
+from model import pod_key
+from statecodec import read_local
+import hashlib
+import numpy as np
+
+GENE_BYTES = 32
+DOMINANT_PCT = 60
+RECESSIVE_PCT = 30  # The remaining 10% mutates
+SEED_DOMAIN = b"growpod-breed"
+FIELDS = (b"dna", b"terp")
+
+
+# SHA-256 round constants and initial state (FIPS 180-4)
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.uint32)
+_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.uint32)
+
+
+def _rotr(x: np.ndarray, r: int) -> np.ndarray:
+    return (x >> r) | (x << (32 - r))
+
+
+def _compress(state: list, w: list) -> list:
+    """One SHA-256 compression over n lanes (lists of (n,) uint32 arrays)."""
+    w = list(w)
+    for t in range(16, 64):
+        s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+        s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+        w.append(w[t - 16] + s0 + w[t - 7] + s1)
+    a, b, c, d, e, f, g, h = state
+    for t in range(64):
+        t1 = h + (_rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)) + (g ^ (e & (f ^ g))) + (w[t] + _K[t])
+        t2 = (_rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)) + ((a & b) | (c & (a | b)))
+        a, b, c, d, e, f, g, h = t1 + t2, a, b, c, d + t1, e, f, g
+    return [x + y for x, y in zip(state, (a, b, c, d, e, f, g, h))]
+
+
+def sha256_many(messages: np.ndarray) -> np.ndarray:
+    """
+    SHA-256 of n equal-length messages at once.
+
+    Args:
+        messages: (n, length) uint8 array, one message per row
+
+    Returns:
+        np.ndarray: (n, 32) uint8 digests, identical to hashlib.sha256
+    """
+    n, length = messages.shape
+    blocks = (length + 9 + 63) // 64
+    padded = np.zeros((n, blocks * 64), dtype=np.uint8)
+    padded[:, :length] = messages
+    padded[:, length] = 0x80
+    padded[:, -8:] = np.frombuffer((length * 8).to_bytes(8, 'big'), dtype=np.uint8)
+    words = padded.view('>u4').astype(np.uint32).T.copy()  # (blocks * 16, n)
+
+    state = [np.full(n, h, dtype=np.uint32) for h in _H0]
+    for block in range(blocks):
+        state = _compress(state, words[block * 16:(block + 1) * 16])
+    return np.stack(state, axis=1).astype('>u4').view(np.uint8).reshape(n, GENE_BYTES)
+
+
+def _itob(value: int) -> bytes:
+    return value.to_bytes(8, 'big')
+
+
+def cross_seed(dna1: bytes, dna2: bytes, nonce: int = 0) -> bytes:
+    """32-byte seed of one cross."""
+    return hashlib.sha256(SEED_DOMAIN + dna1 + dna2 + _itob(nonce)).digest()
+
+
+def _streams(seed: bytes, field: bytes) -> tuple:
+    """(selector, mutation) byte streams for one field of one cross."""
+    return (
+        hashlib.sha256(seed + field + b"select").digest(),
+        hashlib.sha256(seed + field + b"mutate").digest(),
+    )
+
+
+def cross_seeds(dna1: np.ndarray, dna2: np.ndarray, nonces) -> np.ndarray:
+    """(n, 32) seeds of n crosses; row i equals cross_seed(dna1[i], dna2[i], nonces[i])."""
+    n = len(dna1)
+    messages = np.empty((n, len(SEED_DOMAIN) + 2 * GENE_BYTES + 8), dtype=np.uint8)
+    messages[:, :len(SEED_DOMAIN)] = np.frombuffer(SEED_DOMAIN, dtype=np.uint8)
+    offset = len(SEED_DOMAIN)
+    messages[:, offset:offset + GENE_BYTES] = dna1
+    messages[:, offset + GENE_BYTES:offset + 2 * GENE_BYTES] = dna2
+    nonces = np.broadcast_to(np.asarray(nonces, dtype=np.uint64), (n,))
+    messages[:, -8:] = nonces.astype('>u8').view(np.uint8).reshape(n, 8)
+    return sha256_many(messages)
+
+
+def stream_many(seeds: np.ndarray, field: bytes, tag: bytes) -> np.ndarray:
+    """(n, 32) sha256(seed + field + tag) per row of `seeds` (tag b"select" or b"mutate")."""
+    suffix = field + tag
+    messages = np.empty((len(seeds), GENE_BYTES + len(suffix)), dtype=np.uint8)
+    messages[:, :GENE_BYTES] = seeds
+    messages[:, GENE_BYTES:] = np.frombuffer(suffix, dtype=np.uint8)
+    return sha256_many(messages)
+
+
+def _check_genes(*genes: bytes) -> None:
+    for gene in genes:
+        if len(gene) != GENE_BYTES:
+            raise ValueError(f"expected {GENE_BYTES}-byte genes, got {len(gene)} bytes")
+
+
+def cross(dna1: bytes, terp1: bytes, dna2: bytes, terp2: bytes, nonce: int = 0) -> tuple:
+    """
+    Compute one hybrid.
+
+    Args:
+        dna1: Parent1 `dna` (32 bytes)
+        terp1: Parent1 `terpene_profile` (32 bytes)
+        dna2: Parent2 `dna` (32 bytes)
+        terp2: Parent2 `terpene_profile` (32 bytes)
+        nonce: Breed nonce (the same value breed.py leases on)
+
+    Returns:
+        tuple: (dna, terpene_profile) of the hybrid, 32 bytes each
+    """
+    _check_genes(dna1, terp1, dna2, terp2)
+    seed = cross_seed(dna1, dna2, nonce)
+    hybrid = []
+    for field, gene1, gene2 in ((FIELDS[0], dna1, dna2), (FIELDS[1], terp1, terp2)):
+        selector, mutation = _streams(seed, field)
+        out = bytearray(GENE_BYTES)
+        for i in range(GENE_BYTES):
+            roll = selector[i] * 100 // 256
+            if roll < DOMINANT_PCT:
+                out[i] = gene1[i]
+            elif roll < DOMINANT_PCT + RECESSIVE_PCT:
+                out[i] = gene2[i]
+            else:
+                out[i] = mutation[i]
+        hybrid.append(bytes(out))
+    return tuple(hybrid)
+
+
+def as_gene_array(genes) -> np.ndarray:
+    """Stack 32-byte values (or pass through an (n, 32) uint8 array)."""
+    if isinstance(genes, np.ndarray):
+        if genes.ndim != 2 or genes.shape[1] != GENE_BYTES:
+            raise ValueError(f"expected an (n, {GENE_BYTES}) array, got {genes.shape}")
+        return genes.astype(np.uint8, copy=False)
+    genes = list(genes)
+    _check_genes(*genes)
+    return np.frombuffer(b"".join(genes), dtype=np.uint8).reshape(len(genes), GENE_BYTES)
+
+
+def cross_streams(dna1: np.ndarray, dna2: np.ndarray, nonces: np.ndarray) -> dict:
+    """
+    Selector and mutation streams for n crosses.
+
+    Seeds and streams are hashed with sha256_many, all n rows per call, so there
+    is no per-cross Python work.
+
+    Returns:
+        dict: field -> (rolls, mutations), each an (n, 32) uint8 array
+    """
+    seeds = cross_seeds(dna1, dna2, nonces)
+    streams = {}
+    for field in FIELDS:
+        selector = stream_many(seeds, field, b"select")
+        rolls = (selector.astype(np.uint16) * 100 >> 8).astype(np.uint8)
+        streams[field] = (rolls, stream_many(seeds, field, b"mutate"))
+    return streams
+
+
+def mix(rolls: np.ndarray, gene1: np.ndarray, gene2: np.ndarray, mutation: np.ndarray) -> np.ndarray:
+    """Apply the 60/30/10 selection to whole (n, 32) arrays."""
+    return np.where(
+        rolls < DOMINANT_PCT, gene1,
+        np.where(rolls < DOMINANT_PCT + RECESSIVE_PCT, gene2, mutation)
+    ).astype(np.uint8)
+
+
+def cross_many(dna1, terp1, dna2, terp2, nonces=0) -> tuple:
+    """
+    Compute n hybrids at once.
+
+    Args:
+        dna1, terp1, dna2, terp2: (n, 32) uint8 arrays or sequences of 32-byte values
+        nonces: Breed nonce per cross (scalar or length-n)
+
+    Returns:
+        tuple: (dna, terpene_profile) as (n, 32) uint8 arrays; row i equals
+            cross(dna1[i], terp1[i], dna2[i], terp2[i], nonces[i])
+    """
+    dna1, terp1, dna2, terp2 = (as_gene_array(g) for g in (dna1, terp1, dna2, terp2))
+    n = len(dna1)
+    if not (len(terp1) == len(dna2) == len(terp2) == n):
+        raise ValueError("parent arrays must have the same length")
+    nonces = np.broadcast_to(np.asarray(nonces, dtype=np.uint64), (n,))
+
+    streams = cross_streams(dna1, dna2, nonces)
+    rolls, mutation = streams[FIELDS[0]]
+    dna = mix(rolls, dna1, dna2, mutation)
+    rolls, mutation = streams[FIELDS[1]]
+    terp = mix(rolls, terp1, terp2, mutation)
+    return dna, terp
+
+
+def read_parent(algod_client, address: str, app_id: int, pod: int = 1) -> tuple:
+    """(dna, terpene_profile) of one of the account's pods (empty bytes if unset)."""
+    state = read_local(algod_client, address, app_id)
+    if state is None:
+        return b"", b""
+    return state.get(pod_key("dna", pod), b""), state.get(pod_key("terpene_profile", pod), b"")
@@ -5,14 +5,17 @@ Executes harvest transaction to mint $BUD tokens based on yield calculation
 """
 from algosdk import account, mnemonic
 from algosdk.transaction import ApplicationNoOpTxn, wait_for_confirmation
-from algosdk.v2client import algod
+from metrics import phase, record_success
+from multinode import connect
+from events import events_from_txn
+from fees import set_group_fees
 import os
 import sys
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
 
 
 def harvest_plant(user_mnemonic: str, app_id: int) -> dict:
@@ -34,7 +37,8 @@ def harvest_plant(user_mnemonic: str, app_id: int) -> dict:
     """
     private_key = mnemonic.to_private_key(user_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("harvest", "suggested_params"):
+        params = algod_client.suggested_params()
 
     # Create harvest transaction
     txn = ApplicationNoOpTxn(
@@ -43,15 +47,23 @@ def harvest_plant(user_mnemonic: str, app_id: int) -> dict:
         index=app_id,
         app_args=["harvest"]
     )
+    set_group_fees([txn], params)  # Covers the $BUD inner transfer
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("harvest", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("harvest", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Harvesting plant... TXID: {txid}")
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("harvest", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("harvest")
     print("Harvest successful!")
     print(f"  $BUD minted to: {sender}")
-    print(f"  Base yield: 0.25g (250,000,000 units)")
+    for event in events_from_txn(confirmed_txn):
+        if event.method == "harvest":
+            print(f"  Yield: {event.amount / 1_000_000:,.6f} $BUD ({event.amount:,} units)")
+            print(f"  Total harvests: {event.counter}")
     
     return confirmed_txn
 
@@ -74,7 +86,8 @@ def check_and_mint_terp(user_mnemonic: str, app_id: int) -> dict:
     """
     private_key = mnemonic.to_private_key(user_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("check_terp", "suggested_params"):
+        params = algod_client.suggested_params()
 
     txn = ApplicationNoOpTxn(
         sender=sender,
@@ -82,14 +95,25 @@ def check_and_mint_terp(user_mnemonic: str, app_id: int) -> dict:
         index=app_id,
         app_args=["check_terp"]
     )
+    set_group_fees([txn], params)  # Covers the $TERP inner transfer
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("check_terp", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("check_terp", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Checking terpene rarity... TXID: {txid}")
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("check_terp", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("check_terp")
     print("Terpene check complete!")
-    print("  If profile was rare, $TERP has been minted to your wallet.")
+    for event in events_from_txn(confirmed_txn):
+        if event.method != "check_terp":
+            continue
+        if event.amount:
+            print(f"  Rare profile (rarity byte {event.counter})! Minted {event.amount / 1_000_000:,.0f} $TERP.")
+        else:
+            print(f"  Common profile (rarity byte {event.counter}); no $TERP this time.")
     
     return confirmed_txn
 
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+SQLite indexer for GrowPod Empire
+Keeps app-call history, inner token flows and current per-pod state in a local
+SQLite database, updated incrementally round by round from the block follower.
+
+A new database starts at the current round (START_ROUND to backfill from an
+earlier one, e.g. the app's creation round); pods only appear once they act.
+"""
+from follower import algod_client, follow_rounds
+from submit import call_with_retry
+import os
+import sqlite3
+import sys
+import time
+
+# Cooldowns mirrored from contract.py (TestNet)
+WATER_COOLDOWN = 600
+NUTRIENT_COOLDOWN = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS app_calls (
+    round INTEGER NOT NULL,
+    intra INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    method TEXT NOT NULL,
+    pod INTEGER NOT NULL,
+    amount INTEGER,
+    counter INTEGER,
+    PRIMARY KEY (round, intra)
+);
+CREATE INDEX IF NOT EXISTS app_calls_method_ts ON app_calls (method, ts);
+CREATE INDEX IF NOT EXISTS app_calls_sender ON app_calls (sender, round);
+CREATE TABLE IF NOT EXISTS transfers (
+    round INTEGER NOT NULL,
+    intra INTEGER NOT NULL,
+    ts INTEGER NOT NULL,
+    asset TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    receiver TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transfers_asset_ts ON transfers (asset, ts);
+CREATE TABLE IF NOT EXISTS accounts (
+    address TEXT PRIMARY KEY,
+    harvest_count INTEGER NOT NULL DEFAULT 0,
+    pod_slots INTEGER NOT NULL DEFAULT 2
+);
+CREATE INDEX IF NOT EXISTS accounts_harvest_count ON accounts (harvest_count);
+CREATE TABLE IF NOT EXISTS pods (
+    address TEXT NOT NULL,
+    pod INTEGER NOT NULL,
+    stage INTEGER NOT NULL DEFAULT 0,
+    water_count INTEGER NOT NULL DEFAULT 0,
+    nutrient_count INTEGER NOT NULL DEFAULT 0,
+    last_watered INTEGER NOT NULL DEFAULT 0,
+    last_nutrients INTEGER NOT NULL DEFAULT 0,
+    next_eligible INTEGER,
+    updated_round INTEGER NOT NULL,
+    PRIMARY KEY (address, pod)
+);
+CREATE INDEX IF NOT EXISTS pods_stage ON pods (stage);
+CREATE INDEX IF NOT EXISTS pods_next_eligible ON pods (next_eligible);
+"""
+
+
+def open_index(path: str) -> sqlite3.Connection:
+    """Open (and create if needed) the index database."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def last_indexed_round(conn: sqlite3.Connection) -> int:
+    """Last round fully written to the index (0 if empty)."""
+    row = conn.execute("SELECT value FROM meta WHERE key = 'last_round'").fetchone()
+    return row[0] if row else 0
+
+
+def next_eligible(stage: int, last_watered: int, ts: int):
+    """
+    Earliest time the pod's next action can succeed.
+
+    Growing pods (1-4) wait out the water cooldown; ready (5) and dead/harvested
+    (6) pods are actionable immediately; empty pods (0) have no next action.
+    """
+    if stage == 0:
+        return None
+    if 1 <= stage <= 4 and last_watered:
+        return last_watered + WATER_COOLDOWN
+    return ts
+
+
+def _apply_event(conn: sqlite3.Connection, call, event) -> None:
+    """Fold one decoded contract event into the current pod/account state."""
+    ts = call.timestamp
+    if event.pod == 0:
+        if event.method == "claim_slot_token":
+            conn.execute(
+                "INSERT INTO accounts (address, harvest_count) VALUES (?, ?) "
+                "ON CONFLICT(address) DO UPDATE SET harvest_count = excluded.harvest_count",
+                (call.sender, event.counter)
+            )
+        elif event.method == "unlock_slot":
+            conn.execute(
+                "INSERT INTO accounts (address, pod_slots) VALUES (?, ?) "
+                "ON CONFLICT(address) DO UPDATE SET pod_slots = excluded.pod_slots",
+                (call.sender, event.counter)
+            )
+        return
+
+    key = (call.sender, event.pod)
+    row = conn.execute(
+        "SELECT water_count, nutrient_count, last_watered, last_nutrients FROM pods "
+        "WHERE address = ? AND pod = ?", key
+    ).fetchone()
+    water_count, nutrient_count, last_watered, last_nutrients = row or (0, 0, 0, 0)
+
+    if event.method in ("mint_pod", "cleanup"):
+        water_count = nutrient_count = last_watered = last_nutrients = 0
+    elif event.method == "water":
+        water_count, last_watered = event.counter, ts
+    elif event.method == "nutrients":
+        nutrient_count, last_nutrients = event.counter, ts
+    elif event.method == "harvest":
+        conn.execute(
+            "INSERT INTO accounts (address, harvest_count) VALUES (?, ?) "
+            "ON CONFLICT(address) DO UPDATE SET harvest_count = excluded.harvest_count",
+            (call.sender, event.counter)
+        )
+
+    conn.execute(
+        "INSERT OR REPLACE INTO pods (address, pod, stage, water_count, nutrient_count, "
+        "last_watered, last_nutrients, next_eligible, updated_round) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (*key, event.stage, water_count, nutrient_count, last_watered, last_nutrients,
+         next_eligible(event.stage, last_watered, ts), call.round)
+    )
+
+
+def index_round(conn: sqlite3.Connection, round_num: int, calls: list) -> None:
+    """Write one round's app calls and state changes in a single transaction."""
+    with conn:
+        for call in calls:
+            event = call.events[0] if call.events else None
+            conn.execute(
+                "INSERT OR IGNORE INTO app_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (call.round, call.intra, call.timestamp, call.sender, call.method, call.pod,
+                 event.amount if event else None, event.counter if event else None)
+            )
+            conn.executemany(
+                "INSERT INTO transfers VALUES (?, ?, ?, ?, ?, ?)",
+                [(call.round, call.intra, call.timestamp, t.asset, t.amount, t.receiver)
+                 for t in call.transfers]
+            )
+            for event in call.events:
+                _apply_event(conn, call, event)
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_round', ?)", (round_num,)
+        )
+
+
+def run_indexer(conn: sqlite3.Connection, app_id: int, start_round: int = None, asset_names: dict = None,
+                client=None):
+    """
+    Index rounds forever, resuming after the last round stored in the database.
+
+    Each round commits atomically with its checkpoint, so a crash never leaves
+    a partially indexed round behind.
+
+    Args:
+        start_round: First round to index when the database is empty
+            (defaults to the current round)
+    """
+    client = client or algod_client
+    last_round = last_indexed_round(conn)
+    if start_round is None:
+        start_round = last_round + 1 if last_round else call_with_retry(client.status)['last-round']
+    first_round = max(last_round + 1, start_round)
+    for round_num, calls in follow_rounds(app_id, first_round, asset_names, client):
+        index_round(conn, round_num, calls)
+        yield round_num, len(calls)
+
+
+# ========== QUERIES ==========
+
+def pods_at_stage(conn: sqlite3.Connection, stage: int) -> list:
+    """(address, pod) pairs currently at the given stage."""
+    return conn.execute("SELECT address, pod FROM pods WHERE stage = ?", (stage,)).fetchall()
+
+
+def pods_due(conn: sqlite3.Connection, now: int = None) -> list:
+    """(address, pod, stage) for pods whose next action is possible by `now`."""
+    now = now if now is not None else int(time.time())
+    return conn.execute(
+        "SELECT address, pod, stage FROM pods WHERE next_eligible <= ? ORDER BY next_eligible",
+        (now,)
+    ).fetchall()
+
+
+def bud_burned(conn: sqlite3.Connection, methods: tuple = ("cleanup", "cleanup_2"), since: int = 0) -> int:
+    """Total $BUD units burned by the given methods since a unix timestamp."""
+    placeholders = ",".join("?" * len(methods))
+    row = conn.execute(
+        f"SELECT COALESCE(SUM(amount), 0) FROM app_calls WHERE method IN ({placeholders}) AND ts >= ?",
+        (*methods, since)
+    ).fetchone()
+    return row[0]
+
+
+def main():
+    app_id = os.getenv("GROWPOD_APP_ID")
+    if not app_id:
+        print("ERROR: GROWPOD_APP_ID environment variable not set.")
+        sys.exit(1)
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    db_path = os.getenv("INDEX_DB", os.path.join(script_dir, "growpod_index.db"))
+    start_round = int(os.getenv("START_ROUND")) if os.getenv("START_ROUND") else None
+
+    asset_names = {}
+    for name in ("BUD", "TERP", "SLOT"):
+        asset_id = os.getenv(f"{name}_ASSET_ID")
+        if asset_id:
+            asset_names[int(asset_id)] = name
+
+    print("=" * 50)
+    print("GrowPod Empire - Indexer")
+    print("=" * 50)
+
+    conn = open_index(db_path)
+    print(f"Database: {db_path}")
+    last_round = last_indexed_round(conn)
+    if last_round:
+        print(f"Resuming after round {last_round}\n")
+    else:
+        print(f"Starting at round {start_round or 'current'}\n")
+
+    for round_num, count in run_indexer(conn, int(app_id), start_round, asset_names):
+        if count:
+            print(f"  Round {round_num}: indexed {count} app call(s)")
+
+
+if __name__ == "__main__":
+    main()
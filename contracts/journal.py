@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Write-ahead transaction journal for GrowPod Empire
+Records every signed group before it is submitted and its outcome after, so a
+script that dies between sending and confirming leaves more than a txid on
+stdout: the next run finds the group, learns what happened to it and finishes
+the job.
+
+On disk (GROWPOD_JOURNAL):
+    journal.log        Append-only JSON lines: one "begin" record per group
+                       (txid, group id, logical operation, validity window,
+                       signed bytes), one "outcome" record once it resolves
+    pending/<txid>     One marker per unresolved group, holding its begin
+                       record; written before submission, removed on outcome
+
+Recovery reads only pending/, so it costs O(unresolved), however long the log.
+Entries record their network's genesis hash; entries of another network (a
+stand-in, another ALGOD_ADDRESS) are left alone. Each unresolved group is
+settled once:
+- confirmed or rejected according to the node: recorded as such
+- still inside its validity window: the identical signed bytes are
+  rebroadcast (a resend can never execute twice: same txid) and watched
+  round by round until the node confirms it or its LastValid round passes
+- past its LastValid round, or reported "already in ledger": looked up in the
+  blocks of its window (at most MAX_VALIDITY rounds); an expired group that is
+  not there definitely did not execute
+A group whose outcome cannot be established (node unreachable, window pruned
+from the node's blocks) stays pending for the next run.
+
+Run directly to settle the journal and list what is still open:
+    python contracts/journal.py
+"""
+from algosdk import encoding
+from algosdk.error import AlgodHTTPError
+from metrics import failure_reason
+from multinode import connect
+from submit import (
+    broadcast,
+    call_with_retry,
+    find_in_blocks,
+    is_transient,
+    outcome_step,
+    CONFIRMED,
+    EXPIRED,
+    IN_LEDGER,
+    LOOKUP,
+    REJECTED,
+    RESEND
+)
+from typing import NamedTuple
+import base64
+import json
+import os
+import sys
+import threading
+import time
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+
+JOURNAL_DIR = os.getenv(
+    "GROWPOD_JOURNAL",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".growpod_journal")
+)
+
+
+class Entry(NamedTuple):
+    txid: str  # Of the group's first transaction
+    group: str  # Base64 group id ("" for a single transaction)
+    operation: str  # Logical operation ("cleanup", "breed", ...)
+    first_valid: int
+    last_valid: int
+    signed: tuple  # Base64 msgpack of each signed transaction, in group order
+    created: float
+    genesis_hash: str  # Base64 genesis hash of the network the group was signed for
+
+    def signed_txns(self) -> list:
+        return [encoding.msgpack_decode(stxn) for stxn in self.signed]
+
+
+class Journal:
+    """Append-only log of submitted groups plus a marker per unresolved one."""
+
+    def __init__(self, directory: str = JOURNAL_DIR):
+        self.directory = directory
+        self.log_path = os.path.join(directory, "journal.log")
+        self.pending_dir = os.path.join(directory, "pending")
+        self.lock = threading.Lock()
+
+    def _append(self, record: dict) -> None:
+        os.makedirs(self.pending_dir, exist_ok=True)
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.lock, open(self.log_path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _sync_dir(self) -> None:
+        fd = os.open(self.pending_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def begin(self, signed_txns: list, operation: str) -> Entry:
+        """
+        Record a signed group; call before the first send.
+
+        Both the log record and the pending marker are on disk when this
+        returns, so a crash at any later point leaves the group recoverable.
+        """
+        first = signed_txns[0].transaction
+        entry = Entry(
+            signed_txns[0].get_txid(),
+            base64.b64encode(first.group).decode() if first.group else "",
+            operation,
+            min(stxn.transaction.first_valid_round for stxn in signed_txns),
+            max(stxn.transaction.last_valid_round for stxn in signed_txns),
+            tuple(encoding.msgpack_encode(stxn) for stxn in signed_txns),
+            time.time(),
+            first.genesis_hash,
+        )
+        record = {"type": "begin", **entry._asdict()}
+        self._append(record)
+        marker = os.path.join(self.pending_dir, entry.txid)
+        with open(f"{marker}.tmp", "w") as f:
+            json.dump(record, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{marker}.tmp", marker)
+        self._sync_dir()
+        return entry
+
+    def resolve(self, txid: str, status: str, confirmed_round: int = 0, detail: str = "") -> None:
+        """Record a group's outcome ("confirmed" or "failed") and close it."""
+        self._append({
+            "type": "outcome", "txid": txid, "status": status,
+            "round": confirmed_round, "detail": detail, "at": time.time(),
+        })
+        try:
+            os.remove(os.path.join(self.pending_dir, txid))
+        except FileNotFoundError:
+            pass
+
+    def unresolved(self) -> list:
+        """Entries with no outcome yet, oldest first (reads the markers only)."""
+        entries = []
+        try:
+            names = os.listdir(self.pending_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith(".tmp"):
+                continue  # Crashed before the marker was complete: never sent
+            with open(os.path.join(self.pending_dir, name)) as f:
+                record = json.load(f)
+            if "genesis_hash" not in record:
+                # Written before entries carried it: the signed bytes do
+                record["genesis_hash"] = encoding.msgpack_decode(record["signed"][0]).transaction.genesis_hash
+            entries.append(Entry(**{field: record[field] for field in Entry._fields}))
+        return sorted(entries, key=lambda entry: entry.created)
+
+    def find_lease(self, operation: str, lease: bytes, genesis_hash: str) -> tuple:
+        """
+        The journal's record of an earlier `operation` group leased with `lease`.
+
+        A lease only blocks a rerun until the earlier group's LastValid round, so
+        for operations the contract does not guard itself (breed) this is what
+        stops a confirmed or still-unsettled group from being submitted again.
+        Scans the whole log.
+
+        Returns:
+            tuple: ("confirmed", txid, round) or ("pending", txid, 0) for the
+                   first match on this network, or None
+        """
+        for entry in self.unresolved():
+            if entry.operation == operation and entry.genesis_hash == genesis_hash \
+                    and entry.signed_txns()[0].transaction.lease == lease:
+                return "pending", entry.txid, 0
+        begun = {}
+        for record in self.history():
+            if record["type"] == "begin" and record["operation"] == operation:
+                begun[record["txid"]] = record
+            elif record["type"] == "outcome" and record["status"] == "confirmed" and record["txid"] in begun:
+                first = encoding.msgpack_decode(begun[record["txid"]]["signed"][0]).transaction
+                if first.lease == lease and first.genesis_hash == genesis_hash:
+                    return "confirmed", record["txid"], record["round"]
+        return None
+
+    def history(self):
+        """Every record of the log, oldest first (for audits, not recovery)."""
+        try:
+            with open(self.log_path) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+
+def recover(algod_client, journal: Journal) -> list:
+    """
+    Settle every unresolved group of the journal signed for the node's network.
+
+    Returns:
+        list: (Entry, status, detail) per unresolved group of this network; status is
+              "confirmed", "failed" or "pending" (outcome not established, kept for next time)
+    """
+    genesis_hash = call_with_retry(algod_client.suggested_params).gh
+    entries = [entry for entry in journal.unresolved() if entry.genesis_hash == genesis_hash]
+    if not entries:
+        return []
+    current_round = call_with_retry(algod_client.status)['last-round']
+    outcomes = []
+    live = {entry.txid: entry for entry in entries}
+    in_ledger = set()
+    lookup = []  # Groups to find in the blocks of their window
+
+    def settle(entry, status, detail, confirmed_round=0):
+        if status != "pending":
+            journal.resolve(entry.txid, status, confirmed_round, detail)
+        outcomes.append((entry, status, detail))
+        live.pop(entry.txid, None)
+
+    while live:
+        for entry in list(live.values()):
+            try:
+                pending = call_with_retry(algod_client.pending_transaction_info, entry.txid)
+            except AlgodHTTPError as e:
+                if e.code != 404:
+                    settle(entry, "pending", failure_reason(e))
+                    continue
+                pending = {}
+            step = outcome_step(pending, current_round, entry.last_valid, entry.txid in in_ledger)
+            if step == CONFIRMED:
+                settle(entry, "confirmed", f"round {pending['confirmed-round']}", pending['confirmed-round'])
+            elif step == REJECTED:
+                settle(entry, "failed", pending['pool-error'])
+            elif step in (LOOKUP, EXPIRED):
+                lookup.append(entry)
+                live.pop(entry.txid)
+            elif step == RESEND:
+                # Still valid: resend the identical bytes
+                try:
+                    if broadcast(algod_client, entry.signed_txns(), method=entry.operation) == IN_LEDGER:
+                        in_ledger.add(entry.txid)
+                except Exception as e:
+                    if is_transient(e):
+                        settle(entry, "pending", failure_reason(e))
+                    else:
+                        settle(entry, "failed", str(e))
+        if live:
+            call_with_retry(algod_client.status_after_block, current_round)
+            current_round += 1
+
+    if lookup:
+        current_round = call_with_retry(algod_client.status)['last-round']
+        windows = {
+            entry.txid: (entry.signed_txns()[0], entry.first_valid, min(entry.last_valid, current_round))
+            for entry in lookup
+        }
+        try:
+            found = find_in_blocks(algod_client, windows)
+        except Exception as e:
+            # Without every block of the window, absence proves nothing
+            return outcomes + [(entry, "pending", f"window not readable: {failure_reason(e)}") for entry in lookup]
+        for entry in lookup:
+            if entry.txid in found:
+                settle(entry, "confirmed", f"round {found[entry.txid]}", found[entry.txid])
+            elif entry.txid in in_ledger:
+                settle(entry, "pending", "reported in ledger but not found in its window")
+            else:
+                settle(entry, "failed", f"expired after round {entry.last_valid}")
+    return outcomes
+
+
+def report(outcomes: list) -> None:
+    """Print one line per settled group."""
+    for entry, status, detail in outcomes:
+        print(f"  {entry.operation} {entry.txid[:12]}...: {status} ({detail})")
+
+
+def main():
+    journal = Journal()
+    algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
+
+    print("=" * 50)
+    print("GrowPod Empire - Transaction Journal")
+    print("=" * 50)
+    print(f"Journal: {journal.directory}")
+
+    unresolved = journal.unresolved()
+    print(f"{len(unresolved)} unresolved group(s)")
+    if not unresolved:
+        return
+    outcomes = recover(algod_client, journal)
+    report(outcomes)
+    other = len(unresolved) - len(outcomes)
+    if other:
+        print(f"  {other} group(s) signed for another network, left for a node of that network")
+    still_open = sum(1 for _, status, _ in outcomes if status == "pending")
+    if still_open:
+        print(f"\n{still_open} group(s) still pending; run again later.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,820 @@
+#!/usr/bin/env python3
+"""
+Local algod stand-in for GrowPod Empire
+In-memory HTTP server implementing the algod v2 endpoints the scripts use, with
+the GrowPod contract executed by model.py, so the client tooling can be
+load-tested offline.
+
+Endpoints:
+    GET  /v2/transactions/params
+    POST /v2/transactions                      (one or more concatenated signed txns)
+    GET  /v2/transactions/pending/{txid}
+    GET  /v2/status
+    GET  /v2/status/wait-for-block-after/{round}
+    GET  /v2/accounts/{address}                (JSON or ?format=msgpack)
+    GET  /v2/accounts/{address}/applications/{id}   (JSON or ?format=msgpack)
+    GET  /v2/applications/{id}
+    GET  /v2/assets/{id}
+    GET  /v2/blocks/{round}?format=msgpack
+    POST /v2/teal/compile
+    POST /dev/fund      {"address": ..., "amount": ...}   (stand-in only)
+    POST /dev/advance   {"seconds": ...}                  (stand-in only)
+
+Configuration (environment):
+    LOCALNODE_PORT=4001            Port to listen on
+    LOCALNODE_ROUND_TIME=2.8       Seconds per round
+    LOCALNODE_LATENCY_MS=0         Fixed latency added to every request
+    LOCALNODE_JITTER_MS=0          Uniform random latency on top
+    LOCALNODE_ERROR_429=0.0        Probability of a 429 on any request
+    LOCALNODE_CAPACITY=0           Requests served at once; more get a 429 (0 = unlimited)
+    LOCALNODE_ERROR_OVERSPEND=0.0  Probability a submit fails with overspend
+    LOCALNODE_ERROR_LOGIC=0.0      Probability a submit fails with a logic eval error
+    LOCALNODE_FEE_PER_BYTE=0       Suggested per-byte fee (non-zero = congestion)
+    LOCALNODE_FUND=addr1,addr2     Accounts funded with 1,000,000 ALGO at start
+    LOCALNODE_REPLICAS=0           Extra endpoints on the next ports, sharing the ledger
+
+Signatures are not verified and the approval program is never executed; every
+app is assumed to be the GrowPod contract.
+"""
+from algosdk import encoding
+from algosdk.logic import get_application_address
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from model import (
+    CallContext,
+    ContractReject,
+    apply_call,
+    initial_global_state,
+    initial_local_state
+)
+import base64
+import copy
+import hashlib
+import json
+import msgpack
+import os
+import random
+import threading
+import time
+
+GENESIS_ID = "growpod-local-v1"
+GENESIS_HASH = base64.b64encode(hashlib.sha256(GENESIS_ID.encode()).digest()).decode()
+MIN_FEE = 1000
+MIN_BALANCE = 100_000
+BLOCK_RETENTION = 1000  # Rounds of blocks kept for /v2/blocks
+FUND_AMOUNT = 1_000_000_000_000  # 1,000,000 ALGO
+
+
+class Rejected(Exception):
+    """A submitted group failed validation; carries the algod-style message."""
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def _addr(value) -> str:
+    return encoding.encode_address(value) if isinstance(value, bytes) else value
+
+
+def _txid(txn: dict) -> str:
+    """Transaction ID of a decoded canonical msgpack transaction."""
+    digest = encoding.checksum(b"TX" + msgpack.packb(txn, use_bin_type=True))
+    return base64.b32encode(digest).decode().rstrip("=")
+
+
+def _state_json(state: dict) -> list:
+    """Encode a state dict as algod's TEAL key-value list."""
+    out = []
+    for key, value in state.items():
+        if isinstance(value, bytes):
+            out.append({"key": _b64(key.encode()), "value": {"type": 1, "bytes": _b64(value), "uint": 0}})
+        else:
+            out.append({"key": _b64(key.encode()), "value": {"type": 2, "bytes": "", "uint": value}})
+    return out
+
+
+def _state_tkv(state: dict) -> dict:
+    """Encode a state dict as a msgpack TealKeyValue map (empty fields omitted, as go-codec does)."""
+    out = {}
+    for key, value in state.items():
+        if isinstance(value, bytes):
+            out[key.encode()] = {"tt": 1, "tb": value} if value else {"tt": 1}
+        else:
+            out[key.encode()] = {"tt": 2, "ui": value} if value else {"tt": 2}
+    return out
+
+
+def _txn_json(txn: dict) -> dict:
+    """Best-effort JSON rendering of a msgpack transaction."""
+    out = {}
+    for key, value in txn.items():
+        if key in ("snd", "rcv", "arcv", "asnd", "close", "aclose"):
+            out[key] = _addr(value)
+        elif isinstance(value, bytes):
+            out[key] = _b64(value)
+        elif isinstance(value, list):
+            out[key] = [_b64(v) if isinstance(v, bytes) else v for v in value]
+        elif isinstance(value, dict):
+            out[key] = _txn_json(value)
+        else:
+            out[key] = value
+    return out
+
+
+class Ledger:
+    """In-memory accounts, assets, apps and rounds."""
+
+    def __init__(self, round_time: float = 2.8, fee_per_byte: int = 0):
+        self.cond = threading.Condition()
+        self.round_time = round_time
+        self.fee_per_byte = fee_per_byte
+        self.round = 1
+        self.clock_offset = 0
+        self.timestamp = int(time.time())
+        self.last_round_at = time.monotonic()
+        self.next_id = 1000
+        self.accounts = {}  # address -> {"amount", "assets": {id: amt}, "apps": {app_id: local}}
+        self.assets = {}  # asset id -> params (msgpack names) + "creator"
+        self.apps = {}  # app id -> {"creator", "global", "approval", "clear", "gs", "ls"}
+        self.txns = {}  # txid -> pending-info dict
+        self.leases = {}  # (sender, lease) -> last valid round
+        self.pending_block = []
+        self.blocks = deque(maxlen=BLOCK_RETENTION)
+        self.requests = 0  # HTTP requests served (for RPC-per-operation benchmarks)
+
+    # ---------- rounds ----------
+
+    def tick(self) -> None:
+        """Close the current round."""
+        with self.cond:
+            self.blocks.append((self.round + 1, self.timestamp, self.pending_block))
+            self.pending_block = []
+            self.round += 1
+            self.timestamp = int(time.time()) + self.clock_offset
+            self.last_round_at = time.monotonic()
+            self.cond.notify_all()
+
+    def run_rounds(self, stop: threading.Event) -> None:
+        while not stop.wait(self.round_time):
+            self.tick()
+
+    def wait_for_round_after(self, round_num: int, timeout: float = 60.0) -> None:
+        with self.cond:
+            self.cond.wait_for(lambda: self.round > round_num, timeout)
+
+    def count_request(self) -> None:
+        with self.cond:
+            self.requests += 1
+
+    def advance_time(self, seconds: int) -> None:
+        """Move the ledger clock forward (e.g. past the water cooldown)."""
+        with self.cond:
+            self.clock_offset += seconds
+            self.timestamp += seconds
+
+    # ---------- accounts ----------
+
+    def _account(self, address: str) -> dict:
+        acct = self.accounts.get(address)
+        if acct is None:
+            acct = self.accounts[address] = {"amount": 0, "assets": {}, "apps": {}}
+        return acct
+
+    def fund(self, address: str, amount: int = FUND_AMOUNT) -> None:
+        with self.cond:
+            self._account(address)["amount"] += amount
+
+    def _min_balance(self, acct: dict) -> int:
+        return MIN_BALANCE * (1 + len(acct["assets"]) + len(acct["apps"]))
+
+    def _new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    # ---------- submission ----------
+
+    def submit(self, stxns: list) -> str:
+        """Validate and apply one atomic group; returns the first txid."""
+        with self.cond:
+            undo = {}
+            created = []
+            group = [stxn["txn"] for stxn in stxns]
+            txids = [_txid(txn) for txn in group]
+            try:
+                fees = 0
+                needed = 0
+                records = []
+                for index, txn in enumerate(group):
+                    record = self._apply(txn, txids[index], group[index - 1] if index else None, undo, created)
+                    fees += txn.get("fee", 0)
+                    size = len(msgpack.packb(stxns[index], use_bin_type=True))
+                    needed += max(MIN_FEE, self.fee_per_byte * size) + MIN_FEE * len(record["inner"])
+                    records.append(record)
+                if fees < needed:
+                    raise Rejected(
+                        f"TransactionPool.Remember: transaction {txids[0]}: "
+                        f"fee too small: pooled {fees} < required {needed}"
+                    )
+            except Rejected:
+                for table, ident, saved in undo.values():
+                    if saved is None:
+                        table.pop(ident, None)
+                    else:
+                        table[ident] = saved
+                for table, ident in created:
+                    table.pop(ident, None)
+                raise
+
+            confirmed_round = self.round + 1
+            for stxn, txid, record in zip(stxns, txids, records):
+                txn = stxn["txn"]
+                if "lx" in txn:
+                    self.leases[(txn["snd"], txn["lx"])] = txn.get("lv", 0)
+                info = {
+                    "confirmed-round": confirmed_round,
+                    "pool-error": "",
+                    "txn": {"txn": _txn_json(txn)},
+                    "logs": [_b64(log) for log in record["logs"]],
+                    "inner-txns": [{"txn": {"txn": _txn_json(i)}} for i in record["inner"]],
+                }
+                info.update(record["extra"])
+                self.txns[txid] = info
+                block_entry = {"txn": txn, "hgi": True}
+                apply_data = {}
+                if record["logs"]:
+                    apply_data["lg"] = record["logs"]
+                if record["inner"]:
+                    apply_data["itx"] = [{"txn": self._block_inner(i)} for i in record["inner"]]
+                if apply_data:
+                    block_entry["dt"] = apply_data
+                if "application-index" in record["extra"] and not txn.get("apid"):
+                    block_entry["apid"] = record["extra"]["application-index"]
+                self.pending_block.append(block_entry)
+            return txids[0]
+
+    def _block_inner(self, inner: dict) -> dict:
+        out = dict(inner)
+        if "arcv" in out:
+            out["arcv"] = encoding.decode_address(out["arcv"])
+        return out
+
+    def _save(self, undo: dict, table: dict, ident) -> None:
+        """Remember an entry's pre-group value so a failed group can be rolled back."""
+        key = (id(table), ident)
+        if key not in undo:
+            undo[key] = (table, ident, copy.deepcopy(table.get(ident)))
+
+    def _apply(self, txn: dict, txid: str, prev: dict, undo: dict, created: list) -> dict:
+        sender = _addr(txn["snd"])
+        kind = txn.get("type")
+        record = {"inner": [], "logs": [], "extra": {}}
+        prefix = f"TransactionPool.Remember: transaction {txid}:"
+
+        if txid in self.txns:
+            raise Rejected(f"{prefix} transaction already in ledger: {txid}")
+        if txn.get("gh") and _b64(txn["gh"]) != GENESIS_HASH:
+            raise Rejected(f"{prefix} genesis hash mismatch")
+        next_round = self.round + 1
+        if not txn.get("fv", 0) <= next_round <= txn.get("lv", 0):
+            raise Rejected(
+                f"{prefix} txn dead: round {next_round} outside of {txn.get('fv', 0)}--{txn.get('lv', 0)}"
+            )
+        if "lx" in txn:
+            held = self.leases.get((txn["snd"], txn["lx"]))
+            if held is not None and held >= txn.get("fv", 0):
+                raise Rejected(f"{prefix} using an overlapping lease (sender, lease):({sender}, {_b64(txn['lx'])})")
+
+        self._save(undo, self.accounts, sender)
+        acct = self._account(sender)
+        acct["amount"] -= txn.get("fee", 0)
+
+        if kind == "pay":
+            receiver = _addr(txn.get("rcv", b"\x00" * 32))
+            self._save(undo, self.accounts, receiver)
+            acct["amount"] -= txn.get("amt", 0)
+            self._account(receiver)["amount"] += txn.get("amt", 0)
+        elif kind == "axfer":
+            self._asset_transfer(sender, txn.get("xaid", 0), txn.get("aamt", 0),
+                                 _addr(txn.get("arcv", txn["snd"])), prefix, undo)
+        elif kind == "acfg":
+            self._asset_config(sender, txn, record, undo, created)
+        elif kind == "appl":
+            self._app_call(sender, txn, prev, record, prefix, undo, created)
+        else:
+            raise Rejected(f"{prefix} unsupported transaction type {kind!r}")
+
+        if acct["amount"] < self._min_balance(acct):
+            raise Rejected(
+                f"{prefix} overspend (account {sender}, data {{_struct:{{}} Status:Offline "
+                f"MicroAlgos:{{Raw:{acct['amount']}}}}}, tried to spend {{{txn.get('amt', 0)}}})"
+            )
+        return record
+
+    def _asset_transfer(self, sender: str, asset_id: int, amount: int, receiver: str, prefix: str, undo: dict) -> None:
+        sending = self.accounts[sender]
+        if asset_id not in self.assets:
+            raise Rejected(f"{prefix} asset {asset_id} does not exist or has been deleted")
+        if amount == 0 and receiver == sender:
+            sending["assets"].setdefault(asset_id, 0)  # Opt-in
+            return
+        self._save(undo, self.accounts, receiver)
+        receiving = self._account(receiver)
+        if asset_id not in sending["assets"]:
+            raise Rejected(f"{prefix} asset {asset_id} missing from {sender}")
+        if asset_id not in receiving["assets"]:
+            raise Rejected(f"{prefix} asset {asset_id} missing from {receiver}")
+        if sending["assets"][asset_id] < amount:
+            raise Rejected(
+                f"{prefix} underflow on subtracting {amount} from sender amount {sending['assets'][asset_id]}"
+            )
+        sending["assets"][asset_id] -= amount
+        receiving["assets"][asset_id] += amount
+
+    def _create_asset(self, creator: str, params: dict, created: list) -> int:
+        asset_id = self._new_id()
+        self.assets[asset_id] = dict(params, creator=creator)
+        created.append((self.assets, asset_id))
+        self._account(creator)["assets"][asset_id] = params.get("t", 0)
+        return asset_id
+
+    def _asset_config(self, sender: str, txn: dict, record: dict, undo: dict, created: list) -> None:
+        asset_id = txn.get("caid", 0)
+        params = txn.get("apar", {})
+        if not asset_id:
+            record["extra"]["asset-index"] = self._create_asset(sender, params, created)
+            return
+        asset = self.assets.get(asset_id)
+        if asset is None or _addr(asset.get("m", b"")) != sender:
+            raise Rejected(f"this transaction should be issued by the manager. It is issued by {sender}")
+        self._save(undo, self.assets, asset_id)
+        if params:
+            asset.update(params)
+        else:
+            del self.assets[asset_id]
+        if "note" in txn:
+            asset["note"] = txn["note"]
+
+    def _app_call(self, sender: str, txn: dict, prev: dict, record: dict, prefix: str, undo: dict, created: list) -> None:
+        app_id = txn.get("apid", 0)
+        on_complete = txn.get("apan", 0)
+        acct = self.accounts[sender]
+
+        if app_id == 0:
+            app_id = self._new_id()
+            self.apps[app_id] = {
+                "creator": sender,
+                "global": initial_global_state(sender),
+                "approval": txn.get("apap", b""),
+                "clear": txn.get("apsu", b""),
+                "gs": txn.get("apgs", {}),
+                "ls": txn.get("apls", {}),
+            }
+            created.append((self.apps, app_id))
+            record["extra"]["application-index"] = app_id
+            return
+
+        app = self.apps.get(app_id)
+        if app is None:
+            raise Rejected(f"{prefix} logic eval error: application {app_id} does not exist")
+        self._save(undo, self.apps, app_id)
+        app_address = get_application_address(app_id)
+
+        if on_complete == 1:  # OptIn
+            if app_id in acct["apps"]:
+                raise Rejected(f"{prefix} account {sender} has already opted in to app {app_id}")
+            acct["apps"][app_id] = initial_local_state()
+            return
+        if on_complete in (2, 3):  # CloseOut / ClearState
+            acct["apps"].pop(app_id, None)
+            return
+        if on_complete in (4, 5):  # Update / Delete
+            if encoding.decode_address(sender) != app["global"]["owner"]:
+                raise Rejected(f"{prefix} logic eval error: assert failed: not owner")
+            if on_complete == 4:
+                app["approval"] = txn.get("apap", b"")
+                app["clear"] = txn.get("apsu", b"")
+            else:
+                del self.apps[app_id]
+            return
+
+        ctx = CallContext(
+            sender,
+            tuple(txn.get("apaa", [])),
+            self.timestamp,
+            self.round + 1,
+            app_address,
+            self._prev_context(prev)
+        )
+        local = acct["apps"].get(app_id, {})
+        try:
+            result = apply_call(
+                local, app["global"], ctx,
+                create_asset=lambda params: self._create_asset(app_address, params, created)
+            )
+        except ContractReject as e:
+            raise Rejected(f"{prefix} {e}")
+        except KeyError:
+            raise Rejected(f"{prefix} logic eval error: account {sender} is not opted in to app {app_id}")
+
+        for inner in result.inner_txns:
+            if inner["type"] == "axfer":
+                self._save(undo, self.accounts, app_address)
+                self._asset_transfer(app_address, inner["xaid"], inner["aamt"], inner["arcv"], prefix, undo)
+        record["inner"] = result.inner_txns
+        record["logs"] = result.logs
+
+    def _prev_context(self, prev: dict):
+        if prev is None:
+            return None
+        out = dict(prev)
+        if "arcv" in out:
+            out["arcv"] = _addr(out["arcv"])
+        return out
+
+    # ---------- reads ----------
+
+    def account_json(self, address: str) -> dict:
+        with self.cond:
+            acct = self.accounts.get(address, {"amount": 0, "assets": {}, "apps": {}})
+            return {
+                "address": address,
+                "amount": acct["amount"],
+                "min-balance": self._min_balance(acct),
+                "round": self.round,
+                "status": "Offline",
+                "assets": [
+                    {"asset-id": asset_id, "amount": amount, "is-frozen": False}
+                    for asset_id, amount in acct["assets"].items()
+                ],
+                "apps-local-state": [
+                    {"id": app_id, "key-value": _state_json(local),
+                     "schema": self.apps.get(app_id, {}).get("ls", {})}
+                    for app_id, local in acct["apps"].items()
+                ],
+            }
+
+    def _app_params_msgpack(self, app: dict) -> dict:
+        return {
+            "approv": app["approval"],
+            "clearp": app["clear"],
+            "gs": _state_tkv(app["global"]),
+            "gsch": app["gs"],
+            "lsch": app["ls"],
+        }
+
+    def account_msgpack(self, address: str) -> bytes:
+        """The account record algod serves for ?format=msgpack (short field names)."""
+        with self.cond:
+            acct = self.accounts.get(address, {"amount": 0, "assets": {}, "apps": {}})
+            record = {"algo": acct["amount"]}
+            if acct["assets"]:
+                record["asset"] = {asset_id: {"a": amount} if amount else {} for asset_id, amount in acct["assets"].items()}
+            if acct["apps"]:
+                record["appl"] = {
+                    app_id: {"hsch": self.apps.get(app_id, {}).get("ls", {}), "tkv": _state_tkv(local)}
+                    for app_id, local in acct["apps"].items()
+                }
+            created = {app_id: app for app_id, app in self.apps.items() if app["creator"] == address}
+            if created:
+                record["appp"] = {app_id: self._app_params_msgpack(app) for app_id, app in created.items()}
+            return msgpack.packb(record, use_bin_type=True)
+
+    def account_application(self, address: str, app_id: int, as_msgpack: bool):
+        """/v2/accounts/{address}/applications/{id}: local state and, for the creator, params."""
+        with self.cond:
+            local = self.accounts.get(address, {"apps": {}})["apps"].get(app_id)
+            app = self.apps.get(app_id)
+            created = app if app is not None and app["creator"] == address else None
+            if local is None and created is None:
+                return None
+            if as_msgpack:
+                response = {}
+                if local is not None:
+                    response["app-local-state"] = {"hsch": app["ls"] if app else {}, "tkv": _state_tkv(local)}
+                if created is not None:
+                    response["app-params"] = self._app_params_msgpack(created)
+                return msgpack.packb(response, use_bin_type=True)
+            response = {"round": self.round}
+            if local is not None:
+                response["app-local-state"] = {
+                    "id": app_id, "key-value": _state_json(local), "schema": app["ls"] if app else {}
+                }
+            if created is not None:
+                response["created-app"] = {"creator": address, "global-state": _state_json(created["global"])}
+            return response
+
+    def application_json(self, app_id: int):
+        with self.cond:
+            app = self.apps.get(app_id)
+            if app is None:
+                return None
+            return {
+                "id": app_id,
+                "params": {
+                    "creator": app["creator"],
+                    "approval-program": _b64(app["approval"]),
+                    "clear-state-program": _b64(app["clear"]),
+                    "global-state": _state_json(app["global"]),
+                    "global-state-schema": {"num-uint": app["gs"].get("nui", 0), "num-byte-slice": app["gs"].get("nbs", 0)},
+                    "local-state-schema": {"num-uint": app["ls"].get("nui", 0), "num-byte-slice": app["ls"].get("nbs", 0)},
+                },
+            }
+
+    def asset_json(self, asset_id: int):
+        with self.cond:
+            asset = self.assets.get(asset_id)
+            if asset is None:
+                return None
+            params = {
+                "creator": asset["creator"],
+                "total": asset.get("t", 0),
+                "decimals": asset.get("dc", 0),
+                "default-frozen": asset.get("df", False),
+            }
+            for key, name in (("un", "unit-name"), ("an", "name"), ("au", "url")):
+                if key in asset:
+                    params[name] = asset[key]
+            for key, name in (("m", "manager"), ("r", "reserve"), ("f", "freeze"), ("c", "clawback")):
+                if asset.get(key):
+                    params[name] = _addr(asset[key])
+            return {"index": asset_id, "params": params}
+
+    def pending_json(self, txid: str):
+        with self.cond:
+            info = self.txns.get(txid)
+            if info is None:
+                return None
+            if info["confirmed-round"] > self.round:
+                return {"confirmed-round": 0, "pool-error": "", "txn": info["txn"]}
+            return info
+
+    def status_json(self) -> dict:
+        with self.cond:
+            return {
+                "last-round": self.round,
+                "last-version": "future",
+                "next-version": "future",
+                "next-version-round": self.round + 1,
+                "next-version-supported": True,
+                "time-since-last-round": int((time.monotonic() - self.last_round_at) * 1e9),
+                "catchup-time": 0,
+                "stopped-at-unsupported-round": False,
+            }
+
+    def params_json(self) -> dict:
+        with self.cond:
+            return {
+                "consensus-version": "future",
+                "fee": self.fee_per_byte,
+                "genesis-hash": GENESIS_HASH,
+                "genesis-id": GENESIS_ID,
+                "last-round": self.round,
+                "min-fee": MIN_FEE,
+            }
+
+    def block_msgpack(self, round_num: int):
+        with self.cond:
+            for rnd, ts, txns in self.blocks:
+                if rnd == round_num:
+                    return msgpack.packb({"block": {"rnd": rnd, "ts": ts, "txns": txns}}, use_bin_type=True)
+            return None
+
+
+class NodeConfig:
+    """Latency and error injection settings."""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_429: float = 0.0,
+                 error_overspend: float = 0.0, error_logic: float = 0.0, capacity: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_429 = error_429
+        self.error_overspend = error_overspend
+        self.error_logic = error_logic
+        self.capacity = capacity
+        self.inflight = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "NodeConfig":
+        return cls(
+            float(os.getenv("LOCALNODE_LATENCY_MS", "0")),
+            float(os.getenv("LOCALNODE_JITTER_MS", "0")),
+            float(os.getenv("LOCALNODE_ERROR_429", "0")),
+            float(os.getenv("LOCALNODE_ERROR_OVERSPEND", "0")),
+            float(os.getenv("LOCALNODE_ERROR_LOGIC", "0")),
+            int(os.getenv("LOCALNODE_CAPACITY", "0")),
+        )
+
+
+def make_handler(ledger: Ledger, config: NodeConfig):
+    class AlgodHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        admitted = False  # Holding one of config.capacity slots
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code: int, body, content_type: str = "application/json") -> None:
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            if self.admitted:
+                self.admitted = False
+                with config.lock:
+                    config.inflight -= 1
+
+        def _error(self, code: int, message: str) -> None:
+            self._send(code, {"message": message})
+
+        def _inject(self) -> bool:
+            ledger.count_request()
+            if config.capacity:
+                with config.lock:
+                    self.admitted = config.inflight < config.capacity
+                    if self.admitted:
+                        config.inflight += 1
+                if not self.admitted:
+                    self._error(429, "Too Many Requests")
+                    return True
+            delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+            if delay:
+                time.sleep(delay / 1000)
+            if config.error_429 and random.random() < config.error_429:
+                self._error(429, "Too Many Requests")
+                return True
+            return False
+
+        def _body(self) -> bytes:
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        def do_GET(self):
+            if self._inject():
+                return
+            path, _, query = self.path.partition("?")
+            parts = path.strip("/").split("/")
+
+            if path == "/v2/transactions/params":
+                self._send(200, ledger.params_json())
+            elif path == "/v2/status" or path == "/health":
+                self._send(200, ledger.status_json())
+            elif parts[:3] == ["v2", "status", "wait-for-block-after"]:
+                ledger.wait_for_round_after(int(parts[3]))
+                self._send(200, ledger.status_json())
+            elif parts[:3] == ["v2", "transactions", "pending"]:
+                info = ledger.pending_json(parts[3])
+                if info is None:
+                    self._error(404, "txn does not exist")
+                else:
+                    self._send(200, info)
+            elif parts[:2] == ["v2", "accounts"] and len(parts) == 5 and parts[3] == "applications":
+                info = ledger.account_application(parts[2], int(parts[4]), "format=msgpack" in query)
+                if info is None:
+                    self._error(404, "account application info not found")
+                elif isinstance(info, bytes):
+                    self._send(200, info, "application/msgpack")
+                else:
+                    self._send(200, info)
+            elif parts[:2] == ["v2", "accounts"]:
+                if "format=msgpack" in query:
+                    self._send(200, ledger.account_msgpack(parts[2]), "application/msgpack")
+                else:
+                    self._send(200, ledger.account_json(parts[2]))
+            elif parts[:2] == ["v2", "applications"]:
+                info = ledger.application_json(int(parts[2]))
+                if info is None:
+                    self._error(404, "application does not exist")
+                else:
+                    self._send(200, info)
+            elif parts[:2] == ["v2", "assets"]:
+                info = ledger.asset_json(int(parts[2]))
+                if info is None:
+                    self._error(404, "asset does not exist")
+                else:
+                    self._send(200, info)
+            elif parts[:2] == ["v2", "blocks"]:
+                block = ledger.block_msgpack(int(parts[2]))
+                if block is None:
+                    self._error(404, "failed to retrieve information from the ledger")
+                else:
+                    self._send(200, block, "application/msgpack")
+            else:
+                self._error(404, f"unknown endpoint {path}")
+
+        def do_POST(self):
+            body = self._body()
+            if self._inject():
+                return
+            path = self.path.partition("?")[0]
+
+            if path == "/v2/transactions":
+                if config.error_overspend and random.random() < config.error_overspend:
+                    self._error(400, "TransactionPool.Remember: overspend (injected)")
+                    return
+                if config.error_logic and random.random() < config.error_logic:
+                    self._error(400, "TransactionPool.Remember: logic eval error: assert failed (injected)")
+                    return
+                unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+                unpacker.feed(body)
+                stxns = list(unpacker)
+                try:
+                    self._send(200, {"txId": ledger.submit(stxns)})
+                except Rejected as e:
+                    self._error(400, str(e))
+            elif path == "/v2/teal/compile":
+                bytecode = b"\x08" + hashlib.sha256(body).digest()
+                program_hash = encoding.encode_address(encoding.checksum(b"Program" + bytecode))
+                self._send(200, {"hash": program_hash, "result": _b64(bytecode)})
+            elif path == "/dev/fund":
+                request = json.loads(body)
+                ledger.fund(request["address"], int(request.get("amount", FUND_AMOUNT)))
+                self._send(200, {})
+            elif path == "/dev/advance":
+                ledger.advance_time(int(json.loads(body)["seconds"]))
+                self._send(200, ledger.status_json())
+            else:
+                self._error(404, f"unknown endpoint {path}")
+
+    return AlgodHandler
+
+
+class AlgodServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # Many concurrent clients (the default backlog is 5)
+
+
+class LocalNode:
+    """A running stand-in: ledger, round ticker and HTTP server."""
+
+    def __init__(self, port: int = 0, round_time: float = 2.8, fee_per_byte: int = 0,
+                 config: NodeConfig = None, host: str = "127.0.0.1", ledger: Ledger = None):
+        self.primary = ledger is None  # Replicas serve another node's ledger and do not tick rounds
+        self.ledger = ledger or Ledger(round_time, fee_per_byte)
+        self.config = config or NodeConfig()
+        self.server = AlgodServer((host, port), make_handler(self.ledger, self.config))
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def replica(self, config: NodeConfig = None, port: int = 0) -> "LocalNode":
+        """Another endpoint onto this node's ledger, with its own latency/error injection."""
+        host = self.server.server_address[0]
+        return LocalNode(port=port, config=config, host=host, ledger=self.ledger)
+
+    def start(self) -> "LocalNode":
+        self.threads = [threading.Thread(target=self.server.serve_forever, daemon=True)]
+        if self.primary:
+            self.threads.append(threading.Thread(target=self.ledger.run_rounds, args=(self.stop_event,), daemon=True))
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    port = int(os.getenv("LOCALNODE_PORT", "4001"))
+    node = LocalNode(
+        port=port,
+        round_time=float(os.getenv("LOCALNODE_ROUND_TIME", "2.8")),
+        fee_per_byte=int(os.getenv("LOCALNODE_FEE_PER_BYTE", "0")),
+        config=NodeConfig.from_env(),
+    )
+    for address in filter(None, os.getenv("LOCALNODE_FUND", "").split(",")):
+        node.ledger.fund(address.strip())
+
+    print("=" * 50)
+    print("GrowPod Empire - Local Algod Stand-in")
+    print("=" * 50)
+    print(f"Listening on {node.address}")
+    replicas = [
+        node.replica(NodeConfig.from_env(), port + i if port else 0)
+        for i in range(1, int(os.getenv("LOCALNODE_REPLICAS", "0")) + 1)
+    ]
+    addresses = ",".join(n.address for n in [node] + replicas)
+    print(f"Point the scripts at it with: ALGOD_ADDRESS={addresses}")
+
+    node.start()
+    for replica in replicas:
+        replica.start()
+    try:
+        node.stop_event.wait()
+    except KeyboardInterrupt:
+        for replica in replicas:
+            replica.stop()
+        node.stop()
+
+
+if __name__ == "__main__":
+    main()
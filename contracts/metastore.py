@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Offline metadata store for GrowPod Empire
+Renders per-pod NFT metadata (ARC-3 JSON: name, DNA hash, stage, image) and
+stores it content-addressed on disk, with the IPFS CIDs computed locally, so a
+bulk mint can set every NFT's url and reserve address without uploading
+anything first. The store directory is pinned/uploaded as a whole afterwards
+and the CIDs come out the same.
+
+Pod NFTs follow ARC-19: the url is a fixed template and the reserve address
+holds the sha2-256 digest of the current metadata CID, so metasync.py moves an
+NFT to a new document (its next stage) with one reserve update and no remint.
+
+CIDs match `ipfs add` with default settings:
+    CIDv0  dag-pb UnixFS file, 256 KiB chunks, balanced DAG (Qm...)
+    CIDv1  the same DAG with raw leaves, as --cid-version=1 (bafk.../bafy...)
+
+Documents are rendered canonically (sorted keys, no whitespace), so identical
+documents have the same CID and are stored once. With METASTORE_IMAGES, the
+stage images in that directory (<POD_IMAGES key>.<ext>) are stored too and the
+metadata points at ipfs://<cid> instead of the POD_IMAGES gateway links.
+
+Output (METASTORE_DIR):
+    files/<cidv1>    Each unique document or image, as added
+    manifest.json    Per pod: name, unit name, DNA, stage, CIDs, ARC-19 url and reserve
+
+Pods already in the manifest keep their DNA when rendered again, so a rerun
+reproduces the same documents and stores nothing new.
+"""
+from algosdk import account, encoding, mnemonic
+from mint import POD_IMAGES, generate_dna_hash, stage_image
+from typing import NamedTuple
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+
+STORE_DIR = os.getenv(
+    "METASTORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "metadata")
+)
+
+CHUNK_SIZE = 262_144  # ipfs add default chunker (size-262144)
+MAX_LINKS = 174  # Children per node in go-unixfs's balanced layout
+SHA2_256 = b"\x12\x20"  # Multihash prefix: sha2-256, 32-byte digest
+DAG_PB = 0x70
+RAW = 0x55
+UNIXFS_RAW = 0
+UNIXFS_FILE = 2
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+ARC19_URL = "template-ipfs://{{ipfscid:1:{codec}:reserve:sha2-256}}#arc3"
+CODEC_NAMES = {RAW: "raw", DAG_PB: "dag-pb"}
+
+
+class StoredItem(NamedTuple):
+    cid_v0: str
+    cid_v1: str
+    size: int
+    sha256: str  # Of the content itself (the store's dedup key)
+
+
+def _varint(n: int) -> bytes:
+    out = bytearray()
+    while n >= 0x80:
+        out.append(n & 0x7F | 0x80)
+        n >>= 7
+    out.append(n)
+    return bytes(out)
+
+
+def _field(number: int, value) -> bytes:
+    """One protobuf field: varint for ints, length-delimited for bytes."""
+    if isinstance(value, int):
+        return _varint(number << 3) + _varint(value)
+    return _varint(number << 3 | 2) + _varint(len(value)) + value
+
+
+def _base58(data: bytes) -> str:
+    n = int.from_bytes(data, "big")
+    out = ""
+    while n:
+        n, rem = divmod(n, 58)
+        out = BASE58_ALPHABET[rem] + out
+    return "1" * (len(data) - len(data.lstrip(b"\x00"))) + out
+
+
+def _unixfs(data: bytes, filesize: int, blocksizes: tuple = (), kind: int = UNIXFS_FILE) -> bytes:
+    out = _field(1, kind)
+    if data:
+        out += _field(2, data)
+    out += _field(3, filesize)
+    for size in blocksizes:
+        out += _field(4, size)
+    return out
+
+
+def _leaf(chunk: bytes, raw_leaves: bool, first: bool) -> tuple:
+    """(cid bytes, total serialized size, file bytes covered) of one chunk."""
+    if raw_leaves:
+        return bytes([1, RAW]) + SHA2_256 + hashlib.sha256(chunk).digest(), len(chunk), len(chunk)
+    # go-unixfs types the first leaf as a file (it is the root of a one-chunk file), later ones as raw
+    node = _field(1, _unixfs(chunk, len(chunk), kind=UNIXFS_FILE if first else UNIXFS_RAW))
+    return _node_cid(node, raw_leaves), len(node), len(chunk)
+
+
+def _node_cid(node: bytes, version_1: bool) -> bytes:
+    multihash = SHA2_256 + hashlib.sha256(node).digest()
+    return bytes([1, DAG_PB]) + multihash if version_1 else multihash
+
+
+def _parent(children: list, version_1: bool) -> tuple:
+    """dag-pb node linking `children` (links are serialized before data)."""
+    filesize = sum(covered for _, _, covered in children)
+    links = b"".join(
+        _field(2, _field(1, cid) + _field(2, b"") + _field(3, tsize)) for cid, tsize, _ in children
+    )
+    node = links + _field(1, _unixfs(b"", filesize, tuple(covered for _, _, covered in children)))
+    return _node_cid(node, version_1), len(node) + sum(tsize for _, tsize, _ in children), filesize
+
+
+def cid(data: bytes, version: int = 1) -> str:
+    """
+    IPFS CID of `data` as `ipfs add` would compute it, without a node.
+
+    Args:
+        data: File content
+        version: 0 (dag-pb leaves, base58 "Qm...") or 1 (raw leaves, base32 "b...")
+    """
+    raw_leaves = version == 1
+    chunks = [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)] or [b""]
+    layer = [_leaf(chunk, raw_leaves, i == 0) for i, chunk in enumerate(chunks)]
+    while len(layer) > 1:
+        layer = [_parent(layer[i:i + MAX_LINKS], raw_leaves) for i in range(0, len(layer), MAX_LINKS)]
+    if version == 0:
+        return _base58(layer[0][0])
+    return "b" + base64.b32encode(layer[0][0]).decode().lower().rstrip("=")
+
+
+def arc19(cid_v1: str) -> tuple:
+    """(ARC-19 template url, reserve address) of an NFT whose metadata is at `cid_v1`."""
+    body = cid_v1[1:].upper()
+    raw = base64.b32decode(body + "=" * (-len(body) % 8))
+    # <version><codec><sha2-256 prefix><digest>: the reserve address carries the digest
+    return ARC19_URL.format(codec=CODEC_NAMES[raw[1]]), encoding.encode_address(raw[2 + len(SHA2_256):])
+
+
+def render_metadata(pod_number: int, dna_hash: str, stage: int = 0, image_url: str = None) -> bytes:
+    """Canonical ARC-3 metadata JSON of one pod NFT."""
+    growth = stage_image(stage)
+    return json.dumps({
+        "name": f"GrowPod #{pod_number:03d}",
+        "description": "Soulbound GrowPod Empire pod",
+        "image": image_url or POD_IMAGES[growth],
+        "properties": {"dna": dna_hash, "stage": stage, "growth": growth},
+    }, separators=(",", ":"), sort_keys=True).encode()
+
+
+class MetadataStore:
+    """Content-addressed block directory; adding the same content twice stores it once."""
+
+    def __init__(self, directory: str = STORE_DIR):
+        self.directory = directory
+        self.files = os.path.join(directory, "files")
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        os.makedirs(self.files, exist_ok=True)
+        self.items = {}  # sha256 -> StoredItem, for content added this run
+        self.added = 0
+        self.deduplicated = 0
+
+    def add(self, data: bytes) -> StoredItem:
+        digest = hashlib.sha256(data).hexdigest()
+        item = self.items.get(digest)
+        if item is None:
+            item = StoredItem(cid(data, 0), cid(data, 1), len(data), digest)
+            self.items[digest] = item
+            path = os.path.join(self.files, item.cid_v1)
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self.added += 1
+                return item
+        self.deduplicated += 1
+        return item
+
+    def add_images(self, images_dir: str) -> dict:
+        """POD_IMAGES key -> ipfs:// URL for each <key>.<ext> found in `images_dir`."""
+        urls = {}
+        for name in sorted(os.listdir(images_dir)):
+            key = os.path.splitext(name)[0]
+            if key in POD_IMAGES:
+                with open(os.path.join(images_dir, name), 'rb') as f:
+                    urls[key] = f"ipfs://{self.add(f.read()).cid_v1}"
+        return urls
+
+    def load_manifest(self) -> dict:
+        """pod number -> entry of every pod rendered into this store so far."""
+        try:
+            with open(self.manifest_path) as f:
+                return {pod["pod_number"]: pod for pod in json.load(f)["pods"]}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def load_images(self) -> dict:
+        """POD_IMAGES key -> URL overrides the manifest was rendered with."""
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f).get("images", {})
+        except (OSError, ValueError):
+            return {}
+
+    def write_manifest(self, pods: list, images: dict) -> str:
+        """Merge `pods` into the manifest (by pod number)."""
+        merged = self.load_manifest()
+        merged.update((pod["pod_number"], pod) for pod in pods)
+        pods = [merged[number] for number in sorted(merged)]
+        path = self.manifest_path
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "created": int(time.time()),
+                "documents": len(pods),
+                "unique": len({pod['cid_v1'] for pod in pods}),
+                "images": images,
+                "pods": pods,
+            }, f, indent=1)
+        os.replace(tmp_path, path)
+        return path
+
+
+def pod_entry(store: MetadataStore, pod_number: int, dna_hash: str, stage: int = 0, images: dict = None) -> dict:
+    """Render and store one pod's metadata at `stage`; returns its manifest entry."""
+    images = images or {}
+    item = store.add(render_metadata(pod_number, dna_hash, stage, images.get(stage_image(stage))))
+    url, reserve = arc19(item.cid_v1)
+    return {
+        "pod_number": pod_number,
+        "name": f"GrowPod #{pod_number:03d}",
+        "unit_name": f"POD{pod_number:03d}",
+        "dna": dna_hash,
+        "stage": stage,
+        "cid_v0": item.cid_v0,
+        "cid_v1": item.cid_v1,
+        "url": url,
+        "reserve": reserve,
+    }
+
+
+def build(store: MetadataStore, pod_numbers: range, sender: str = "", stage: int = 0, images: dict = None) -> list:
+    """
+    Render and store the metadata of each pod; returns the manifest entries.
+
+    Args:
+        store: Where documents go
+        pod_numbers: Pod numbers to render (as in mint.py, 1 = "GrowPod #001")
+        sender: Seeds generate_dna_hash (the minting account)
+        stage: Stage the metadata describes (0 at mint)
+        images: POD_IMAGES key -> URL overrides, from add_images()
+    """
+    known = store.load_manifest()
+    entries = []
+    for pod_number in pod_numbers:
+        dna_hash = known[pod_number]["dna"] if pod_number in known else generate_dna_hash(sender)
+        entries.append(pod_entry(store, pod_number, dna_hash, stage, images))
+    return entries
+
+
+def main():
+    count = int(os.getenv("METASTORE_COUNT", "1"))
+    first = int(os.getenv("POD_NUMBER", "1"))
+    stage = int(os.getenv("METASTORE_STAGE", "0"))
+    images_dir = os.getenv("METASTORE_IMAGES")
+    sender = ""
+    if os.getenv("ALGO_MNEMONIC"):
+        sender = account.address_from_private_key(mnemonic.to_private_key(os.getenv("ALGO_MNEMONIC")))
+
+    if images_dir and not os.path.isdir(images_dir):
+        print(f"ERROR: METASTORE_IMAGES is not a directory: {images_dir}")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("GrowPod Empire - Metadata Store")
+    print("=" * 50)
+
+    store = MetadataStore()
+    images = store.add_images(images_dir) if images_dir else {}
+    for key, url in images.items():
+        print(f"  {key}: {url}")
+
+    start = time.perf_counter()
+    pods = build(store, range(first, first + count), sender, stage, images)
+    elapsed = time.perf_counter() - start
+    path = store.write_manifest(pods, images)
+
+    print(f"\nRendered {count:,} pod document(s) in {elapsed:.2f}s")
+    print(f"  Stored: {store.added:,} new, {store.deduplicated:,} deduplicated")
+    print(f"  Manifest: {path}")
+    if pods:
+        print(f"  First: {pods[0]['name']} -> {pods[0]['cid_v1']} (reserve {pods[0]['reserve']})")
+
+
+if __name__ == "__main__":
+    main()
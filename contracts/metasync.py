@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Pod NFT metadata sync for GrowPod Empire
+Keeps every pod NFT's image in step with its pod's growth stage, in the
+standard the NFT was minted with:
+- ARC-69 (mint.py without a manifest: url POD_IMAGES["default"], which never
+  changes): an asset config transaction from the NFT's manager whose JSON note
+  has the POD_IMAGES entry for the pod's stage as media_url
+- ARC-19 (mint.py with a metastore.py manifest: template url resolved through
+  the reserve address): the pod's metadata for its new stage is rendered into
+  the metadata store (METASTORE_DIR) and the reserve address pointed at the new
+  document's CID. Pin/upload the store after a sync, as after a metastore.py
+  run; confirmed updates are merged into its manifest
+
+Each pass compares every pod's on-chain stage with the image its NFT shows now
+(recorded in METASYNC_STATE after each confirmed update; an NFT with no record
+shows the POD_IMAGES["default"] it was minted with) and reconfigures only the
+NFTs that differ, up to 16 per atomic group. Pods whose stage did not change
+cost no transactions; with METASYNC_INDEX_DB (the indexer.py database) they
+cost no algod reads either, as stages come from its pods table.
+
+A reconfiguration must restate the asset's manager, reserve, freeze and
+clawback addresses or they are cleared, so each NFT's addresses (with its name
+and url, which tell the standard and identify an ARC-19 NFT's manifest entry)
+are read once and kept in the state file.
+
+Pods file (METASYNC_PODS), one NFT per line (# comments skipped):
+    <asset id> <owner address> [pod, default 1]
+"""
+from algosdk import account, mnemonic
+from algosdk.transaction import AssetConfigTxn, assign_group_id
+from concurrent.futures import ThreadPoolExecutor
+from fees import set_group_fees
+from metastore import MetadataStore, pod_entry
+from metrics import failure_reason, phase, record_success, registry
+from mint import POD_IMAGES, stage_image
+from multinode import connect
+from ratelimit import limited
+from statecodec import read_local
+from submit import broadcast, call_with_retry, confirm_groups
+from typing import NamedTuple
+import json
+import os
+import sqlite3
+import sys
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = limited(connect(ALGOD_ADDRESS, ALGOD_TOKEN))  # Throttled: fleet-sized bursts
+
+STATE_PATH = os.getenv(
+    "METASYNC_STATE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".growpod_nft_images.json")
+)
+
+MAX_GROUP_SIZE = 16  # Protocol limit on transactions per atomic group
+THREADS = 16  # Reads and groups sent/confirmed concurrently
+MAX_ROUNDS = 4  # Rounds to wait for a group before giving up on it
+ROLES = ("manager", "reserve", "freeze", "clawback")
+ARC19_SCHEME = "template-ipfs://"
+
+
+class PodNFT(NamedTuple):
+    asset_id: int
+    address: str  # Owner account holding the pod
+    pod: int
+
+
+class Update(NamedTuple):
+    nft: PodNFT
+    stage: int
+    image: str  # POD_IMAGES key the NFT should show
+    metadata: dict = None  # ARC-19 only: metastore manifest entry of the new document (set by sync)
+
+
+def load_pods(path: str) -> list:
+    """Read the pods file; one PodNFT per line."""
+    pods = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                fields = line.split()
+                pods.append(PodNFT(int(fields[0]), fields[1], int(fields[2]) if len(fields) > 2 else 1))
+    return pods
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    """asset id (str) -> {"image", "stage", "roles", "name", "url"} of every NFT synced so far."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_state(state: dict, path: str = STATE_PATH) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def stages_from_index(conn: sqlite3.Connection) -> dict:
+    """(address, pod) -> stage from the indexer.py database, with no algod reads."""
+    return {(address, pod): stage for address, pod, stage in conn.execute("SELECT address, pod, stage FROM pods")}
+
+
+def stages_from_algod(pods: list, app_id: int, threads: int = THREADS) -> dict:
+    """(address, pod) -> stage from one local state read per owner."""
+    owners = sorted({nft.address for nft in pods})
+    with ThreadPoolExecutor(max_workers=threads) as pool, phase("metasync", "read_state"):
+        locals_ = list(pool.map(lambda address: call_with_retry(read_local, algod_client, address, app_id), owners))
+    stages = {}
+    for address, local in zip(owners, locals_):
+        if local is not None:
+            stages[(address, 1)] = local.stage
+            stages[(address, 2)] = local.stage_2
+    return stages
+
+
+def diff(pods: list, stages: dict, state: dict) -> list:
+    """Updates for the NFTs whose image does not match their pod's stage."""
+    updates = []
+    for nft in pods:
+        stage = stages.get((nft.address, nft.pod), 0)
+        image = stage_image(stage)
+        if image != state.get(str(nft.asset_id), {}).get("image", "default"):
+            updates.append(Update(nft, stage, image))
+    return updates
+
+
+def arc69_note(update: Update) -> bytes:
+    """ARC-69 metadata JSON for an NFT's new stage."""
+    return json.dumps({
+        "standard": "arc69",
+        "description": f"GrowPod Empire pod {update.nft.pod}",
+        "media_url": POD_IMAGES[update.image],
+        "properties": {"stage": update.stage, "growth": update.image},
+    }, separators=(",", ":"), sort_keys=True).encode()
+
+
+def read_roles(updates: list, state: dict, threads: int = THREADS) -> None:
+    """Fill in the role addresses, name and url of NFTs not seen before (one asset read each)."""
+    missing = [u.nft.asset_id for u in updates if "url" not in state.get(str(u.nft.asset_id), {})]
+    if not missing:
+        return
+    with ThreadPoolExecutor(max_workers=threads) as pool, phase("metasync", "read_state"):
+        infos = list(pool.map(lambda asset_id: call_with_retry(algod_client.asset_info, asset_id), missing))
+    for asset_id, info in zip(missing, infos):
+        params = info['params']
+        state.setdefault(str(asset_id), {}).update(
+            roles={role: params.get(role, "") for role in ROLES},
+            name=params.get('name', ""),
+            url=params.get('url', ""),
+        )
+
+
+def build_group(updates: list, state: dict, sender: str, private_key: str, params) -> list:
+    """
+    Signed group of reconfigurations restating each NFT's role addresses: an
+    ARC-19 NFT gets the new document's reserve address, any other an ARC-69 note.
+    """
+    txns = []
+    for update in updates:
+        roles = state[str(update.nft.asset_id)]["roles"]
+        txns.append(AssetConfigTxn(
+            sender, params, index=update.nft.asset_id,
+            manager=roles["manager"],
+            reserve=update.metadata["reserve"] if update.metadata else roles["reserve"],
+            freeze=roles["freeze"], clawback=roles["clawback"],
+            strict_empty_address_check=False,  # Keep cleared roles cleared
+            note=None if update.metadata else arc69_note(update),
+        ))
+    set_group_fees(txns, params)
+    if len(txns) > 1:
+        assign_group_id(txns)
+    with phase("metasync", "sign"):
+        return [txn.sign(private_key) for txn in txns]
+
+
+def sync(updates: list, state: dict, private_key: str, store: MetadataStore = None,
+         threads: int = THREADS, state_path: str = STATE_PATH) -> dict:
+    """
+    Reconfigure the NFTs of `updates`, 16 per group, and record what they show.
+
+    Args:
+        updates: From diff()
+        state: From load_state(); updated in place and written once the groups settle
+        private_key: Key of the NFTs' manager
+        store: Metadata store the ARC-19 NFTs were minted from (METASTORE_DIR by
+               default); new documents go there and confirmed ones into its manifest
+
+    Returns:
+        dict: asset id -> "ok" or the failure reason
+    """
+    sender = account.address_from_private_key(private_key)
+    results = {}
+    read_roles(updates, state, threads)
+    manifest, images = {}, {}
+    if any(state[str(u.nft.asset_id)]["url"].startswith(ARC19_SCHEME) for u in updates):
+        store = store or MetadataStore()
+        manifest = {pod["name"]: pod for pod in store.load_manifest().values()}
+        images = store.load_images()
+    owned = []
+    for update in updates:
+        nft = state[str(update.nft.asset_id)]
+        if nft["roles"]["manager"] != sender:
+            results[update.nft.asset_id] = "not manager"
+        elif not nft["url"].startswith(ARC19_SCHEME):
+            owned.append(update)  # ARC-69
+        elif nft["name"] not in manifest:
+            results[update.nft.asset_id] = "not in manifest"
+        else:
+            minted = manifest[nft["name"]]
+            entry = pod_entry(store, minted["pod_number"], minted["dna"], update.stage, images)
+            if entry["url"] != nft["url"]:
+                # The template fixes the CID codec; a document needing another one cannot be reached
+                results[update.nft.asset_id] = "url template mismatch"
+            else:
+                owned.append(update._replace(metadata=entry))
+    if not owned:
+        return results
+
+    with phase("metasync", "suggested_params"):
+        params = call_with_retry(algod_client.suggested_params)
+
+    def send(group):
+        """Returns (sent: (group, txid) or None, groups to resubmit)."""
+        signed = build_group(group, state, sender, private_key, params)
+        try:
+            with phase("metasync", "send_transaction"):
+                broadcast(algod_client, signed, max_attempts=4, method="metasync")
+            return (group, signed[0].get_txid()), []
+        except Exception as e:
+            if len(group) > 1:
+                # Isolate the rejected NFT
+                half = len(group) // 2
+                return None, [group[:half], group[half:]]
+            results[group[0].nft.asset_id] = failure_reason(e)
+            return None, []
+
+    sent = []
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        queue = [owned[i:i + MAX_GROUP_SIZE] for i in range(0, len(owned), MAX_GROUP_SIZE)]
+        while queue:
+            outcomes = list(pool.map(send, queue))
+            queue = [retry for _, retries in outcomes for retry in retries]
+            sent.extend(entry for entry, _ in outcomes if entry)
+            if queue:
+                registry.count_call("metasync", "split")
+
+        watched = {index: txid for index, (_, txid) in enumerate(sent)}
+        settled = confirm_groups(algod_client, pool, watched, MAX_ROUNDS, "metasync")
+    confirmed = []
+    for index, info in settled.items():
+        group = sent[index][0]
+        if info.get('confirmed-round'):
+            for update in group:
+                results[update.nft.asset_id] = "ok"
+                nft = state[str(update.nft.asset_id)]
+                nft.update(image=update.image, stage=update.stage)
+                if update.metadata:
+                    nft["roles"]["reserve"] = update.metadata["reserve"]
+                    confirmed.append(update.metadata)
+                record_success("metasync")
+        else:
+            for update in group:
+                results[update.nft.asset_id] = failure_reason(Exception(info['pool-error']))
+    sent = [entry for index, entry in enumerate(sent) if index not in settled]
+    write_state(state, state_path)
+    if confirmed:
+        store.write_manifest(confirmed, images)
+
+    for group, _ in sent:
+        for update in group:
+            results[update.nft.asset_id] = "not confirmed"
+            registry.count_failure("metasync", "not_confirmed")
+    return results
+
+
+def main():
+    pods_path = os.getenv("METASYNC_PODS")
+    manager_mnemonic = os.getenv("ALGO_MNEMONIC")
+    app_id = os.getenv("GROWPOD_APP_ID")
+    index_db = os.getenv("METASYNC_INDEX_DB")
+
+    if not all([pods_path, manager_mnemonic]) or not (app_id or index_db):
+        print("ERROR: Required environment variables not set:")
+        print("  METASYNC_PODS - One '<asset id> <owner address> [pod]' per line")
+        print("  ALGO_MNEMONIC - Mnemonic of the pod NFTs' manager")
+        print("  GROWPOD_APP_ID - Contract application ID (or METASYNC_INDEX_DB)")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("GrowPod Empire - Pod NFT Metadata Sync")
+    print("=" * 50)
+
+    pods = load_pods(pods_path)
+    state = load_state()
+    if index_db:
+        conn = sqlite3.connect(index_db)
+        stages = stages_from_index(conn)
+        conn.close()
+        print(f"Stages of {len(pods):,} pods read from {index_db}")
+    else:
+        stages = stages_from_algod(pods, int(app_id))
+        print(f"Stages of {len(pods):,} pods read from algod")
+
+    updates = diff(pods, stages, state)
+    print(f"{len(updates):,} NFT(s) behind their pod's stage, {len(pods) - len(updates):,} up to date")
+    if not updates:
+        return
+
+    results = sync(updates, state, mnemonic.to_private_key(manager_mnemonic))
+    write_state(state)
+
+    outcomes = {}
+    for outcome in results.values():
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    print(f"\n{outcomes.get('ok', 0):,} NFT(s) updated")
+    for outcome, count in sorted(outcomes.items()):
+        if outcome != "ok":
+            print(f"  {outcome}: {count:,}")
+    print(f"State: {STATE_PATH}")
+    if any(state.get(str(u.nft.asset_id), {}).get("url", "").startswith(ARC19_SCHEME) for u in updates):
+        print("Pin/upload the metadata store so the new ARC-19 documents resolve.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Latency instrumentation for GrowPod Empire scripts
+Per-phase HDR-style histograms and per-method counters, exported in the
+Prometheus text format to a file and/or a local HTTP endpoint.
+
+Enable with environment variables:
+    GROWPOD_METRICS_FILE=/path/growpod.prom   Write the text file at exit
+    GROWPOD_METRICS_PORT=9464                 Serve /metrics while the script runs
+
+Phases: suggested_params, sign, send_transaction, wait_for_confirmation
+(plus any custom phase name passed to `phase`). With GROWPOD_PROFILE set, each
+phase is also a profiling section (see profiling.py).
+"""
+from algosdk.error import AlgodHTTPError
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import URLError
+import atexit
+import os
+import profiling
+import threading
+import time
+
+# Buckets per power of two; 16 gives <= 6.25% relative error
+SUB_BUCKET_BITS = 4
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Substring of an algod error message -> failure reason label
+FAILURE_REASONS = (
+    ("overlapping lease", "lease_conflict"),
+    ("already in ledger", "duplicate"),
+    ("overspend", "overspend"),
+    ("below min", "below_min_balance"),
+    ("fee too small", "fee_too_small"),
+    ("txn dead", "expired"),
+    ("round outside", "expired"),
+    ("logic eval error", "logic_eval"),
+    ("rejected by logic", "logic_reject"),
+    ("asset frozen", "asset_frozen"),
+    ("not opted in", "not_opted_in"),
+    ("must optin", "not_opted_in"),
+    ("missing from", "not_opted_in"),
+)
+
+
+class Histogram:
+    """Log-linear (HDR-style) histogram of microsecond latencies."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_us: int) -> None:
+        value_us = max(int(value_us), 1)
+        shift = max(0, value_us.bit_length() - 1 - SUB_BUCKET_BITS)
+        bucket = (value_us >> shift) << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value_us
+        if value_us > self.max:
+            self.max = value_us
+
+    def quantile(self, q: float) -> int:
+        """Upper bound (microseconds) of the bucket holding quantile q."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                shift = max(0, bucket.bit_length() - 1 - SUB_BUCKET_BITS)
+                return min(bucket + (1 << shift) - 1, self.max)
+        return self.max
+
+
+class Registry:
+    """Thread-safe store of phase histograms and outcome counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}  # (method, phase) -> Histogram
+        self.calls = {}  # (method, status) -> count
+        self.failures = {}  # (method, reason) -> count
+
+    def __getstate__(self):
+        # Picklable so worker processes can return their registry for merge()
+        with self.lock:
+            return {"histograms": self.histograms, "calls": self.calls, "failures": self.failures}
+
+    def __setstate__(self, state):
+        self.__init__()
+        self.__dict__.update(state)
+
+    def observe(self, method: str, phase_name: str, value_us: int) -> None:
+        with self.lock:
+            hist = self.histograms.get((method, phase_name))
+            if hist is None:
+                hist = self.histograms[(method, phase_name)] = Histogram()
+            hist.record(value_us)
+
+    def count_call(self, method: str, status: str) -> None:
+        with self.lock:
+            self.calls[(method, status)] = self.calls.get((method, status), 0) + 1
+
+    def count_failure(self, method: str, reason: str) -> None:
+        with self.lock:
+            self.failures[(method, reason)] = self.failures.get((method, reason), 0) + 1
+        self.count_call(method, "error")
+
+    def merge(self, other: "Registry") -> None:
+        """Fold another registry's samples into this one (e.g. from a worker)."""
+        with self.lock:
+            for key, hist in other.histograms.items():
+                mine = self.histograms.setdefault(key, Histogram())
+                for bucket, n in hist.counts.items():
+                    mine.counts[bucket] = mine.counts.get(bucket, 0) + n
+                mine.count += hist.count
+                mine.total += hist.total
+                mine.max = max(mine.max, hist.max)
+            for key, n in other.calls.items():
+                self.calls[key] = self.calls.get(key, 0) + n
+            for key, n in other.failures.items():
+                self.failures[key] = self.failures.get(key, 0) + n
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP growpod_phase_seconds Latency of each script phase per contract method.",
+            "# TYPE growpod_phase_seconds summary",
+        ]
+        with self.lock:
+            for (method, phase_name), hist in sorted(self.histograms.items()):
+                labels = f'method="{method}",phase="{phase_name}"'
+                for q in QUANTILES:
+                    lines.append(f'growpod_phase_seconds{{{labels},quantile="{q}"}} {hist.quantile(q) / 1e6:.6f}')
+                lines.append(f"growpod_phase_seconds_sum{{{labels}}} {hist.total / 1e6:.6f}")
+                lines.append(f"growpod_phase_seconds_count{{{labels}}} {hist.count}")
+
+            lines.append("# HELP growpod_calls_total Contract operations by outcome.")
+            lines.append("# TYPE growpod_calls_total counter")
+            for (method, status), n in sorted(self.calls.items()):
+                lines.append(f'growpod_calls_total{{method="{method}",status="{status}"}} {n}')
+
+            lines.append("# HELP growpod_failures_total Failed operations by parsed algod reason.")
+            lines.append("# TYPE growpod_failures_total counter")
+            for (method, reason), n in sorted(self.failures.items()):
+                lines.append(f'growpod_failures_total{{method="{method}",reason="{reason}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def failure_reason(err: Exception) -> str:
+    """Classify an algod/transport error into a short reason label."""
+    message = str(err).lower()
+    for needle, reason in FAILURE_REASONS:
+        if needle in message:
+            return reason
+    if isinstance(err, AlgodHTTPError):
+        if err.code == 429:
+            return "rate_limited"
+        if err.code is not None and err.code >= 500:
+            return "node_error"
+        return f"http_{err.code}" if err.code else "algod_error"
+    if isinstance(err, (URLError, TimeoutError, ConnectionError)):
+        return "network"
+    return type(err).__name__
+
+
+@contextmanager
+def phase(method: str, phase_name: str):
+    """
+    Time one phase of a contract operation.
+
+    Failures are counted by parsed reason and re-raised unchanged.
+    """
+    start = time.perf_counter_ns()
+    try:
+        with profiling.section(phase_name):
+            yield
+    except Exception as e:
+        registry.count_failure(method, failure_reason(e))
+        raise
+    finally:
+        registry.observe(method, phase_name, (time.perf_counter_ns() - start) // 1000)
+
+
+def record_success(method: str) -> None:
+    """Count a completed (confirmed) operation."""
+    registry.count_call(method, "ok")
+
+
+def write_textfile(path: str) -> None:
+    """Atomically write the metrics for node_exporter's textfile collector."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve /metrics on a daemon thread."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if os.getenv("GROWPOD_METRICS_FILE"):
+    atexit.register(write_textfile, os.getenv("GROWPOD_METRICS_FILE"))
+if os.getenv("GROWPOD_METRICS_PORT"):
+    serve(int(os.getenv("GROWPOD_METRICS_PORT")))
@@ -9,16 +9,20 @@ from algosdk.transaction import (
     ApplicationNoOpTxn,
     wait_for_confirmation
 )
-from algosdk.v2client import algod
+from algosdk.logic import get_application_address
+from fees import set_group_fees
+from metrics import phase, record_success
+from multinode import connect
 import os
 import sys
 import hashlib
+import json
 import time
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
 
 # Default Pinata IPFS URLs for pod images
 POD_IMAGES = {
@@ -30,6 +34,14 @@ POD_IMAGES = {
     "dead_mold": "https://gateway.pinata.cloud/ipfs/QmMoldImage",
 }
 
+# POD_IMAGES key per contract stage (0=empty, 1-4=growing, 5=ready, 6=needs_cleanup)
+STAGE_IMAGES = ("default", "seedling", "vegetative", "flowering", "mature", "mature", "dead_mold")
+
+
+def stage_image(stage: int) -> str:
+    """POD_IMAGES key for a pod's on-chain stage."""
+    return STAGE_IMAGES[stage] if 0 <= stage < len(STAGE_IMAGES) else "default"
+
 
 def generate_dna_hash(sender: str) -> str:
     """Generate pseudo-random DNA hash for mystery seed."""
@@ -40,7 +52,8 @@ def generate_dna_hash(sender: str) -> str:
 def mint_pod_nft(
     creator_mnemonic: str, 
     pod_number: int = 1,
-    app_address: str = None
+    app_address: str = None,
+    metadata: dict = None
 ) -> int:
     """
     Mint a soulbound GrowPod NFT.
@@ -54,20 +67,22 @@ def mint_pod_nft(
         creator_mnemonic: 25-word Algorand wallet mnemonic
         pod_number: Pod number for naming (e.g., 1 = "GrowPod #001")
         app_address: Contract address for clawback (makes NFT soulbound)
+        metadata: Optional metastore.py manifest entry (ARC-19 url and reserve, dna)
         
     Returns:
         int: Asset ID of created pod NFT
     """
     private_key = mnemonic.to_private_key(creator_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("mint_pod_nft", "suggested_params"):
+        params = algod_client.suggested_params()
     
     # Format pod name and unit name
     unit_name = f"POD{pod_number:03d}"
     asset_name = f"GrowPod #{pod_number:03d}"
     
-    # Generate DNA for this pod
-    dna_hash = generate_dna_hash(sender)
+    # Generate DNA for this pod (a manifest entry already carries it, hashed into its metadata)
+    dna_hash = metadata["dna"] if metadata else generate_dna_hash(sender)
     
     # Clawback address makes it soulbound (cannot transfer without app approval)
     clawback_address = app_address if app_address else sender
@@ -83,19 +98,25 @@ def mint_pod_nft(
         unit_name=unit_name,
         asset_name=asset_name,
         manager=sender,
-        reserve=sender,
+        reserve=metadata["reserve"] if metadata else sender,  # ARC-19: digest of the metadata CID
         freeze=sender,
         clawback=clawback_address,  # Soulbound via clawback
-        url=POD_IMAGES["default"],
+        url=metadata["url"] if metadata else POD_IMAGES["default"],
         decimals=0,
-        metadata_hash=bytes.fromhex(dna_hash[:64])  # Store DNA hash
+        # The DNA hash itself; ARC-19 metadata changes with the stage, so it has none
+        metadata_hash=None if metadata else bytes.fromhex(dna_hash[:64])
     )
+    set_group_fees([txn], params)
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("mint_pod_nft", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("mint_pod_nft", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Creating NFT... TXID: {txid}")
 
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("mint_pod_nft", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("mint_pod_nft")
     asset_id = confirmed_txn['asset-index']
     
     print(f"\nPod NFT created!")
@@ -125,7 +146,8 @@ def plant_mystery_seed(user_mnemonic: str, app_id: int) -> dict:
     """
     private_key = mnemonic.to_private_key(user_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("mint_pod", "suggested_params"):
+        params = algod_client.suggested_params()
 
     txn = ApplicationNoOpTxn(
         sender=sender,
@@ -133,12 +155,17 @@ def plant_mystery_seed(user_mnemonic: str, app_id: int) -> dict:
         index=app_id,
         app_args=["mint_pod"]
     )
+    set_group_fees([txn], params)
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("mint_pod", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("mint_pod", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Planting mystery seed... TXID: {txid}")
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("mint_pod", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("mint_pod")
     
     print("\nMystery seed planted!")
     print("  Terpene profile: Hidden (revealed at harvest)")
@@ -160,13 +187,25 @@ def main():
     
     # Check if we should mint NFT or just plant seed
     app_id = os.getenv("GROWPOD_APP_ID")
-    app_address = os.getenv("GROWPOD_APP_ADDRESS")
+    # The clawback (soulbound) address is derived from the app ID, no lookup needed
+    app_address = get_application_address(int(app_id)) if app_id else None
     
     # Get pod number from env or default to 1
     pod_number = int(os.getenv("POD_NUMBER", "1"))
     
+    # Metadata rendered ahead of time by metastore.py, if any
+    metadata = None
+    manifest_path = os.getenv("METASTORE_MANIFEST")
+    if manifest_path:
+        with open(manifest_path) as f:
+            pods = json.load(f)["pods"]
+        metadata = next((pod for pod in pods if pod["pod_number"] == pod_number), None)
+        if metadata is None:
+            print(f"ERROR: Pod {pod_number} is not in {manifest_path}")
+            sys.exit(1)
+
     # Mint the NFT
-    asset_id = mint_pod_nft(mnemonic_phrase, pod_number, app_address)
+    asset_id = mint_pod_nft(mnemonic_phrase, pod_number, app_address, metadata)
     
     # If contract is deployed, also plant the seed
     if app_id:
@@ -0,0 +1,271 @@
+"""
+Local model of the GrowPod contract
+Pure-Python mirror of contract.py's router: the same asserts, state transitions,
+inner transfers and event logs, applied to plain state dicts. Used to preflight
+calls before submission and by the local node stand-in.
+
+Local and global state dicts use the on-chain key names ("stage", "water_count_2",
+"bud_asset", ...); byte values are raw bytes.
+"""
+from algosdk import encoding
+from typing import NamedTuple
+from events import encode_event
+import hashlib
+
+# Constants mirrored from contract.py
+BASE_YIELD = 250_000_000
+WATER_COOLDOWN = 600
+WATER_COOLDOWN_MIN = 600
+NUTRIENT_COOLDOWN = 600
+GROWTH_CYCLE = 864_000
+CLEANUP_BURN = 500_000_000
+BREED_BURN = 1_000_000_000
+MIN_TERP_REWARD = 5_000_000_000
+MAX_TERP_REWARD = 50_000_000_000
+SLOT_TOKEN_COST = 2_500_000_000
+HARVESTS_FOR_SLOT = 5
+MAX_POD_SLOTS = 5
+TERP_RARITY_THRESHOLD = 32
+
+# Asset parameters created by the bootstrap method
+BOOTSTRAP_ASSETS = (
+    ("bud_asset", {"t": 10_000_000_000_000_000, "dc": 6, "un": "BUD", "an": "GrowPod BUD"}),
+    ("terp_asset", {"t": 100_000_000_000_000, "dc": 6, "un": "TERP", "an": "GrowPod TERP"}),
+    ("slot_asset", {"t": 1_000_000, "dc": 0, "un": "SLOT", "an": "GrowPod Slot Token"}),
+)
+
+# Inner transactions each router branch can issue (upper bound)
+INNER_TXN_COUNTS = {
+    "bootstrap": 3,
+    "harvest": 1, "harvest_2": 1,
+    "check_terp": 1, "check_terp_2": 1,
+    "claim_slot_token": 1,
+}
+
+POD_KEYS = ("stage", "water_count", "last_watered", "nutrient_count", "last_nutrients", "dna", "terpene_profile")
+
+
+class ContractReject(Exception):
+    """The call would fail the contract's logic (assert/err)."""
+
+
+class CallContext(NamedTuple):
+    sender: str
+    args: tuple  # application_args as bytes
+    timestamp: int  # Global.latest_timestamp()
+    round: int  # Global.round()
+    app_address: str
+    prev_txn: dict = None  # Gtxn[group_index - 1] in block/msgpack field names
+
+
+class CallResult(NamedTuple):
+    inner_txns: list  # Inner transactions in block/msgpack field names
+    logs: list  # Raw log records
+
+
+def pod_key(name: str, pod: int) -> str:
+    """On-chain local state key for a pod field ("stage", 2 -> "stage_2")."""
+    return name if pod == 1 else f"{name}_{pod}"
+
+
+def initial_global_state(creator: str) -> dict:
+    """Global state written by handle_creation."""
+    return {
+        "owner": encoding.decode_address(creator),
+        "period": GROWTH_CYCLE,
+        "cleanup_cost": CLEANUP_BURN,
+        "breed_cost": BREED_BURN,
+        "bud_asset": 0,
+        "terp_asset": 0,
+        "slot_asset": 0,
+        "terp_registry": b"",
+    }
+
+
+def initial_local_state() -> dict:
+    """Local state written by handle_optin (16 keys)."""
+    state = {}
+    for pod in (1, 2):
+        for name in POD_KEYS:
+            state[pod_key(name, pod)] = b"" if name in ("dna", "terpene_profile") else 0
+    state["harvest_count"] = 0
+    state["pod_slots"] = 2
+    return state
+
+
+def _require(condition: bool, detail: str) -> None:
+    if not condition:
+        raise ContractReject(f"logic eval error: assert failed: {detail}")
+
+
+def _itob(value: int) -> bytes:
+    return value.to_bytes(8, 'big')
+
+
+def _btoi(value: bytes) -> int:
+    _require(len(value) <= 8, "btoi arg too long")
+    return int.from_bytes(value, 'big')
+
+
+def _require_burn(ctx: CallContext, asset_id: int, minimum: int, exact: bool = False) -> int:
+    prev = ctx.prev_txn or {}
+    amount = prev.get('aamt', 0)
+    _require(prev.get('type') == 'axfer', "previous txn is not an asset transfer")
+    _require(prev.get('xaid', 0) == asset_id, "wrong burn asset")
+    _require(amount == minimum if exact else amount >= minimum, "burn amount too small")
+    _require(prev.get('arcv') == ctx.app_address, "burn not sent to app")
+    return amount
+
+
+def _transfer(asset_id: int, amount: int, receiver: str) -> dict:
+    return {'type': 'axfer', 'xaid': asset_id, 'aamt': amount, 'arcv': receiver}
+
+
+def terp_reward(terpene_profile: bytes) -> int:
+    """$TERP units check_terp mints for a profile (0 if not rare)."""
+    return reward_for_rarity(hashlib.sha256(terpene_profile).digest()[0])
+
+
+def reward_for_rarity(rarity: int) -> int:
+    """$TERP units for a profile whose hash starts with byte `rarity`."""
+    if rarity >= TERP_RARITY_THRESHOLD:
+        return 0
+    return MIN_TERP_REWARD + (TERP_RARITY_THRESHOLD - rarity) * (MAX_TERP_REWARD - MIN_TERP_REWARD) // TERP_RARITY_THRESHOLD
+
+
+def harvest_yield(water_count: int, nutrient_count: int) -> int:
+    """$BUD units harvest mints for the given counters."""
+    amount = BASE_YIELD
+    if water_count >= 10:
+        amount += BASE_YIELD * 20 // 100
+    if nutrient_count >= 10:
+        amount += BASE_YIELD * 30 // 100
+    return amount
+
+
+def apply_call(local: dict, glob: dict, ctx: CallContext, create_asset=None) -> CallResult:
+    """
+    Apply one NoOp app call to local/global state, exactly as the contract would.
+
+    State dicts are mutated in place only when the call succeeds.
+
+    Args:
+        local: Caller's local state (mutated)
+        glob: Application global state (mutated)
+        ctx: Transaction context
+        create_asset: Callable(params) -> asset ID, required for "bootstrap"
+
+    Returns:
+        CallResult: Inner transactions and log records
+
+    Raises:
+        ContractReject: The contract would reject the call
+    """
+    _require(len(ctx.args) > 0, "txna ApplicationArgs 0 out of range")
+    method = ctx.args[0].decode('utf-8', errors='replace')
+    base = method[:-2] if method.endswith("_2") else method
+    pod = 2 if method.endswith("_2") else 1
+    sender_bytes = encoding.decode_address(ctx.sender)
+    new_local = dict(local)
+    new_glob = dict(glob)
+    inner, logs = [], []
+
+    def key(name):
+        return pod_key(name, pod)
+
+    if method == "bootstrap":
+        _require(sender_bytes == glob["owner"], "not owner")
+        _require(glob["bud_asset"] == 0 and glob["terp_asset"] == 0, "already bootstrapped")
+        for global_key, params in BOOTSTRAP_ASSETS:
+            new_glob[global_key] = create_asset(params)
+            inner.append({'type': 'acfg', 'apar': params})
+    elif method == "set_asa_ids":
+        _require(sender_bytes == glob["owner"], "not owner")
+        new_glob["bud_asset"] = _btoi(ctx.args[1])
+        new_glob["terp_asset"] = _btoi(ctx.args[2])
+        if len(ctx.args) > 3:
+            new_glob["slot_asset"] = _btoi(ctx.args[3])
+    elif base == "mint_pod":
+        _require(local[key("stage")] == 0, "pod not empty")
+        suffix = b"pod2" if pod == 2 else b""
+        new_local[key("dna")] = hashlib.sha256(
+            sender_bytes + _itob(ctx.timestamp) + _itob(ctx.round) + suffix
+        ).digest()
+        for name in ("water_count", "last_watered", "nutrient_count", "last_nutrients"):
+            new_local[key(name)] = 0
+        new_local[key("stage")] = 1
+        new_local[key("terpene_profile")] = hashlib.sha256(
+            (b"terp2" if pod == 2 else b"terp") + sender_bytes + _itob(ctx.timestamp)
+        ).digest()
+        logs.append(encode_event("mint_pod", pod, 1))
+    elif base == "water":
+        stage = local[key("stage")]
+        _require(1 <= stage <= 4, "pod not growing")
+        cooldown = _btoi(ctx.args[1]) if len(ctx.args) > 1 else WATER_COOLDOWN
+        _require(cooldown >= WATER_COOLDOWN_MIN, "cooldown below minimum")
+        last = local[key("last_watered")]
+        _require(last == 0 or ctx.timestamp - last >= cooldown, "water cooldown")
+        count = local[key("water_count")] + 1
+        new_local[key("last_watered")] = ctx.timestamp
+        new_local[key("water_count")] = count
+        if count >= 10:
+            stage = 5
+        elif count in (3, 6, 8):
+            stage = {3: 2, 6: 3, 8: 4}[count]
+        new_local[key("stage")] = stage
+        logs.append(encode_event("water", pod, stage, 0, count))
+    elif base == "nutrients":
+        stage = local[key("stage")]
+        _require(1 <= stage <= 4, "pod not growing")
+        last = local[key("last_nutrients")]
+        _require(last == 0 or ctx.timestamp - last >= NUTRIENT_COOLDOWN, "nutrient cooldown")
+        count = local[key("nutrient_count")] + 1
+        new_local[key("last_nutrients")] = ctx.timestamp
+        new_local[key("nutrient_count")] = count
+        logs.append(encode_event("nutrients", pod, stage, 0, count))
+    elif base == "harvest":
+        _require(local[key("stage")] == 5, "pod not ready")
+        _require(glob["bud_asset"] != 0, "BUD not configured")
+        amount = harvest_yield(local[key("water_count")], local[key("nutrient_count")])
+        inner.append(_transfer(glob["bud_asset"], amount, ctx.sender))
+        new_local[key("stage")] = 6
+        new_local["harvest_count"] = local["harvest_count"] + 1
+        logs.append(encode_event("harvest", pod, 6, amount, new_local["harvest_count"]))
+    elif base == "cleanup":
+        _require(local[key("stage")] == 6, "pod not harvested")
+        _require(glob["bud_asset"] != 0, "BUD not configured")
+        burned = _require_burn(ctx, glob["bud_asset"], CLEANUP_BURN)
+        for name in POD_KEYS:
+            new_local[key(name)] = b"" if name in ("dna", "terpene_profile") else 0
+        logs.append(encode_event("cleanup", pod, 0, burned))
+    elif base == "check_terp":
+        _require(local[key("stage")] == 6, "pod not harvested")
+        _require(glob["terp_asset"] != 0, "TERP not configured")
+        profile = local[key("terpene_profile")]
+        reward = terp_reward(profile)
+        if reward:
+            inner.append(_transfer(glob["terp_asset"], reward, ctx.sender))
+        logs.append(encode_event("check_terp", pod, 6, reward, hashlib.sha256(profile).digest()[0]))
+    elif method == "breed":
+        _require(glob["bud_asset"] != 0, "BUD not configured")
+        burned = _require_burn(ctx, glob["bud_asset"], BREED_BURN)
+        logs.append(encode_event("breed", 0, 0, burned))
+    elif method == "claim_slot_token":
+        _require(glob["slot_asset"] != 0 and glob["bud_asset"] != 0, "assets not configured")
+        _require(local["harvest_count"] >= HARVESTS_FOR_SLOT, "not enough harvests")
+        burned = _require_burn(ctx, glob["bud_asset"], SLOT_TOKEN_COST)
+        inner.append(_transfer(glob["slot_asset"], 1, ctx.sender))
+        new_local["harvest_count"] = local["harvest_count"] - HARVESTS_FOR_SLOT
+        logs.append(encode_event("claim_slot_token", 0, 0, burned, new_local["harvest_count"]))
+    elif method == "unlock_slot":
+        _require(glob["slot_asset"] != 0, "SLOT not configured")
+        _require(local["pod_slots"] < MAX_POD_SLOTS, "max pod slots")
+        _require_burn(ctx, glob["slot_asset"], 1, exact=True)
+        new_local["pod_slots"] = local["pod_slots"] + 1
+        logs.append(encode_event("unlock_slot", 0, 0, 1, new_local["pod_slots"]))
+    else:
+        raise ContractReject(f"logic eval error: err opcode executed (unknown method {method!r})")
+
+    local.update(new_local)
+    glob.update(new_glob)
+    return CallResult(inner, logs)
@@ -0,0 +1,233 @@
+"""
+Multi-node algod client for GrowPod Empire
+One drop-in AlgodClient over several algod endpoints, with per-node health
+scoring, hedged reads, broadcast submissions and automatic failover.
+
+- Reads go to the healthiest node. If no answer arrives within the recent p95
+  latency of that method, a hedged duplicate goes to the next node and the
+  first success wins.
+- Submissions (send_transaction[s]) are broadcast to up to BROADCAST_NODES
+  healthy nodes at once. A group has the same txids on every node, so the
+  duplicates are harmless; the first acceptance wins.
+- Congestion and transport errors (429, 5xx, resets, timeouts) count against
+  a node and move the request to the next one. After FAIL_THRESHOLD in a row
+  the node sits out FAILOVER_COOLDOWN seconds. Rejections (4xx) are answers,
+  not node faults, and are returned as they are.
+
+Set ALGOD_ADDRESS to a comma-separated list to enable it in the fleet tools:
+    ALGOD_ADDRESS=https://node-a:443,https://node-b:443,https://node-c:443
+"""
+from algosdk.v2client import algod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from ratelimit import LONG_POLLS, WRITE_METHODS, is_congestion
+import os
+import threading
+import time
+
+BROADCAST_NODES = int(os.getenv("ALGOD_BROADCAST", "3"))
+
+HEDGE_QUANTILE = 0.95
+HEDGE_WINDOW = 256  # Recent latencies per method the hedge delay is taken from
+HEDGE_MIN_SAMPLES = 20  # Below this, wait HEDGE_DEFAULT before hedging
+HEDGE_DEFAULT = 0.5
+HEDGE_FLOOR = 0.005  # Never hedge sooner than this many seconds
+EWMA_ALPHA = 0.2
+FAIL_THRESHOLD = 3  # Node errors in a row before a node is failed over
+FAILOVER_COOLDOWN = 10.0  # Seconds a failed node sits out
+MAX_THREADS = 64
+
+
+class Node:
+    """One algod endpoint and its health."""
+
+    def __init__(self, address: str, client):
+        self.address = address
+        self.client = client
+        self.latency = None  # EWMA of successful request latency (seconds)
+        self.failures = 0  # Node errors in a row
+        self.down_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0  # Hedged duplicates sent to this node
+        self.hedges_won = 0
+        self.lock = threading.Lock()
+
+    def record(self, latency: float, node_error: bool) -> None:
+        with self.lock:
+            self.requests += 1
+            if node_error:
+                self.errors += 1
+                self.failures += 1
+                if self.failures >= FAIL_THRESHOLD:
+                    self.down_until = time.monotonic() + FAILOVER_COOLDOWN
+                return
+            self.failures = 0
+            self.down_until = 0.0
+            self.latency = latency if self.latency is None else (
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency
+            )
+
+    def score(self, now: float) -> tuple:
+        """Sort key: healthy before failed over, then by expected latency."""
+        with self.lock:
+            # An unmeasured node scores 0 so it gets tried early
+            return (self.down_until > now, (self.latency or 0.0) * (1 + self.failures))
+
+    def report(self) -> dict:
+        with self.lock:
+            return {
+                "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+                "requests": self.requests,
+                "errors": self.errors,
+                "hedges": self.hedges,
+                "hedges_won": self.hedges_won,
+                "down": self.down_until > time.monotonic(),
+            }
+
+
+class MultiNodeClient:
+    """AlgodClient proxy that spreads every request over several nodes."""
+
+    def __init__(self, nodes: list, broadcast_nodes: int = BROADCAST_NODES, max_threads: int = MAX_THREADS):
+        self.nodes = nodes
+        self.broadcast_nodes = max(1, broadcast_nodes)
+        self.pool = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="algod-node")
+        self.latencies = {}  # method -> deque of recent successful latencies
+        self.lock = threading.Lock()
+
+    def __getattr__(self, name):
+        attr = getattr(self.nodes[0].client, name)
+        if not callable(attr):
+            return attr
+        if name in WRITE_METHODS:
+            return lambda *args, **kwargs: self._broadcast(name, args, kwargs)
+        if name in LONG_POLLS:
+            return lambda *args, **kwargs: self._failover(name, args, kwargs)
+        return lambda *args, **kwargs: self._hedged(name, args, kwargs)
+
+    def ranked(self) -> list:
+        """Nodes from healthiest to least healthy."""
+        now = time.monotonic()
+        return sorted(self.nodes, key=lambda node: node.score(now))
+
+    def hedge_delay(self, name: str) -> float:
+        """Seconds to wait on a read before hedging: the method's recent p95."""
+        with self.lock:
+            samples = sorted(self.latencies.get(name, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT
+        return max(HEDGE_FLOOR, samples[min(len(samples) - 1, int(HEDGE_QUANTILE * len(samples)))])
+
+    def _call(self, node: Node, name: str, args: tuple, kwargs: dict):
+        """Run one request on one node, recording its health."""
+        start = time.perf_counter()
+        try:
+            result = getattr(node.client, name)(*args, **kwargs)
+        except Exception as e:
+            node.record(time.perf_counter() - start, is_congestion(e))
+            raise
+        latency = time.perf_counter() - start
+        node.record(latency, False)
+        with self.lock:
+            self.latencies.setdefault(name, deque(maxlen=HEDGE_WINDOW)).append(latency)
+        return result
+
+    def _hedged(self, name: str, args: tuple, kwargs: dict):
+        order = self.ranked()
+        untried = deque(order[1:])
+        pending = {self.pool.submit(self._call, order[0], name, args, kwargs): order[0]}
+        hedged = False
+        answer = None  # First rejection, returned if no node succeeds
+
+        while pending:
+            timeout = None if hedged or not untried else self.hedge_delay(name)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slower than the recent p95: race a duplicate on the next node
+                hedged = True
+                node = untried.popleft()
+                with node.lock:
+                    node.hedges += 1
+                pending[self.pool.submit(self._call, node, name, args, kwargs)] = node
+                continue
+            for future in done:
+                node = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    if hedged and node is not order[0]:
+                        with node.lock:
+                            node.hedges_won += 1
+                    return future.result()
+                if not is_congestion(error):
+                    answer = answer or error
+                elif untried and not pending:
+                    # Fail over: the node is overloaded or unreachable
+                    node = untried.popleft()
+                    pending[self.pool.submit(self._call, node, name, args, kwargs)] = node
+                elif answer is None and not pending:
+                    answer = error
+        raise answer
+
+    def _failover(self, name: str, args: tuple, kwargs: dict):
+        """Try nodes one at a time (long polls are never hedged)."""
+        error = None
+        for node in self.ranked():
+            try:
+                return self._call(node, name, args, kwargs)
+            except Exception as e:
+                if not is_congestion(e):
+                    raise
+                error = error or e
+        raise error
+
+    def _broadcast(self, name: str, args: tuple, kwargs: dict):
+        """Send to several nodes; the first acceptance wins."""
+        ranked = self.ranked()
+        targets = [node for node in ranked if node.down_until <= time.monotonic()][:self.broadcast_nodes]
+        pending = {self.pool.submit(self._call, node, name, args, kwargs): node for node in targets or ranked[:1]}
+        errors = []
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                if future.exception() is None:
+                    return future.result()
+                errors.append(future.exception())
+
+        def preference(err):
+            # Already-known txids mean success to submit.broadcast; then the real rejections
+            message = str(err)
+            if "already in ledger" in message or "already in the pool" in message:
+                return 0
+            return 2 if is_congestion(err) else 1
+        raise min(errors, key=preference)
+
+    def report(self) -> dict:
+        """Health and hedging counters per node."""
+        return {node.address: node.report() for node in self.nodes}
+
+    def summary(self) -> str:
+        """One line per node for script output."""
+        lines = []
+        for address, r in self.report().items():
+            latency = f"{r['latency_ms']:,.1f}ms" if r['latency_ms'] is not None else "-"
+            lines.append(
+                f"  {address}: {r['requests']:,} requests, {latency} avg, {r['errors']} error(s), "
+                f"{r['hedges_won']}/{r['hedges']} hedges won{' (failed over)' if r['down'] else ''}"
+            )
+        return "\n".join(lines)
+
+
+def connect(addresses: str, token: str = ""):
+    """
+    AlgodClient for one endpoint, or a MultiNodeClient for a comma-separated list.
+
+    Args:
+        addresses: "https://node-a" or "https://node-a,https://node-b,..."
+        token: Algod API token (shared by every node)
+    """
+    endpoints = [address.strip() for address in addresses.split(",") if address.strip()]
+    if len(endpoints) == 1:
+        return algod.AlgodClient(token, endpoints[0])
+    return MultiNodeClient([Node(address, algod.AlgodClient(token, address)) for address in endpoints])
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Bulk onboarding for GrowPod Empire
+Opts each account into the app (handle_optin initialises its 16 local keys) and
+into the $BUD, $TERP and Slot ASAs with one atomic group per account, sends many
+accounts' groups concurrently, and verifies each account with a single
+account_info read instead of waiting on four confirmations.
+"""
+from algosdk import mnemonic
+from algosdk.transaction import ApplicationOptInTxn, AssetOptInTxn, assign_group_id
+from appconfig import resolve
+from concurrent.futures import ThreadPoolExecutor
+from fees import set_group_fees
+from metrics import failure_reason, phase, record_success, registry
+from multinode import connect
+from ratelimit import limited
+from slots import load_fleet
+from submit import call_with_retry, broadcast
+from typing import NamedTuple
+import os
+import sys
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = limited(connect(ALGOD_ADDRESS, ALGOD_TOKEN))  # Throttled: fleet-sized bursts
+
+WORKERS = 16  # Concurrent sends/reads
+MAX_ROUNDS = 4  # Rounds to wait for a group before giving up on it
+
+
+class Onboarding(NamedTuple):
+    address: str
+    app: bool  # App opt-in still needed
+    assets: tuple  # Asset IDs still needing opt-in
+
+
+def missing_optins(account_info: dict, app_id: int, asset_ids: tuple) -> Onboarding:
+    """What an account still lacks, from one account_info response."""
+    opted_apps = {app['id'] for app in account_info.get('apps-local-state', [])}
+    held = {asset['asset-id'] for asset in account_info.get('assets', [])}
+    return Onboarding(
+        account_info['address'],
+        app_id not in opted_apps,
+        tuple(asset_id for asset_id in asset_ids if asset_id not in held),
+    )
+
+
+def build_group(private_key: str, todo: Onboarding, app_id: int, params) -> list:
+    """Signed [app opt-in, ASA opt-ins...] group for the missing parts."""
+    txns = []
+    if todo.app:
+        txns.append(ApplicationOptInTxn(todo.address, params, app_id))
+    txns.extend(AssetOptInTxn(todo.address, params, asset_id) for asset_id in todo.assets)
+    set_group_fees(txns, params)
+    if len(txns) > 1:
+        assign_group_id(txns)
+    with phase("onboard", "sign"):
+        return [txn.sign(private_key) for txn in txns]
+
+
+def read_missing(addresses: list, app_id: int, asset_ids: tuple, pool: ThreadPoolExecutor) -> dict:
+    """One account_info read per account; address -> Onboarding."""
+    def read(address):
+        return missing_optins(call_with_retry(algod_client.account_info, address), app_id, asset_ids)
+    return {todo.address: todo for todo in pool.map(read, addresses)}
+
+
+def onboard(fleet: dict, app_id: int, asset_ids: tuple, workers: int = WORKERS) -> dict:
+    """
+    Onboard every account in the fleet.
+
+    Args:
+        fleet: address -> mnemonic
+        app_id: GrowPod smart contract application ID
+        asset_ids: ($BUD, $TERP, Slot) ASA IDs
+        workers: Concurrent sends/reads
+
+    Returns:
+        dict: address -> "ok", "already onboarded" or the failure reason
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        with phase("onboard", "read_state"):
+            pending = read_missing(list(fleet), app_id, asset_ids, pool)
+        for address, todo in list(pending.items()):
+            if not todo.app and not todo.assets:
+                results[address] = "already onboarded"
+                del pending[address]
+        if not pending:
+            return results
+
+        with phase("onboard", "suggested_params"):
+            params = call_with_retry(algod_client.suggested_params)
+
+        def send(todo):
+            signed = build_group(mnemonic.to_private_key(fleet[todo.address]), todo, app_id, params)
+            try:
+                with phase("onboard", "send_transaction"):
+                    broadcast(algod_client, signed, max_attempts=4, method="onboard")
+                return todo.address, None
+            except Exception as e:
+                return todo.address, e
+
+        for address, error in pool.map(send, pending.values()):
+            if error is not None:
+                results[address] = failure_reason(error)
+                del pending[address]
+
+        # Verify by state instead of per-transaction confirmations
+        current_round = call_with_retry(algod_client.status)['last-round']
+        for _ in range(MAX_ROUNDS):
+            if not pending:
+                break
+            call_with_retry(algod_client.status_after_block, current_round)
+            current_round += 1
+            with phase("onboard", "verify"):
+                remaining = read_missing(list(pending), app_id, asset_ids, pool)
+            for address, todo in remaining.items():
+                if not todo.app and not todo.assets:
+                    results[address] = "ok"
+                    record_success("onboard")
+                    del pending[address]
+
+    for address in pending:
+        results[address] = "not confirmed"
+        registry.count_failure("onboard", "not_confirmed")
+    return results
+
+
+def main():
+    fleet_path = os.getenv("FLEET_FILE")
+    app_id = os.getenv("GROWPOD_APP_ID")
+
+    if not all([fleet_path, app_id]):
+        print("ERROR: Required environment variables not set:")
+        print("  FLEET_FILE - One account mnemonic per line")
+        print("  GROWPOD_APP_ID - Contract application ID")
+        sys.exit(1)
+
+    config = resolve(algod_client, int(app_id))
+    asset_ids = (config.bud_asset, config.terp_asset, config.slot_asset)
+    if not all(asset_ids):
+        print("ERROR: Contract assets are not configured. Run the bootstrap first.")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("GrowPod Empire - Bulk Onboarding")
+    print("=" * 50)
+
+    fleet = load_fleet(fleet_path)
+    print(f"Accounts: {len(fleet)}")
+    print(f"Opting into app {config.app_id} and ASAs {', '.join(map(str, asset_ids))}...")
+
+    results = onboard(fleet, config.app_id, asset_ids)
+    failed = {address: outcome for address, outcome in results.items() if outcome not in ("ok", "already onboarded")}
+    print(f"\n  Onboarded: {sum(1 for outcome in results.values() if outcome == 'ok')}")
+    print(f"  Already onboarded: {sum(1 for outcome in results.values() if outcome == 'already onboarded')}")
+    print(f"  Failed: {len(failed)}")
+    for address, outcome in failed.items():
+        print(f"    {address[:8]}...  {outcome}")
+    print(algod_client.limiter.summary())
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
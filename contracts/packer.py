@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Cross-account group packer for GrowPod Empire
+For an operator holding the keys of many grow accounts: bundles the due water,
+nutrients and harvest calls of different accounts into atomic groups of up to
+16 transactions, pays the whole group's fee from one transaction, and submits
+many groups per round.
+
+Each account's calls are preflighted in order against model.py with the state
+just read, so only calls the contract would accept are packed. An account's
+calls always stay together in one group. When a group is still rejected, the
+account named in the error is dropped and the rest are resubmitted as a new
+group; errors that name no transaction split the group in two.
+"""
+from algosdk import account, mnemonic
+from algosdk.transaction import ApplicationNoOpTxn, PaymentTxn, assign_group_id
+from appconfig import decode_state, resolve
+from concurrent.futures import ThreadPoolExecutor
+from fees import pool_group_fees
+from fleet import chain_time, plan_account
+from metrics import failure_reason, phase, record_success, registry
+from model import CallContext, ContractReject, apply_call
+from multinode import connect
+from ratelimit import limited
+from slots import load_fleet
+from statecodec import read_account
+from submit import broadcast, call_with_retry, confirm_groups
+from typing import NamedTuple
+import os
+import re
+import sys
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = limited(connect(ALGOD_ADDRESS, ALGOD_TOKEN))  # Throttled: fleet-sized bursts
+
+MAX_GROUP_SIZE = 16  # Protocol limit on transactions per atomic group
+PACKABLE = ("water", "nutrients", "harvest")  # Single app calls with no payment attached
+THREADS = 16  # Groups sent/confirmed concurrently
+MAX_ROUNDS = 4  # Rounds to wait for a group before giving up on it
+
+_TXID = re.compile(r"transaction ([A-Z2-7]{52})")
+
+
+class Member(NamedTuple):
+    address: str
+    methods: tuple  # On-chain method names, in order
+
+
+def preflight(address: str, methods: list, local: dict, glob: dict, now: int, next_round: int,
+              app_address: str) -> tuple:
+    """
+    Keep the calls model.py accepts, applied in order to a copy of the state.
+
+    Returns:
+        tuple: (accepted methods, {method: reject reason})
+    """
+    local, glob = dict(local), dict(glob)
+    accepted, rejected = [], {}
+    for method in methods:
+        ctx = CallContext(address, (method.encode(),), now, next_round, app_address)
+        try:
+            apply_call(local, glob, ctx)
+            accepted.append(method)
+        except (ContractReject, KeyError) as e:
+            rejected[method] = str(e) if isinstance(e, ContractReject) else "not opted in"
+    return tuple(accepted), rejected
+
+
+def pack(members: list, capacity: int = MAX_GROUP_SIZE) -> list:
+    """First-fit members into groups of at most `capacity` transactions."""
+    groups = []
+    for member in sorted(members, key=lambda m: -len(m.methods)):
+        for group in groups:
+            if sum(len(m.methods) for m in group) + len(member.methods) <= capacity:
+                group.append(member)
+                break
+        else:
+            groups.append([member])
+    return groups
+
+
+def build_group(group: list, keys: dict, app_id: int, params, fee_payer: tuple = None) -> list:
+    """
+    Signed cross-account group; the fee payer (or the first call) pays for all.
+
+    Args:
+        group: Members to include
+        keys: address -> private key
+        app_id: GrowPod smart contract application ID
+        params: Suggested params
+        fee_payer: Optional (address, private key) adding a 0-ALGO self-payment first
+
+    Returns:
+        list: Signed transactions
+    """
+    txns, signers = [], []
+    if fee_payer:
+        txns.append(PaymentTxn(fee_payer[0], params, fee_payer[0], 0))
+        signers.append(fee_payer[1])
+    for member in group:
+        for method in member.methods:
+            txns.append(ApplicationNoOpTxn(member.address, params, app_id, app_args=[method]))
+            signers.append(keys[member.address])
+    pool_group_fees(txns, params)
+    if len(txns) > 1:
+        assign_group_id(txns)
+    with phase("pack", "sign"):
+        return [txn.sign(key) for txn, key in zip(txns, signers)]
+
+
+def submit_groups(groups: list, keys: dict, app_id: int, fee_payer: tuple = None,
+                  threads: int = THREADS) -> dict:
+    """
+    Send every group concurrently, resubmitting around rejected members.
+
+    Returns:
+        dict: address -> "ok" or the failure reason
+    """
+    results = {}
+    with phase("pack", "suggested_params"):
+        params = call_with_retry(algod_client.suggested_params)
+
+    def send(group):
+        """Returns (sent: (group, txid) or None, groups to resubmit)."""
+        signed = build_group(group, keys, app_id, params, fee_payer)
+        try:
+            with phase("pack", "send_transaction"):
+                broadcast(algod_client, signed, max_attempts=4, method="pack")
+            return (group, signed[-1].get_txid()), []
+        except Exception as e:
+            reason = failure_reason(e)
+            match = _TXID.search(str(e))
+            offset = 1 if fee_payer else 0
+            txids = [stxn.get_txid() for stxn in signed]
+            if match and match.group(1) in txids[offset:] and reason != "fee_too_small":
+                index = txids.index(match.group(1)) - offset
+                for member in group:
+                    if index < len(member.methods):
+                        break
+                    index -= len(member.methods)
+                results[member.address] = reason
+                rest = [m for m in group if m is not member]
+                return None, [rest] if rest else []
+            if len(group) > 1:
+                half = len(group) // 2
+                return None, [group[:half], group[half:]]
+            results[group[0].address] = reason
+            return None, []
+
+    sent = []
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        queue = list(groups)
+        while queue:
+            outcomes = list(pool.map(send, queue))
+            queue = [retry for _, retries in outcomes for retry in retries]
+            sent.extend(entry for entry, _ in outcomes if entry)
+            if queue:
+                registry.count_call("pack", "split")
+
+        watched = {index: txid for index, (_, txid) in enumerate(sent)}
+        settled = confirm_groups(algod_client, pool, watched, MAX_ROUNDS, "pack")
+    for index, info in settled.items():
+        group = sent[index][0]
+        if info.get('confirmed-round'):
+            for member in group:
+                results[member.address] = "ok"
+                for method in member.methods:
+                    record_success(method[:-2] if method.endswith("_2") else method)
+        else:
+            for member in group:
+                results[member.address] = failure_reason(Exception(info['pool-error']))
+    sent = [entry for index, entry in enumerate(sent) if index not in settled]
+
+    for group, _ in sent:
+        for member in group:
+            results[member.address] = "not confirmed"
+            registry.count_failure("pack", "not_confirmed")
+    return results
+
+
+def run_packed(fleet: dict, config, operations: tuple = PACKABLE, fee_payer: tuple = None,
+               threads: int = THREADS) -> tuple:
+    """
+    Plan, preflight, pack and submit the due calls of every account.
+
+    Args:
+        fleet: address -> mnemonic
+        config: appconfig.AppConfig of the contract
+        operations: Subset of PACKABLE to perform
+        fee_payer: Optional (address, private key) paying every group's fee
+
+    Returns:
+        tuple: (address -> outcome, {address: {method: preflight reject reason}}, groups packed)
+    """
+    keys = {address: mnemonic.to_private_key(user_mnemonic) for address, user_mnemonic in fleet.items()}
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        now = chain_time(algod_client)
+        with phase("pack", "read_state"):
+            glob = decode_state(
+                call_with_retry(algod_client.application_info, config.app_id)['params'].get('global-state', [])
+            )
+            accounts = list(pool.map(
+                lambda address: call_with_retry(read_account, algod_client, address, config.app_id, (config.bud_asset,)),
+                fleet
+            ))
+    next_round = call_with_retry(algod_client.status)['last-round'] + 1
+
+    members, skipped = [], {}
+    for account_state in accounts:
+        calls = plan_account(account_state, now, operations)
+        if not calls:
+            continue
+        accepted, rejected = preflight(
+            account_state.address, [call.method for call in calls], account_state.local._asdict(), glob, now,
+            next_round, config.app_address
+        )
+        if rejected:
+            skipped[account_state.address] = rejected
+        if accepted:
+            members.append(Member(account_state.address, accepted))
+
+    groups = pack(members, MAX_GROUP_SIZE - (1 if fee_payer else 0))
+    return submit_groups(groups, keys, config.app_id, fee_payer, threads), skipped, len(groups)
+
+
+def main():
+    fleet_path = os.getenv("FLEET_FILE")
+    app_id = os.getenv("GROWPOD_APP_ID")
+
+    if not all([fleet_path, app_id]):
+        print("ERROR: Required environment variables not set:")
+        print("  FLEET_FILE - One account mnemonic per line")
+        print("  GROWPOD_APP_ID - Contract application ID")
+        sys.exit(1)
+
+    config = resolve(algod_client, int(app_id))
+    operations = tuple(op.strip() for op in os.getenv("PACK_OPERATIONS", ",".join(PACKABLE)).split(","))
+    unknown = set(operations) - set(PACKABLE)
+    if unknown:
+        print(f"ERROR: Operations that cannot be packed: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+    fee_payer = None
+    if os.getenv("FEE_PAYER_MNEMONIC"):
+        payer_key = mnemonic.to_private_key(os.getenv("FEE_PAYER_MNEMONIC"))
+        fee_payer = (account.address_from_private_key(payer_key), payer_key)
+
+    print("=" * 50)
+    print("GrowPod Empire - Group Packer")
+    print("=" * 50)
+
+    fleet = load_fleet(fleet_path)
+    print(f"Accounts: {len(fleet)}, operations: {', '.join(operations)}")
+    if fee_payer:
+        print(f"Fees paid by: {fee_payer[0]}")
+
+    results, skipped, groups = run_packed(fleet, config, operations, fee_payer)
+    failed = {address: outcome for address, outcome in results.items() if outcome != "ok"}
+    print(f"\n  Groups: {groups}")
+    print(f"  Accounts confirmed: {len(results) - len(failed)}")
+    print(f"  Calls skipped by preflight: {sum(len(r) for r in skipped.values())}")
+    print(f"  Failed: {len(failed)}")
+    for address, outcome in failed.items():
+        print(f"    {address[:8]}...  {outcome}")
+    print(algod_client.limiter.summary())
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Parent-pair search for GrowPod Empire
+Ranks every ordered pair of harvested plants by the TERP rarity of the hybrid
+they would produce, so the 1,000 $BUD breed burn goes to the best cross.
+
+Rarity is the first byte of sha256(hybrid terpene_profile), the same value
+check_terp compares with TERP_RARITY_THRESHOLD (lower is rarer). Hybrids are
+derived exactly as genetics.cross does, for all pairs of a row block at once,
+and only a bounded heap of the best k pairs is kept, so memory stays flat no
+matter how many plants are searched.
+
+breed.py crosses the two pods of one account, so a breed command line is only
+printed when the best pair's ids are pod numbers (an inventory of one account's
+pods, ids 1 and 2); any other ids label plants for ranking only.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from genetics import FIELDS, as_gene_array, cross_seeds, mix, sha256_many, stream_many
+from model import TERP_RARITY_THRESHOLD, reward_for_rarity
+from typing import NamedTuple
+import heapq
+import json
+import os
+import sys
+import time
+import numpy as np
+
+# Pairs evaluated per NumPy step (~16k lanes keeps the hash state in cache)
+BLOCK_PAIRS = 16_384
+DEFAULT_TOP_K = 10
+
+# Sort keys pack (rarity, parent1, parent2) into one int64
+INDEX_BITS = 24
+MAX_PLANTS = 1 << INDEX_BITS
+
+BREED_PODS = (1, 2)  # Parent ids breed.py accepts: the breeding account's pods
+
+
+class PairScore(NamedTuple):
+    rarity: int  # First byte of the hybrid profile hash
+    reward: int  # $TERP units check_terp would mint (0 if not rare)
+    parent1: int  # Index (or ID) of the dominant parent
+    parent2: int  # Index (or ID) of the recessive parent
+
+
+def hybrid_rarity(dna: np.ndarray, terp: np.ndarray, first: np.ndarray, second: np.ndarray,
+                  nonce: int = 0) -> np.ndarray:
+    """
+    Rarity byte of the hybrid for each (first[i], second[i]) cross.
+
+    Only the terpene field is derived; the hybrid DNA does not affect rarity.
+    """
+    seeds = cross_seeds(dna[first], dna[second], nonce)
+    rolls = (stream_many(seeds, FIELDS[1], b"select").astype(np.uint16) * 100 >> 8).astype(np.uint8)
+    mutation = stream_many(seeds, FIELDS[1], b"mutate")
+    hybrid = mix(rolls, terp[first], terp[second], mutation)
+    return sha256_many(hybrid)[:, 0]
+
+
+def _search_rows(dna: np.ndarray, terp: np.ndarray, row_start: int, row_end: int,
+                 k: int, nonce: int, block_pairs: int) -> list:
+    """Best k sort keys with parent1 in [row_start, row_end)."""
+    n = len(dna)
+    rows_per_block = max(1, block_pairs // n)
+    heap = []  # Max-heap of the best keys via negation
+    columns = np.arange(n, dtype=np.int64)
+
+    for start in range(row_start, row_end, rows_per_block):
+        rows = np.arange(start, min(start + rows_per_block, row_end), dtype=np.int64)
+        first = np.repeat(rows, n)
+        second = np.tile(columns, len(rows))
+        distinct = first != second
+        first, second = first[distinct], second[distinct]
+
+        rarity = hybrid_rarity(dna, terp, first, second, nonce)
+        keys = (rarity.astype(np.int64) << (2 * INDEX_BITS)) | (first << INDEX_BITS) | second
+        if len(heap) == k:
+            keys = keys[keys < -heap[0]]
+        if len(keys) > k:
+            keys = np.partition(keys, k - 1)[:k]
+        for key in keys.tolist():
+            if len(heap) < k:
+                heapq.heappush(heap, -key)
+            elif key < -heap[0]:
+                heapq.heapreplace(heap, -key)
+    return [-key for key in heap]
+
+
+def best_pairs(dna, terp, k: int = DEFAULT_TOP_K, nonce: int = 0, ids: list = None,
+               workers: int = 1, block_pairs: int = BLOCK_PAIRS) -> list:
+    """
+    Top-k ordered parent pairs by predicted hybrid rarity.
+
+    Args:
+        dna: (n, 32) uint8 array or sequence of 32-byte `dna` values
+        terp: (n, 32) uint8 array or sequence of 32-byte `terpene_profile` values
+        k: Number of pairs to return
+        nonce: Breed nonce the crosses would use
+        ids: Optional plant IDs to report instead of indices
+        workers: Processes to split the rows across
+        block_pairs: Pairs per vectorized step
+
+    Returns:
+        list: PairScore entries, rarest first (ties by parent1, parent2)
+    """
+    dna, terp = as_gene_array(dna), as_gene_array(terp)
+    n = len(dna)
+    if len(terp) != n:
+        raise ValueError("dna and terp must have the same length")
+    if n > MAX_PLANTS:
+        raise ValueError(f"at most {MAX_PLANTS} plants per search")
+    if n < 2 or k <= 0:
+        return []
+
+    if workers <= 1:
+        keys = _search_rows(dna, terp, 0, n, k, nonce, block_pairs)
+    else:
+        # Several row ranges per worker balances uneven progress
+        bounds = np.linspace(0, n, workers * 4 + 1, dtype=np.int64)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_search_rows, dna, terp, int(lo), int(hi), k, nonce, block_pairs)
+                for lo, hi in zip(bounds[:-1], bounds[1:]) if hi > lo
+            ]
+            keys = heapq.nsmallest(k, (key for future in futures for key in future.result()))
+
+    mask = MAX_PLANTS - 1
+    results = []
+    for key in sorted(keys)[:k]:
+        rarity = key >> (2 * INDEX_BITS)
+        first, second = (key >> INDEX_BITS) & mask, key & mask
+        if ids is not None:
+            first, second = ids[first], ids[second]
+        results.append(PairScore(rarity, reward_for_rarity(rarity), first, second))
+    return results
+
+
+def load_inventory(path: str) -> tuple:
+    """
+    Read plants from a JSON list of {"id", "dna", "terpene_profile"} (hex).
+
+    "id" is any integer label; use the pod number (1 or 2) for a plant in one of
+    the breeding account's pods to get a breed.py command line.
+
+    Returns:
+        tuple: (ids, dna array, terp array)
+    """
+    with open(path) as f:
+        plants = json.load(f)
+    ids = [plant["id"] for plant in plants]
+    dna = as_gene_array(bytes.fromhex(plant["dna"]) for plant in plants)
+    terp = as_gene_array(bytes.fromhex(plant["terpene_profile"]) for plant in plants)
+    return ids, dna, terp
+
+
+def main():
+    inventory_path = os.getenv("INVENTORY_FILE")
+    if not inventory_path:
+        print("ERROR: INVENTORY_FILE environment variable not set.")
+        print("  JSON list of {\"id\", \"dna\", \"terpene_profile\"} (hex)")
+        sys.exit(1)
+
+    k = int(os.getenv("TOP_K", str(DEFAULT_TOP_K)))
+    nonce = int(os.getenv("BREED_NONCE", "0"))
+    workers = int(os.getenv("SEARCH_WORKERS", str(os.cpu_count() or 1)))
+
+    print("=" * 50)
+    print("GrowPod Empire - Parent Pair Search")
+    print("=" * 50)
+
+    ids, dna, terp = load_inventory(inventory_path)
+    n = len(ids)
+    print(f"Plants: {n:,} ({n * (n - 1):,} ordered pairs), workers: {workers}")
+
+    start = time.time()
+    results = best_pairs(dna, terp, k, nonce, ids, workers)
+    print(f"Searched in {time.time() - start:.1f}s\n")
+
+    print(f"Top {len(results)} crosses (rare below {TERP_RARITY_THRESHOLD}):")
+    for rank, pair in enumerate(results, 1):
+        reward = f"{pair.reward / 1_000_000:,.0f} $TERP" if pair.reward else "not rare"
+        print(f"  {rank:3d}. Parent #{pair.parent1} x Parent #{pair.parent2}: rarity {pair.rarity:3d} ({reward})")
+    if not results:
+        return
+    best = results[0]
+    if best.parent1 in BREED_PODS and best.parent2 in BREED_PODS:
+        print(f"\nBreed with PARENT1_ID={best.parent1} PARENT2_ID={best.parent2} BREED_NONCE={nonce}")
+    else:
+        print("\nNo breed.py command: it crosses the pods of one account (PARENT1_ID/PARENT2_ID 1 or 2), "
+              "and these ids are not pod numbers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for GrowPod Empire scripts
+Profiles a whole script run without code changes, with every report split by
+phase. The phases are the ones metrics.phase already times, grouped as:
+compile, build, sign, submit, confirm and decode (state reads). Time outside
+any phase is reported as "run".
+
+Modes:
+    cprofile  Deterministic profile of the main thread, plus every phase on any
+              thread; one <phase>.pstats file per phase (pstats, snakeviz).
+    sample    Stack sampling of all threads every GROWPOD_PROFILE_INTERVAL_MS;
+              one <phase>.folded file of collapsed stacks per phase
+              (flamegraph.pl, speedscope). Low overhead, safe for long runs.
+With GROWPOD_PROFILE_MEMORY=1, tracemalloc records the peak traced memory while
+each phase was active, plus the top allocation sites at that peak
+(memory-<phase>.txt).
+
+Enable by environment (picked up when the script imports metrics):
+    GROWPOD_PROFILE=sample            cprofile | sample
+    GROWPOD_PROFILE_MEMORY=1          Also track memory with tracemalloc
+    GROWPOD_PROFILE_DIR=<dir>         Default: contracts/profiles
+    GROWPOD_PROFILE_INTERVAL_MS=10    Sampling interval
+
+or by CLI, for any script:
+    python contracts/profiling.py [--mode sample] [--memory] [--dir D] deploy.py [args...]
+
+Reports go to <dir>/<YYYYMMDD-HHMMSS>-<script>/ (worker processes add their
+pid), with summary.txt holding the top functions, wall time and memory peak per
+phase.
+"""
+from collections import Counter
+from contextlib import contextmanager
+import argparse
+import atexit
+import cProfile
+import io
+import multiprocessing
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+import tracemalloc
+
+MODES = ("cprofile", "sample")
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+DEFAULT_INTERVAL_MS = 10
+TOP_FUNCTIONS = 15
+TOP_ALLOCATIONS = 25
+TRACE_FRAMES = 1  # Allocation sites by line; deeper traces multiply the overhead
+SNAPSHOT_INTERVAL = 1.0  # Seconds between memory snapshots of one phase
+RUN = "run"  # Tag for time outside any phase
+
+# metrics.phase names -> report tag
+PHASE_TAGS = {
+    "compile": "compile",
+    "suggested_params": "build",
+    "sign": "sign",
+    "send_transaction": "submit",
+    "wait_for_confirmation": "confirm",
+    "read_state": "decode",
+}
+
+
+class Profiler:
+    """One profiling session: per-phase profiles, samples and memory peaks."""
+
+    def __init__(self, mode: str, memory: bool = False, directory: str = DEFAULT_DIR,
+                 interval_ms: float = DEFAULT_INTERVAL_MS, label: str = None):
+        if mode not in MODES:
+            raise ValueError(f"unknown profiling mode {mode!r} (expected one of {', '.join(MODES)})")
+        self.mode = mode
+        self.memory = memory
+        self.directory = directory
+        self.interval = interval_ms / 1000
+        self.label = label or os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+        self.lock = threading.Lock()
+        self.tags = {}  # thread id -> stack of active tags
+        self.profiles = {}  # tag -> [cProfile.Profile] (one per thread that ran it)
+        self.active = {}  # thread id -> stack of enabled profilers
+        self.samples = {}  # tag -> Counter of collapsed stacks
+        self.wall = Counter()  # tag -> seconds inside the phase
+        self.calls = Counter()  # tag -> phase entries
+        self.peaks = {}  # tag -> peak traced bytes while active
+        self.snapshots = {}  # tag -> (taken at, tracemalloc.Snapshot)
+        self.open_sections = 0
+        self.started = None
+        self.stop_event = threading.Event()
+        self.sampler = None
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> "Profiler":
+        self.started = time.time()
+        if self.memory:
+            tracemalloc.start(TRACE_FRAMES)
+        if self.mode == "cprofile":
+            self._enable(threading.get_ident(), RUN)
+        else:
+            self.sampler = threading.Thread(target=self._sample_loop, name="growpod-profiler", daemon=True)
+            self.sampler.start()
+        return self
+
+    def stop(self) -> str:
+        """Stop profiling and write the reports; returns the report directory."""
+        if self.mode == "cprofile":
+            # Profile.disable acts on the calling thread; other threads' phases have ended by now
+            for profile in self.active.get(threading.get_ident(), []):
+                if profile is not None:
+                    profile.disable()
+        else:
+            self.stop_event.set()
+            self.sampler.join()
+        if self.memory:
+            with self.lock:
+                self.snapshots.setdefault(RUN, (time.monotonic(), tracemalloc.take_snapshot()))
+                self.peaks[RUN] = max(self.peaks.get(RUN, 0), tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        return self.write()
+
+    # ---------- phases ----------
+
+    @contextmanager
+    def section(self, tag: str):
+        thread = threading.get_ident()
+        with self.lock:
+            self.tags.setdefault(thread, []).append(tag)
+            if self.memory and not self.open_sections:
+                tracemalloc.reset_peak()
+            self.open_sections += 1
+        if self.mode == "cprofile":
+            self._enable(thread, tag)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.mode == "cprofile":
+                self._disable(thread)
+            with self.lock:
+                self.tags[thread].pop()
+                self.open_sections -= 1
+                self.wall[tag] += elapsed
+                self.calls[tag] += 1
+                if self.memory:
+                    self._record_peak(tag)
+
+    def _record_peak(self, tag: str) -> None:
+        """Keep the phase's highest peak, with a snapshot of the sites behind it (under the lock)."""
+        peak = tracemalloc.get_traced_memory()[1]
+        if peak <= self.peaks.get(tag, 0):
+            return
+        self.peaks[tag] = peak
+        taken = self.snapshots.get(tag)
+        if taken is None or time.monotonic() - taken[0] >= SNAPSHOT_INTERVAL:
+            self.snapshots[tag] = (time.monotonic(), tracemalloc.take_snapshot())
+
+    def _enable(self, thread: int, tag: str) -> None:
+        profile = cProfile.Profile()
+        stack = self.active.setdefault(thread, [])
+        outer = stack[-1] if stack else None
+        if outer is not None:
+            outer.disable()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler owns the interpreter (3.12+ sys.monitoring); skip this phase
+            if outer is not None:
+                outer.enable()
+            stack.append(None)
+            return
+        stack.append(profile)
+        with self.lock:
+            self.profiles.setdefault(tag, []).append(profile)
+
+    def _disable(self, thread: int) -> None:
+        stack = self.active[thread]
+        profile = stack.pop()
+        if profile is not None:
+            profile.disable()
+        if stack and stack[-1] is not None:
+            stack[-1].enable()
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            with self.lock:
+                for thread, frame in frames.items():
+                    if thread == own:
+                        continue
+                    tags = self.tags.get(thread)
+                    tag = tags[-1] if tags else RUN
+                    stack = []
+                    while frame is not None:
+                        code = frame.f_code
+                        stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                        frame = frame.f_back
+                    self.samples.setdefault(tag, Counter())[";".join(reversed(stack))] += 1
+
+    # ---------- reports ----------
+
+    def report_dir(self) -> str:
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        name = f"{stamp}-{self.label}"
+        if multiprocessing.parent_process() is not None:
+            name += f"-{os.getpid()}"
+        return os.path.join(self.directory, name)
+
+    def write(self) -> str:
+        path = self.report_dir()
+        os.makedirs(path, exist_ok=True)
+        lines = [
+            f"GrowPod profile: {self.label} ({self.mode}{', memory' if self.memory else ''})",
+            f"Started {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started))}, "
+            f"{time.time() - self.started:.2f}s, pid {os.getpid()}",
+            "",
+        ]
+        tags = sorted(set(self.profiles) | set(self.samples) | set(self.wall) | set(self.peaks))
+        for tag in tags:
+            lines.append(f"== {tag} ==")
+            if tag in self.wall:
+                lines.append(f"wall {self.wall[tag]:.3f}s over {self.calls[tag]:,} call(s)")
+            if tag in self.peaks:
+                lines.append(f"peak traced memory {self.peaks[tag] / 2**20:.2f} MiB")
+            if self.profiles.get(tag):
+                stats = pstats.Stats(*self.profiles[tag], stream=io.StringIO())
+                stats.dump_stats(os.path.join(path, f"{tag}.pstats"))
+                out = io.StringIO()
+                stats.stream = out
+                stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+                lines.extend(line for line in out.getvalue().splitlines() if line.strip())
+            if self.samples.get(tag):
+                counts = self.samples[tag]
+                with open(os.path.join(path, f"{tag}.folded"), 'w') as f:
+                    for stack, n in counts.most_common():
+                        f.write(f"{stack} {n}\n")
+                total = sum(counts.values())
+                leaves = Counter()
+                for stack, n in counts.items():
+                    leaves[stack.rsplit(";", 1)[-1]] += n
+                lines.append(f"{total:,} samples ({total * self.interval:.2f}s of thread time)")
+                for leaf, n in leaves.most_common(TOP_FUNCTIONS):
+                    lines.append(f"  {n / total:6.1%}  {leaf}")
+            if tag in self.snapshots:
+                top = self.snapshots[tag][1].statistics("lineno")[:TOP_ALLOCATIONS]
+                with open(os.path.join(path, f"memory-{tag}.txt"), 'w') as f:
+                    f.write("\n".join(str(stat) for stat in top) + "\n")
+            lines.append("")
+        with open(os.path.join(path, "summary.txt"), 'w') as f:
+            f.write("\n".join(lines))
+        return path
+
+
+profiler = None
+
+
+@contextmanager
+def section(phase_name: str):
+    """Attribute the enclosed work to a phase (no-op unless profiling is on)."""
+    if profiler is None:
+        yield
+        return
+    with profiler.section(PHASE_TAGS.get(phase_name, phase_name)):
+        yield
+
+
+def start(mode: str, memory: bool = False, directory: str = DEFAULT_DIR,
+          interval_ms: float = DEFAULT_INTERVAL_MS, label: str = None) -> Profiler:
+    """Start the process-wide profiler; reports are written at exit."""
+    global profiler
+    if profiler is None:
+        profiler = Profiler(mode, memory, directory, interval_ms, label).start()
+        atexit.register(_finish)
+    return profiler
+
+
+def _finish() -> None:
+    global profiler
+    if profiler is not None:
+        current, profiler = profiler, None
+        path = current.stop()
+        print(f"Profile written to {path}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a GrowPod script under the profiler.")
+    parser.add_argument("--mode", choices=MODES, default=os.getenv("GROWPOD_PROFILE") or "cprofile")
+    parser.add_argument("--memory", action="store_true", default=os.getenv("GROWPOD_PROFILE_MEMORY") == "1")
+    parser.add_argument("--dir", default=os.getenv("GROWPOD_PROFILE_DIR", DEFAULT_DIR))
+    parser.add_argument("--interval-ms", type=float,
+                        default=float(os.getenv("GROWPOD_PROFILE_INTERVAL_MS", str(DEFAULT_INTERVAL_MS))))
+    parser.add_argument("script", help="Script to run, e.g. contracts/deploy.py")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="Arguments for the script")
+    options = parser.parse_args()
+
+    if not os.path.exists(options.script):
+        print(f"ERROR: {options.script} not found.")
+        sys.exit(1)
+
+    # Run as the script would: its directory first on the path, its own argv
+    sys.path[0] = os.path.dirname(os.path.abspath(options.script))
+    sys.argv = [options.script] + options.args
+    # Worker processes the script spawns pick the settings up from the environment
+    os.environ.update({
+        "GROWPOD_PROFILE": options.mode,
+        "GROWPOD_PROFILE_MEMORY": "1" if options.memory else "0",
+        "GROWPOD_PROFILE_DIR": options.dir,
+        "GROWPOD_PROFILE_INTERVAL_MS": str(options.interval_ms),
+    })
+    # `import profiling` from metrics must find this module, not load a second copy
+    sys.modules.setdefault("profiling", sys.modules[__name__])
+    start(options.mode, options.memory, options.dir, options.interval_ms)
+    runpy.run_path(options.script, run_name="__main__")
+
+
+if os.getenv("GROWPOD_PROFILE") and __name__ != "__main__":
+    start(
+        os.getenv("GROWPOD_PROFILE"),
+        os.getenv("GROWPOD_PROFILE_MEMORY") == "1",
+        os.getenv("GROWPOD_PROFILE_DIR", DEFAULT_DIR),
+        float(os.getenv("GROWPOD_PROFILE_INTERVAL_MS", str(DEFAULT_INTERVAL_MS))),
+    )
+
+
+if __name__ == "__main__":
+    main()
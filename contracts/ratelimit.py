@@ -0,0 +1,193 @@
+"""
+Adaptive rate limiting for GrowPod Empire
+Client-side throttling of algod requests, with separate budgets for reads
+(account_info, pending info, params, ...) and writes (send_transaction[s]).
+
+Each budget combines:
+- a token bucket capping the request rate (ALGOD_READ_RATE / ALGOD_WRITE_RATE
+  requests per second, 0 for no cap), and
+- AIMD control of requests in flight: the limit grows by one per limit's worth
+  of healthy responses and is halved on a congestion signal (429, 5xx,
+  connection reset/timeout, or latency far above the best seen). Only requests
+  issued after the last decrease can trigger another, so one burst of 429s
+  halves the limit once.
+
+Wrap a client with `limited(client)`; the proxy is a drop-in AlgodClient, so
+submit.py's retries and the fleet tools go through it unchanged. The settled
+in-flight limit and the sustained rate are reported by `Limiter.report`.
+"""
+from algosdk.error import AlgodHTTPError
+from collections import deque
+from contextlib import contextmanager
+from urllib.error import URLError
+import os
+import threading
+import time
+
+READ_RATE = float(os.getenv("ALGOD_READ_RATE", "0"))
+WRITE_RATE = float(os.getenv("ALGOD_WRITE_RATE", "0"))
+
+INITIAL_LIMIT = 4  # Requests in flight before any feedback
+MAX_LIMIT = 256
+MIN_LIMIT = 1
+BACKOFF = 0.5  # Multiplicative decrease
+LATENCY_FACTOR = 4  # Latency above this many times the best seen is congestion...
+LATENCY_FLOOR = 0.25  # ...once it is also above this many seconds
+RATE_WINDOW = 10.0  # Seconds of completions the sustained rate is measured over
+
+WRITE_METHODS = frozenset({"send_transaction", "send_transactions", "send_raw_transaction"})
+# Long polls hold a request open on purpose; they bypass the budgets
+LONG_POLLS = frozenset({"status_after_block"})
+CONGESTION_CODES = (429, 500, 502, 503, 504)
+
+
+def is_congestion(err: Exception) -> bool:
+    """Errors that mean the endpoint is overloaded (not a rejected transaction)."""
+    if isinstance(err, AlgodHTTPError):
+        return err.code in CONGESTION_CODES
+    return isinstance(err, (URLError, TimeoutError, ConnectionError))
+
+
+class Budget:
+    """Token bucket plus AIMD in-flight limit for one class of requests."""
+
+    def __init__(self, name: str, rate: float = 0, burst: float = None,
+                 initial: int = INITIAL_LIMIT, max_limit: int = MAX_LIMIT):
+        self.name = name
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.limit = float(initial)
+        self.max_limit = max_limit
+        self.inflight = 0
+        self.issued = 0  # Sequence number of the last admitted request
+        self.decreased_at = 0  # Sequence number when the limit was last cut
+        self.best_latency = None
+        self.completions = deque()
+        self.requests = 0
+        self.congestion = 0
+        self.cond = threading.Condition()
+
+    def _reserve_token(self) -> float:
+        """Take a token (under the lock); seconds until it is actually available."""
+        if not self.rate:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    def acquire(self) -> int:
+        """Wait for an in-flight slot and a token; returns the request's ticket."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+            self.issued += 1
+            ticket = self.issued
+            wait = self._reserve_token()
+        if wait:
+            time.sleep(wait)
+        return ticket
+
+    def release(self, ticket: int, latency: float, congested: bool) -> None:
+        """Return the slot and adjust the limit from the response."""
+        with self.cond:
+            self.inflight -= 1
+            self.requests += 1
+            if not congested:
+                if self.best_latency is None or latency < self.best_latency:
+                    self.best_latency = latency
+                congested = latency > max(LATENCY_FLOOR, self.best_latency * LATENCY_FACTOR)
+            if congested:
+                self.congestion += 1
+                if ticket > self.decreased_at:
+                    self.limit = max(MIN_LIMIT, self.limit * BACKOFF)
+                    self.decreased_at = self.issued
+            else:
+                now = time.monotonic()
+                self.completions.append(now)
+                while self.completions and now - self.completions[0] > RATE_WINDOW:
+                    self.completions.popleft()
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.cond.notify_all()
+
+    @contextmanager
+    def request(self):
+        """Hold one admitted request for the duration of the block."""
+        ticket = self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.release(ticket, time.perf_counter() - start, is_congestion(e))
+            raise
+        self.release(ticket, time.perf_counter() - start, False)
+
+    def sustained_rate(self) -> float:
+        """Successful requests per second over the last RATE_WINDOW seconds."""
+        with self.cond:
+            if len(self.completions) < 2:
+                return 0.0
+            span = max(self.completions[-1] - self.completions[0], 1e-6)
+            return (len(self.completions) - 1) / span
+
+    def report(self) -> dict:
+        rate = self.sustained_rate()
+        with self.cond:
+            return {
+                "limit": int(self.limit),
+                "sustained_rate": round(rate, 1),
+                "requests": self.requests,
+                "congestion": self.congestion,
+            }
+
+
+class Limiter:
+    """Read and write budgets for one algod endpoint."""
+
+    def __init__(self, read_rate: float = READ_RATE, write_rate: float = WRITE_RATE):
+        self.read = Budget("read", read_rate)
+        self.write = Budget("write", write_rate)
+
+    def budget_for(self, method: str):
+        if method in LONG_POLLS:
+            return None
+        return self.write if method in WRITE_METHODS else self.read
+
+    def report(self) -> dict:
+        """Settled in-flight limit and sustained rate per budget."""
+        return {"read": self.read.report(), "write": self.write.report()}
+
+    def summary(self) -> str:
+        """One line per budget for script output."""
+        return "\n".join(
+            f"  {name.capitalize()}s: {r['sustained_rate']:,.1f} req/s sustained, "
+            f"{r['limit']} in flight, {r['congestion']} congestion signal(s)"
+            for name, r in self.report().items()
+        )
+
+
+class LimitedClient:
+    """AlgodClient proxy that routes every request through a Limiter."""
+
+    def __init__(self, algod_client, limiter: Limiter = None):
+        self.client = algod_client
+        self.limiter = limiter or Limiter()
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        budget = self.limiter.budget_for(name)
+        if not callable(attr) or budget is None:
+            return attr
+
+        def call(*args, **kwargs):
+            with budget.request():
+                return attr(*args, **kwargs)
+        return call
+
+
+def limited(algod_client, limiter: Limiter = None) -> LimitedClient:
+    """Wrap an AlgodClient with client-side rate limiting."""
+    return LimitedClient(algod_client, limiter)
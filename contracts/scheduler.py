@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Fleet scheduler for GrowPod Empire
+Long-running loop that waters, feeds, harvests and cleans up each pod as soon
+as it becomes eligible, driven by a per-pod table instead of re-reading every
+account on every pass.
+
+The table lives in a fixed-width binary file (SCHEDULE_FILE):
+    header (64 bytes) | account public keys (32 bytes each) | pod records (80 bytes each)
+It is memory-mapped copy-on-write at start, so a restart costs milliseconds and
+no RPCs whatever the fleet size. Checkpoints write a complete new file and
+rename it over the old one, so a crash leaves the previous or the new
+checkpoint, never a torn one.
+
+Only fleet accounts are planned, and cleanups only while the account's last
+read $BUD balance covers them. Only accounts that were just acted on (or never
+seen) are read back. A
+background reconcile pass re-reads the whole fleet at RECONCILE_RATE accounts
+per second and corrects any drift from chain state (e.g. calls made by other
+tools).
+"""
+from algosdk import encoding
+from appconfig import resolve
+from concurrent.futures import ThreadPoolExecutor
+from fleet import PODS, PodCall, chain_time, execute_plans
+from metrics import phase
+from model import CLEANUP_BURN, NUTRIENT_COOLDOWN, WATER_COOLDOWN, pod_key
+from multinode import connect
+from ratelimit import limited
+from slots import load_fleet
+from statecodec import LocalState, read_account
+from submit import call_with_retry
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = limited(connect(ALGOD_ADDRESS, ALGOD_TOKEN))  # Throttled: fleet-sized bursts
+
+SCHEDULE_PATH = os.getenv(
+    "SCHEDULE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".growpod_schedule.bin")
+)
+
+MAGIC = b"GPSCHED2"
+HEADER = np.dtype([
+    ("magic", "S8"),
+    ("accounts", "<u4"),
+    ("pods", "<u4"),
+    ("checkpointed_at", "<u8"),  # Unix time of the checkpoint
+    ("round", "<u8"),  # Latest round the table reflects
+    ("reserved", "u1", (32,)),
+])  # 64 bytes
+RECORD = np.dtype([
+    ("account", "<u4"),  # Index into the account key table
+    ("pod", "u1"),
+    ("stage", "u1"),
+    ("water_count", "u1"),
+    ("nutrient_count", "u1"),
+    ("last_watered", "<u8"),
+    ("last_nutrients", "<u8"),
+    ("next_action", "<u8"),  # Unix time the pod next needs a call (NEVER if idle)
+    ("synced_round", "<u8"),  # Round of the last chain read (0 = never read)
+    ("dna", "u1", (32,)),  # Leases cleanups to the growth cycle
+    ("bud", "<u8"),  # $BUD units the account held at the last read (same in each of its pods)
+])  # 80 bytes
+NEVER = np.iinfo(np.uint64).max
+
+BATCH_ACCOUNTS = 2_000  # Accounts acted on per tick
+RETRY_DELAY = 600  # Seconds before retrying an account whose group failed
+THREADS = 16
+
+
+def next_action_times(records: np.ndarray) -> np.ndarray:
+    """
+    When each pod next needs a call: cooldown end while growing, now if ready or
+    harvested (a harvested pod only once its account can pay for the cleanup).
+    """
+    stage = records["stage"]
+    water_at = np.where(records["last_watered"] > 0, records["last_watered"] + WATER_COOLDOWN, 0)
+    feed_at = np.where(records["last_nutrients"] > 0, records["last_nutrients"] + NUTRIENT_COOLDOWN, 0)
+    growing = (stage >= 1) & (stage <= 4)
+    finished = (stage == 5) | ((stage == 6) & (records["bud"] >= CLEANUP_BURN))
+    return np.where(growing, np.minimum(water_at, feed_at), np.where(finished, 0, NEVER)).astype(np.uint64)
+
+
+class PodTable:
+    """Per-pod schedule backed by a fixed-width file."""
+
+    def __init__(self, keys: np.ndarray, records: np.ndarray, round_num: int = 0):
+        self.keys = keys  # (accounts, 32) uint8
+        self.records = records  # RECORD array, PODS per account in account order
+        self.round = round_num
+        self.lock = threading.RLock()
+        self._index = None
+
+    @classmethod
+    def create(cls, addresses: list) -> "PodTable":
+        """Empty table for the given accounts (every pod unsynced)."""
+        table = cls(np.zeros((0, 32), dtype=np.uint8), np.zeros(0, dtype=RECORD))
+        table.add_accounts(addresses)
+        return table
+
+    @classmethod
+    def load(cls, path: str) -> "PodTable":
+        """Map a checkpoint copy-on-write; pages are read lazily as they are touched."""
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if len(header) != 1 or header["magic"][0] != MAGIC:
+            raise ValueError(f"{path} is not a schedule checkpoint")
+        accounts, pods = int(header["accounts"][0]), int(header["pods"][0])
+        expected = HEADER.itemsize + accounts * 32 + pods * RECORD.itemsize
+        if os.path.getsize(path) != expected:
+            raise ValueError(f"{path} is truncated ({os.path.getsize(path)} of {expected} bytes)")
+        keys = np.memmap(path, dtype=np.uint8, mode='c', offset=HEADER.itemsize, shape=(accounts, 32))
+        records = np.memmap(path, dtype=RECORD, mode='c', offset=HEADER.itemsize + accounts * 32, shape=(pods,))
+        return cls(keys, records, int(header["round"][0]))
+
+    def checkpoint(self, path: str) -> None:
+        """Atomically replace the checkpoint file with the current table."""
+        header = np.zeros(1, dtype=HEADER)
+        tmp_path = f"{path}.tmp"
+        with self.lock:
+            header["magic"], header["accounts"], header["pods"] = MAGIC, len(self.keys), len(self.records)
+            header["checkpointed_at"], header["round"] = int(time.time()), self.round
+            with open(tmp_path, 'wb') as f:
+                f.write(header.tobytes())
+                f.write(np.ascontiguousarray(self.keys).tobytes())
+                f.write(np.ascontiguousarray(self.records).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    # ---------- accounts ----------
+
+    def address(self, account: int) -> str:
+        return encoding.encode_address(bytes(self.keys[account]))
+
+    def index(self, address: str) -> int:
+        """Account index of an address (KeyError if not in the table)."""
+        with self.lock:
+            if self._index is None:
+                self._index = {bytes(key): i for i, key in enumerate(self.keys)}
+            return self._index[encoding.decode_address(address)]
+
+    def indices(self, addresses: list) -> np.ndarray:
+        """Account indices of addresses (KeyError if one is not in the table)."""
+        return np.array([self.index(address) for address in addresses], dtype=np.uint32)
+
+    def add_accounts(self, addresses: list) -> int:
+        """Append accounts not yet in the table; returns how many were added."""
+        with self.lock:
+            known = {bytes(key) for key in self.keys}
+            new = list(dict.fromkeys(key for key in map(encoding.decode_address, addresses) if key not in known))
+            if not new:
+                return 0
+            start = len(self.keys)
+            keys = np.frombuffer(b"".join(new), dtype=np.uint8).reshape(-1, 32)
+            records = np.zeros(len(new) * len(PODS), dtype=RECORD)
+            records["account"] = np.repeat(np.arange(start, start + len(new), dtype=np.uint32), len(PODS))
+            records["pod"] = np.tile(np.array(PODS, dtype=np.uint8), len(new))
+            records["next_action"] = NEVER
+            self.keys = np.concatenate([self.keys, keys])
+            self.records = np.concatenate([self.records, records])
+            self._index = None
+            return len(new)
+
+    def rows(self, account: int) -> range:
+        return range(account * len(PODS), (account + 1) * len(PODS))
+
+    # ---------- state ----------
+
+    def sync(self, account: int, state, round_num: int, bud: int = 0) -> int:
+        """
+        Overwrite an account's pods from its decoded local state (dict or LocalState)
+        and $BUD balance.
+
+        Returns:
+            int: Pods whose stored state differed (drift)
+        """
+        drift = 0
+        with self.lock:
+            for row in self.rows(account):
+                record = self.records[row]
+                pod = int(record["pod"])
+
+                def field(name):
+                    return state.get(pod_key(name, pod), 0)
+
+                synced = (field("stage"), field("water_count"), field("nutrient_count"),
+                          field("last_watered"), field("last_nutrients"))
+                stored = (int(record["stage"]), int(record["water_count"]), int(record["nutrient_count"]),
+                          int(record["last_watered"]), int(record["last_nutrients"]))
+                if record["synced_round"] and synced != stored:
+                    drift += 1
+                (record["stage"], record["water_count"], record["nutrient_count"],
+                 record["last_watered"], record["last_nutrients"]) = synced
+                dna = state.get(pod_key("dna", pod), b"") or b""
+                record["dna"] = np.frombuffer(dna.ljust(32, b"\0")[:32], dtype=np.uint8)
+                record["bud"] = bud
+                record["synced_round"] = max(round_num, 1)
+            rows = self.rows(account)
+            self.records["next_action"][rows.start:rows.stop] = next_action_times(self.records[rows.start:rows.stop])
+            self.round = max(self.round, round_num)
+        return drift
+
+    def defer(self, account: int, until: int) -> None:
+        with self.lock:
+            rows = self.rows(account)
+            self.records["next_action"][rows.start:rows.stop] = np.maximum(
+                self.records["next_action"][rows.start:rows.stop], until
+            )
+
+    def unsynced(self, limit: int) -> list:
+        """Accounts never read from chain."""
+        with self.lock:
+            rows = np.flatnonzero(self.records["synced_round"] == 0)
+            return list(dict.fromkeys(self.records["account"][rows].tolist()))[:limit]
+
+    def due(self, now: int, limit: int, accounts: np.ndarray = None) -> dict:
+        """
+        Calls due at `now`, soonest first.
+
+        Args:
+            now: Chain time
+            limit: Most accounts to plan
+            accounts: Account indices that may be planned (those we hold keys for);
+                      applied before `limit`, so other accounts never take a slot
+
+        Returns:
+            dict: account index -> PodCall list in group order
+        """
+        with self.lock:
+            selected = (self.records["next_action"] <= now) & (self.records["synced_round"] > 0)
+            if accounts is not None:
+                selected &= np.isin(self.records["account"], accounts)
+            rows = np.flatnonzero(selected)
+            rows = rows[np.argsort(self.records["next_action"][rows], kind='stable')]
+            # Keep the `limit` accounts with the most overdue pods
+            accounts = self.records["account"][rows]
+            _, first = np.unique(accounts, return_index=True)
+            chosen = accounts[np.sort(first)[:limit]]
+            due_rows = self.records[rows[np.isin(accounts, chosen)]]
+        plans = {}
+        bud = {}  # $BUD left per account after the cleanups planned so far
+        for record in due_rows:
+            account = int(record["account"])
+            calls = plans.setdefault(account, [])
+            bud.setdefault(account, int(record["bud"]))
+            pod, stage, cycle = int(record["pod"]), int(record["stage"]), bytes(record["dna"]).rstrip(b"\0")
+
+            def add(operation):
+                calls.append(PodCall(pod_key(operation, pod), operation, pod, cycle))
+
+            if 1 <= stage <= 4:
+                last_fed, last_watered = int(record["last_nutrients"]), int(record["last_watered"])
+                if last_fed == 0 or now - last_fed >= NUTRIENT_COOLDOWN:
+                    add("nutrients")  # Before water, which may end the growing stages
+                if last_watered == 0 or now - last_watered >= WATER_COOLDOWN:
+                    add("water")
+            elif stage == 5:
+                add("harvest")
+            elif stage == 6 and bud[account] >= CLEANUP_BURN:
+                bud[account] -= CLEANUP_BURN
+                add("cleanup")
+        return {account: calls for account, calls in plans.items() if calls}
+
+    def next_due(self) -> int:
+        """Earliest next_action of any synced pod (NEVER if none)."""
+        with self.lock:
+            synced = self.records["next_action"][self.records["synced_round"] > 0]
+            return int(synced.min()) if len(synced) else int(NEVER)
+
+
+def read_states(client, pool: ThreadPoolExecutor, addresses: list, config) -> list:
+    """Typed account state (local state and $BUD holding) per address, one msgpack read each."""
+    return list(pool.map(
+        lambda address: call_with_retry(read_account, client, address, config.app_id, (config.bud_asset,)),
+        addresses
+    ))
+
+
+def sync_accounts(table: PodTable, client, pool: ThreadPoolExecutor, accounts: list, config) -> int:
+    """Re-read accounts from chain into the table; returns the drift found."""
+    if not accounts:
+        return 0
+    round_num = call_with_retry(client.status)['last-round']
+    with phase("scheduler", "read_state"):
+        states = read_states(client, pool, [table.address(a) for a in accounts], config)
+    return sum(
+        table.sync(account, state.local or LocalState(), round_num, max(state.holdings[0], 0))
+        for account, state in zip(accounts, states)
+    )
+
+
+def tick(table: PodTable, fleet: dict, config, client, pool: ThreadPoolExecutor,
+         batch: int = BATCH_ACCOUNTS, members: np.ndarray = None) -> dict:
+    """
+    Act on every due pod of accounts we hold keys for, then re-read those accounts.
+
+    Args:
+        members: table.indices(list(fleet)), if already computed
+
+    Returns:
+        dict: address -> "ok" or the failure reason
+    """
+    if members is None:
+        members = table.indices(list(fleet))
+    sync_accounts(table, client, pool, table.unsynced(batch), config)
+    now = chain_time(client)
+    due = table.due(now, batch, members)
+    plans = {table.address(account): calls for account, calls in due.items()}
+    results, _ = execute_plans(client, pool, plans, fleet, config)
+
+    sync_accounts(table, client, pool, list(due), config)
+    for account in due:
+        if results.get(table.address(account)) != "ok":
+            table.defer(account, now + RETRY_DELAY)
+    return results
+
+
+class Reconciler(threading.Thread):
+    """Background pass re-reading every account at a fixed rate to catch drift."""
+
+    def __init__(self, table: PodTable, client, config, rate: float, stop: threading.Event):
+        super().__init__(daemon=True)
+        self.table = table
+        self.client = client
+        self.config = config
+        self.interval = 1 / rate if rate > 0 else 0
+        self.stop = stop
+        self.cursor = 0
+        self.checked = 0
+        self.drift = 0
+
+    def run(self):
+        if not self.interval:
+            return
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            while not self.stop.wait(self.interval):
+                accounts = len(self.table.keys)
+                if not accounts:
+                    continue
+                self.cursor %= accounts
+                try:
+                    self.drift += sync_accounts(self.table, self.client, pool, [self.cursor], self.config)
+                    self.checked += 1
+                except Exception:
+                    pass  # Best effort; the next pass retries
+                self.cursor += 1
+
+
+def main():
+    fleet_path = os.getenv("FLEET_FILE")
+    app_id = os.getenv("GROWPOD_APP_ID")
+
+    if not all([fleet_path, app_id]):
+        print("ERROR: Required environment variables not set:")
+        print("  FLEET_FILE - One account mnemonic per line")
+        print("  GROWPOD_APP_ID - Contract application ID")
+        sys.exit(1)
+
+    config = resolve(algod_client, int(app_id))
+    interval = float(os.getenv("SCHEDULE_INTERVAL", "30"))
+    reconcile_rate = float(os.getenv("RECONCILE_RATE", "5"))
+
+    print("=" * 50)
+    print("GrowPod Empire - Fleet Scheduler")
+    print("=" * 50)
+
+    fleet = load_fleet(fleet_path)
+    start = time.perf_counter()
+    table = None
+    if os.path.exists(SCHEDULE_PATH):
+        try:
+            table = PodTable.load(SCHEDULE_PATH)
+            print(f"Loaded {len(table.records):,} pods in {(time.perf_counter() - start) * 1000:.1f} ms "
+                  f"(round {table.round})")
+        except ValueError as e:
+            # Older format or damaged: the table only caches chain state, so rebuild it
+            print(f"Ignoring checkpoint: {e}")
+    if table is None:
+        table = PodTable.create([])
+        print(f"New schedule: {SCHEDULE_PATH}")
+    added = table.add_accounts(list(fleet))
+    if added:
+        print(f"Added {added} account(s); they are read on the first tick")
+    members = table.indices(list(fleet))
+
+    stop = threading.Event()
+    reconciler = Reconciler(table, algod_client, config, reconcile_rate, stop)
+    reconciler.start()
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            while True:
+                results = tick(table, fleet, config, algod_client, pool, members=members)
+                table.checkpoint(SCHEDULE_PATH)
+                if results:
+                    ok = sum(1 for outcome in results.values() if outcome == "ok")
+                    print(f"Round {table.round}: {ok}/{len(results)} account(s) acted on, "
+                          f"reconciled {reconciler.checked} (drift {reconciler.drift})")
+                wait = min(interval, max(1.0, table.next_due() - time.time()))
+                if stop.wait(wait):
+                    break
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        stop.set()
+        table.checkpoint(SCHEDULE_PATH)
+        print(f"Checkpoint written: {SCHEDULE_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Discrete-event fleet simulator for GrowPod Empire
+Replays a scheduling policy against N accounts on a virtual clock, so days of
+600-second cooldowns and full grow cycles run in seconds of wall time.
+
+Every call goes through model.apply_call, so stage progression, cooldowns and
+rejections are exactly the contract's. The clock models the node as well:
+- a group reaches the node after the network latency and is applied in the
+  next block, with that block's timestamp;
+- rounds close every round_time seconds;
+- the client learns the outcome one latency after the block, and only then
+  sees the new state.
+
+A policy is a callable `policy(view, now) -> (methods, wake_at)`:
+    view: AccountView of the client's last confirmed state
+    now: Virtual time in seconds
+    methods: On-chain method names to submit as one group (may be empty)
+    wake_at: When to ask again, or None to ask when the group confirms
+
+The report covers pod utilisation (share of pod time spent growing), $BUD
+harvested per day, $BUD burned, transactions by method and ALGO spent.
+"""
+from algosdk import encoding
+from model import (
+    CLEANUP_BURN, INNER_TXN_COUNTS, NUTRIENT_COOLDOWN, WATER_COOLDOWN, CallContext, ContractReject, apply_call,
+    initial_global_state, initial_local_state, pod_key,
+)
+from typing import NamedTuple
+import hashlib
+import heapq
+import importlib
+import json
+import os
+import random
+import sys
+import time
+
+PODS = (1, 2)  # Pods the router can address (pod 1 methods and their _2 variants)
+OPERATIONS = ("mint_pod", "nutrients", "water", "harvest", "cleanup")
+SIM_APP_ID = 1
+SIM_BUD_ASSET = 2
+
+DEFAULT_ACCOUNTS = 100
+DEFAULT_DAYS = 10  # One GROWTH_CYCLE
+DEFAULT_ROUND_TIME = 2.8
+DEFAULT_LATENCY_MS = 50
+DEFAULT_POLL_INTERVAL = 60
+
+# $BUD units each simulated account starts with (20 cleanups)
+START_BUD = 10_000_000_000
+MIN_FEE = 1_000
+CLEANUP_ALGO_FEE = 1_000_000  # Payment to the app in a cleanup group
+DAY = 86_400
+
+
+class AccountView(NamedTuple):
+    address: str
+    local: dict  # Local state as of the last confirmation
+    bud: int  # $BUD balance as of the last confirmation
+    pods: tuple  # Pods this account may use (bounded by pod_slots)
+
+
+def due_calls(view: AccountView, now: float, operations: tuple = OPERATIONS) -> tuple:
+    """
+    Calls due for one account, in group order, and when the next one falls due.
+
+    Nutrients go before water, which may advance the pod to stage 5. Cleanups
+    are planned only while the account holds 500 $BUD for each; an emptied pod
+    is replanted with mint_pod.
+
+    Returns:
+        tuple: (method names, earliest time a cooldown-blocked call is due, or None)
+    """
+    methods, next_due, bud = [], None, view.bud
+    for pod in view.pods:
+        def field(name):
+            return view.local.get(pod_key(name, pod), 0)
+
+        stage = field("stage")
+        if stage == 0 and "mint_pod" in operations:
+            methods.append(pod_key("mint_pod", pod))
+        elif 1 <= stage <= 4:
+            for operation, last, cooldown in (
+                ("nutrients", field("last_nutrients"), NUTRIENT_COOLDOWN),
+                ("water", field("last_watered"), WATER_COOLDOWN),
+            ):
+                if operation not in operations:
+                    continue
+                if last == 0 or now - last >= cooldown:
+                    methods.append(pod_key(operation, pod))
+                elif next_due is None or last + cooldown < next_due:
+                    next_due = last + cooldown
+        elif stage == 5 and "harvest" in operations:
+            methods.append(pod_key("harvest", pod))
+        elif stage == 6 and "cleanup" in operations and bud >= CLEANUP_BURN:
+            bud -= CLEANUP_BURN
+            methods.append(pod_key("cleanup", pod))
+    return methods, next_due
+
+
+def greedy(view: AccountView, now: float) -> tuple:
+    """Submit every due call the moment its cooldown ends."""
+    methods, next_due = due_calls(view, now)
+    return methods, None if methods else next_due
+
+
+def water_only(view: AccountView, now: float) -> tuple:
+    """Greedy, but never feeds nutrients (smaller harvests, fewer transactions)."""
+    methods, next_due = due_calls(view, now, tuple(op for op in OPERATIONS if op != "nutrients"))
+    return methods, None if methods else next_due
+
+
+def polling(interval: float = DEFAULT_POLL_INTERVAL):
+    """Policy that checks each account every `interval` seconds, like a cron'd fleet run."""
+    def policy(view: AccountView, now: float) -> tuple:
+        methods, _ = due_calls(view, now)
+        return methods, now + interval
+    policy.__name__ = f"polling({interval:g}s)"
+    return policy
+
+
+POLICIES = {"greedy": greedy, "water_only": water_only, "polling": polling}
+
+
+def resolve_policy(name: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+    """A built-in policy by name, or any callable given as "module:function"."""
+    if name == "polling":
+        return polling(poll_interval)
+    if name in POLICIES:
+        return POLICIES[name]
+    if ":" in name:
+        module_name, attr = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), attr)
+    raise ValueError(f"unknown policy {name!r}")
+
+
+def sim_address(index: int) -> str:
+    """Deterministic address for simulated account `index`."""
+    return encoding.encode_address(hashlib.sha256(b"growpod-sim" + index.to_bytes(4, "big")).digest())
+
+
+class Simulation:
+    """N accounts, one app, one node, and a heap of timestamped events."""
+
+    def __init__(self, accounts: int, policy, pod_slots: int = 2, round_time: float = DEFAULT_ROUND_TIME,
+                 latency: float = DEFAULT_LATENCY_MS / 1000, jitter: float = 0.0, start_bud: int = START_BUD,
+                 seed: int = 0):
+        self.policy = policy
+        self.round_time = round_time
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.app_address = encoding.encode_address(hashlib.sha256(b"appID" + SIM_APP_ID.to_bytes(8, "big")).digest())
+        self.glob = initial_global_state(sim_address(0))
+        self.glob["bud_asset"] = SIM_BUD_ASSET
+        self.pods = PODS[:max(1, min(pod_slots, len(PODS)))]
+
+        self.addresses = [sim_address(i + 1) for i in range(accounts)]
+        self.local = []  # Chain state per account
+        for _ in range(accounts):
+            local = initial_local_state()
+            local["pod_slots"] = pod_slots
+            self.local.append(local)
+        self.bud = [start_bud] * accounts
+        self.views = [AccountView(a, dict(l), start_bud, self.pods) for a, l in zip(self.addresses, self.local)]
+        self.in_flight = [False] * accounts
+        self.ask_on_confirm = [False] * accounts
+
+        self.events = []  # (time, seq, kind, payload)
+        self.seq = 0
+        self.blocks = {}  # round -> [(account, methods)]
+
+        # Time each pod has spent in each stage, closed off at every stage change
+        self.stage_since = [{pod: 0.0 for pod in self.pods} for _ in range(accounts)]
+        self.stage_time = {stage: 0.0 for stage in range(7)}
+        self.txns = {}  # method (without _2) -> transactions
+        self.groups = 0
+        self.failures = {}  # reject reason -> groups
+        self.bud_harvested = 0
+        self.bud_burned = 0
+        self.fees = 0  # microAlgos, including the cleanup payments
+        self.processed = 0
+
+    def push(self, at: float, kind: str, payload) -> None:
+        self.seq += 1
+        heapq.heappush(self.events, (at, self.seq, kind, payload))
+
+    def one_way(self) -> float:
+        return self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def decide(self, account: int, now: float) -> None:
+        if self.in_flight[account]:
+            self.ask_on_confirm[account] = True
+            return
+        methods, wake_at = self.policy(self.views[account], now)
+        if methods:
+            # Included in the first block that closes after the group reaches the node
+            round_number = int((now + self.one_way()) // self.round_time) + 1
+            if round_number not in self.blocks:
+                self.blocks[round_number] = []
+                self.push(round_number * self.round_time, "block", round_number)
+            self.blocks[round_number].append((account, tuple(methods)))
+            self.in_flight[account] = True
+            self.ask_on_confirm[account] = wake_at is None
+        if wake_at is not None:
+            self.push(max(wake_at, now), "decide", account)
+
+    def apply_group(self, account: int, methods: tuple, round_number: int, timestamp: int) -> str:
+        """Apply one group atomically; returns "ok" or the reject reason."""
+        local, bud = dict(self.local[account]), self.bud[account]
+        address = self.addresses[account]
+        harvested = burned = fees = 0
+        for method in methods:
+            base = method[:-2] if method.endswith("_2") else method
+            prev_txn = None
+            if base == "cleanup":
+                if bud < CLEANUP_BURN:
+                    return "overspend"
+                prev_txn = {'type': 'axfer', 'xaid': SIM_BUD_ASSET, 'aamt': CLEANUP_BURN, 'arcv': self.app_address}
+                bud -= CLEANUP_BURN
+                burned += CLEANUP_BURN
+                fees += CLEANUP_ALGO_FEE + 2 * MIN_FEE
+            ctx = CallContext(address, (method.encode(),), timestamp, round_number, self.app_address, prev_txn)
+            try:
+                result = apply_call(local, self.glob, ctx)
+            except ContractReject as e:
+                return str(e)
+            for inner in result.inner_txns:
+                if inner.get('xaid') == SIM_BUD_ASSET and inner.get('arcv') == address:
+                    bud += inner['aamt']
+                    harvested += inner['aamt']
+            fees += MIN_FEE * (1 + INNER_TXN_COUNTS.get(method, 0))
+
+        for pod in self.pods:
+            old, new = self.local[account][pod_key("stage", pod)], local[pod_key("stage", pod)]
+            if old != new:
+                self.stage_time[old] += timestamp - self.stage_since[account][pod]
+                self.stage_since[account][pod] = timestamp
+        self.local[account], self.bud[account] = local, bud
+        self.bud_harvested += harvested
+        self.bud_burned += burned
+        self.fees += fees
+        self.groups += 1
+        for method in methods:
+            base = method[:-2] if method.endswith("_2") else method
+            self.txns[base] = self.txns.get(base, 0) + (3 if base == "cleanup" else 1)
+        return "ok"
+
+    def close_block(self, round_number: int, now: float) -> None:
+        timestamp = int(now)
+        for account, methods in self.blocks.pop(round_number):
+            outcome = self.apply_group(account, methods, round_number, timestamp)
+            if outcome != "ok":
+                self.failures[outcome] = self.failures.get(outcome, 0) + 1
+            self.push(now + self.one_way(), "confirm", account)
+
+    def confirm(self, account: int, now: float) -> None:
+        self.views[account] = self.views[account]._replace(
+            local=dict(self.local[account]), bud=self.bud[account]
+        )
+        self.in_flight[account] = False
+        if self.ask_on_confirm[account]:
+            self.ask_on_confirm[account] = False
+            self.decide(account, now)
+
+    def run(self, duration: float) -> dict:
+        """
+        Simulate `duration` seconds of virtual time.
+
+        Returns:
+            dict: Report (see module docstring)
+        """
+        start = time.perf_counter()
+        for account in range(len(self.addresses)):
+            # Spread the first decisions over one round, as a real fleet's would be
+            self.push(self.rng.uniform(0, self.round_time), "decide", account)
+
+        while self.events and self.events[0][0] < duration:
+            now, _, kind, payload = heapq.heappop(self.events)
+            self.processed += 1
+            if kind == "decide":
+                self.decide(payload, now)
+            elif kind == "block":
+                self.close_block(payload, now)
+            else:
+                self.confirm(payload, now)
+
+        for account, local in enumerate(self.local):
+            for pod in self.pods:
+                self.stage_time[local[pod_key("stage", pod)]] += duration - self.stage_since[account][pod]
+        return self.report(duration, time.perf_counter() - start)
+
+    def report(self, duration: float, wall_seconds: float) -> dict:
+        pod_time = sum(self.stage_time.values()) or 1.0
+        days = duration / DAY
+        share = {
+            "empty": self.stage_time[0],
+            "growing": sum(self.stage_time[stage] for stage in (1, 2, 3, 4)),
+            "ready": self.stage_time[5],
+            "harvested": self.stage_time[6],
+        }
+        return {
+            "policy": getattr(self.policy, "__name__", str(self.policy)),
+            "accounts": len(self.addresses),
+            "pods_per_account": len(self.pods),
+            "days": round(days, 3),
+            "round_time": self.round_time,
+            "latency_ms": self.latency * 1000,
+            "utilisation": round(share["growing"] / pod_time, 4),
+            "stage_share": {name: round(seconds / pod_time, 4) for name, seconds in share.items()},
+            "harvests": sum(local["harvest_count"] for local in self.local),
+            "bud_per_day": round(self.bud_harvested / 1e6 / days, 2),
+            "bud_per_account_day": round(self.bud_harvested / 1e6 / days / len(self.addresses), 2),
+            "bud_burned_per_day": round(self.bud_burned / 1e6 / days, 2),
+            "algo_spent_per_day": round(self.fees / 1e6 / days, 4),
+            "groups": self.groups,
+            "txns": dict(sorted(self.txns.items())),
+            "txns_total": sum(self.txns.values()),
+            "rejected_groups": dict(sorted(self.failures.items())),
+            "stalled_pods": sum(
+                1 for local, bud in zip(self.local, self.bud) for pod in self.pods
+                if local[pod_key("stage", pod)] == 6 and bud < CLEANUP_BURN
+            ),
+            "events": self.processed,
+            "wall_seconds": round(wall_seconds, 3),
+        }
+
+
+def simulate(policy, accounts: int = DEFAULT_ACCOUNTS, days: float = DEFAULT_DAYS, **options) -> dict:
+    """Run one policy and return its report (options as for Simulation)."""
+    return Simulation(accounts, policy, **options).run(days * DAY)
+
+
+def main():
+    accounts = int(os.getenv("SIM_ACCOUNTS", str(DEFAULT_ACCOUNTS)))
+    days = float(os.getenv("SIM_DAYS", str(DEFAULT_DAYS)))
+    names = [name.strip() for name in os.getenv("SIM_POLICY", "greedy").split(",")]
+    poll_interval = float(os.getenv("SIM_POLL_INTERVAL", str(DEFAULT_POLL_INTERVAL)))
+    options = {
+        "pod_slots": int(os.getenv("SIM_POD_SLOTS", "2")),
+        "round_time": float(os.getenv("SIM_ROUND_TIME", str(DEFAULT_ROUND_TIME))),
+        "latency": float(os.getenv("SIM_LATENCY_MS", str(DEFAULT_LATENCY_MS))) / 1000,
+        "jitter": float(os.getenv("SIM_JITTER_MS", "0")) / 1000,
+        "start_bud": int(float(os.getenv("SIM_START_BUD", str(START_BUD / 1e6))) * 1e6),
+        "seed": int(os.getenv("SIM_SEED", "0")),
+    }
+    output = os.getenv("SIM_OUTPUT")
+
+    try:
+        policies = [resolve_policy(name, poll_interval) for name in names]
+    except (ValueError, ImportError, AttributeError) as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+
+    print("=" * 50)
+    print("GrowPod Empire - Fleet Simulator")
+    print("=" * 50)
+    print(f"Accounts: {accounts}, days: {days:g}, block time: {options['round_time']}s, "
+          f"latency: {options['latency'] * 1000:g}ms")
+
+    reports = []
+    for policy in policies:
+        report = simulate(policy, accounts, days, **options)
+        reports.append(report)
+        print(f"\n{report['policy']}:")
+        print(f"  Utilisation: {report['utilisation']:.1%} growing "
+              f"({', '.join(f'{k} {v:.1%}' for k, v in report['stage_share'].items() if k != 'growing')})")
+        print(f"  Harvests: {report['harvests']:,}")
+        print(f"  $BUD/day: {report['bud_per_day']:,.2f} harvested "
+              f"({report['bud_per_account_day']:,.2f} per account), {report['bud_burned_per_day']:,.2f} burned")
+        print(f"  ALGO/day: {report['algo_spent_per_day']:,.4f}")
+        print(f"  Transactions: {report['txns_total']:,} in {report['groups']:,} groups "
+              f"({', '.join(f'{k} {v:,}' for k, v in report['txns'].items())})")
+        if report['rejected_groups']:
+            print(f"  Rejected groups: {report['rejected_groups']}")
+        if report['stalled_pods']:
+            print(f"  Pods stalled without $BUD for cleanup: {report['stalled_pods']}")
+        print(f"  Simulated in {report['wall_seconds']:.2f}s ({report['events']:,} events)")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
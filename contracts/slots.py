@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Slot progression planner for GrowPod Empire
+Scans a fleet of accounts, works out who can claim a Slot Token
+(5 harvests + 2,500 $BUD burn) or unlock a pod slot (1 Slot Token burn) now,
+and submits the burn+call groups in concurrent batches.
+
+$BUD still needed for upcoming cleanups (pods ready to harvest or harvested)
+is reserved first, so slot purchases never stall a growth cycle.
+
+Only slots the contract can address are unlocked: it has methods for pods 1
+and 2 alone (the two slots every account opts in with), so unlocking slot 3-5
+would burn a Slot Token for no active pod. Until the contract gains pod 3-5
+methods (raise ADDRESSABLE_PODS with them), the planner spends nothing and
+reports why.
+
+Harvest timing is not modelled: an account whose claim only becomes possible
+with its next harvest is marked "after_harvest" and left for a later run;
+nothing is scheduled against when that harvest happens.
+"""
+from algosdk import account, mnemonic
+from algosdk.transaction import ApplicationNoOpTxn, AssetTransferTxn, assign_group_id
+from concurrent.futures import ThreadPoolExecutor
+from appconfig import resolve
+from fees import set_group_fees
+from metrics import phase
+from multinode import connect
+from ratelimit import limited
+from statecodec import LocalState, read_account as read_account_state
+from submit import (
+    operation_lease,
+    leased_params,
+    submit_with_retry,
+    DuplicateOperationError,
+    OperationExpiredError,
+    TransactionRejectedError
+)
+from typing import NamedTuple
+import os
+import sys
+
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = limited(connect(ALGOD_ADDRESS, ALGOD_TOKEN))  # Throttled: fleet-sized bursts
+
+# Mirrored from contract.py
+HARVESTS_FOR_SLOT = 5
+SLOT_TOKEN_COST = 2_500_000_000  # 2,500 $BUD
+MAX_POD_SLOTS = 5
+ADDRESSABLE_PODS = 2  # Pods with contract methods (fleet.PODS); unlocking beyond adds no active pod
+CLEANUP_BUD_BURN = 500_000_000  # 500 $BUD
+
+BATCH_SIZE = 16  # Groups in flight at once
+
+NO_POD_METHODS = f"no contract methods for pods above {ADDRESSABLE_PODS}; an unlock would add no active pod"
+
+
+class FleetAccount(NamedTuple):
+    address: str
+    harvest_count: int
+    pod_slots: int
+    bud: int  # $BUD units held
+    slot: int  # Slot Tokens held (-1 if not opted in)
+    stages: tuple  # Stage of pod 1 and pod 2
+
+
+class SlotAction(NamedTuple):
+    address: str
+    claims: int  # claim_slot_token calls in the group
+    unlocks: int  # unlock_slot calls in the group
+    bud_cost: int
+    when: str  # "now" or "after_harvest" (a label for a later run, not a scheduled time)
+    reason: str
+
+
+def load_fleet(path: str) -> dict:
+    """Read one mnemonic per line (blank lines and # comments skipped); address -> mnemonic."""
+    fleet = {}
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                fleet[account.address_from_private_key(mnemonic.to_private_key(line))] = line
+    return fleet
+
+
+def read_account(address: str, app_id: int, bud_asset_id: int, slot_asset_id: int) -> FleetAccount:
+    """Slot-relevant state of one account from a single msgpack account read."""
+    state = read_account_state(algod_client, address, app_id, (bud_asset_id, slot_asset_id))
+    local = state.local or LocalState(pod_slots=2)
+    return FleetAccount(
+        address,
+        local.harvest_count,
+        local.pod_slots,
+        max(state.holdings[0], 0),
+        state.holdings[1],
+        (local.stage, local.stage_2),
+    )
+
+
+def plan_account(acct: FleetAccount, bud_available: int = None) -> SlotAction:
+    """
+    Decide how many claims and unlocks one account should do now.
+
+    Args:
+        acct: Account state
+        bud_available: Fleet-wide $BUD budget left (None for unlimited)
+
+    Returns:
+        SlotAction: Planned group (claims == unlocks == 0 if nothing to do)
+    """
+    if acct.slot < 0:
+        return SlotAction(acct.address, 0, 0, 0, "now", "not opted in to SLOT")
+    free_slots = min(MAX_POD_SLOTS, ADDRESSABLE_PODS) - acct.pod_slots
+    if free_slots <= 0:
+        if acct.pod_slots < MAX_POD_SLOTS:
+            return SlotAction(acct.address, 0, 0, 0, "now", NO_POD_METHODS)
+        return SlotAction(acct.address, 0, 0, 0, "now", "all slots unlocked")
+
+    # Keep enough $BUD to clean up every pod that is ready or harvested
+    reserve = CLEANUP_BUD_BURN * sum(1 for stage in acct.stages if stage in (5, 6))
+    spendable = max(0, acct.bud - reserve)
+    if bud_available is not None:
+        spendable = min(spendable, bud_available)
+
+    # Never claim tokens that could not be used
+    claims = min(
+        acct.harvest_count // HARVESTS_FOR_SLOT,
+        max(0, free_slots - acct.slot),
+        spendable // SLOT_TOKEN_COST,
+    )
+    unlocks = min(free_slots, acct.slot + claims)  # At most 3 + 3 pairs: fits one group
+
+    if claims or unlocks:
+        return SlotAction(acct.address, claims, unlocks, claims * SLOT_TOKEN_COST, "now", "eligible")
+
+    ready = sum(1 for stage in acct.stages if stage == 5)
+    if acct.harvest_count < HARVESTS_FOR_SLOT <= acct.harvest_count + ready:
+        return SlotAction(acct.address, 0, 0, 0, "after_harvest", "claimable after next harvest")
+    if acct.harvest_count >= HARVESTS_FOR_SLOT:
+        return SlotAction(acct.address, 0, 0, 0, "now", "insufficient $BUD after cleanup reserve")
+    return SlotAction(acct.address, 0, 0, 0, "now", f"{acct.harvest_count}/{HARVESTS_FOR_SLOT} harvests")
+
+
+def plan_fleet(accounts: list, bud_budget: int = None) -> list:
+    """
+    Plan slot actions for every account.
+
+    Unlocks that need no new $BUD go first; claims then go to accounts with the
+    most pods in use, which gain the most from another slot per $BUD burned.
+
+    Returns:
+        list: SlotAction per account, actionable ones first
+    """
+    def priority(acct):
+        active = sum(1 for stage in acct.stages if stage)
+        return (-min(acct.slot, 1), -active, -acct.harvest_count)
+
+    actions = []
+    remaining = bud_budget
+    for acct in sorted(accounts, key=priority):
+        action = plan_account(acct, remaining)
+        if remaining is not None:
+            remaining -= action.bud_cost
+        actions.append(action)
+    actions.sort(key=lambda a: not (a.claims or a.unlocks))
+    return actions
+
+
+def build_group(action: SlotAction, acct: FleetAccount, private_key: str, app_id: int,
+                bud_asset_id: int, slot_asset_id: int, app_address: str, params) -> list:
+    """Signed [burn $BUD, claim] * claims + [burn SLOT, unlock] * unlocks group."""
+    sender = action.address
+    txns = []
+    for _ in range(action.claims):
+        txns.append(AssetTransferTxn(sender, params, app_address, SLOT_TOKEN_COST, bud_asset_id))
+        txns.append(ApplicationNoOpTxn(sender, params, app_id, app_args=["claim_slot_token"]))
+    for _ in range(action.unlocks):
+        txns.append(AssetTransferTxn(sender, params, app_address, 1, slot_asset_id))
+        txns.append(ApplicationNoOpTxn(sender, params, app_id, app_args=["unlock_slot"]))
+
+    # Lease the first burn on the account's progression so a rerun cannot repeat it
+    method = "claim_slot_token" if action.claims else "unlock_slot"
+    txns[0].lease = operation_lease(
+        sender, app_id, method, cycle=(acct.pod_slots << 32) | acct.harvest_count
+    )
+    set_group_fees(txns, params)  # claim_slot_token sends the Slot Token by inner transaction
+    if len(txns) > 1:
+        assign_group_id(txns)
+    with phase(method, "sign"):
+        return [txn.sign(private_key) for txn in txns]
+
+
+def execute_plan(actions: list, accounts: dict, fleet: dict, app_id: int, bud_asset_id: int,
+                 slot_asset_id: int, app_address: str, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Submit every actionable group, `batch_size` groups at a time.
+
+    Returns:
+        dict: address -> "ok" or the error message
+    """
+    todo = [a for a in actions if a.claims or a.unlocks]
+    with phase("claim_slot_token", "suggested_params"):
+        params = leased_params(algod_client)
+
+    def submit(action):
+        method = "claim_slot_token" if action.claims else "unlock_slot"
+        signed = build_group(
+            action, accounts[action.address], mnemonic.to_private_key(fleet[action.address]),
+            app_id, bud_asset_id, slot_asset_id, app_address, params
+        )
+        try:
+            submit_with_retry(algod_client, signed, method=method)
+            return "ok"
+        except DuplicateOperationError:
+            return "already submitted"
+        except TransactionRejectedError as e:
+            return f"rejected ({e})"
+        except OperationExpiredError as e:
+            return f"expired ({e})"
+        except Exception as e:
+            return str(e)
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=batch_size) as pool:
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            for action, outcome in zip(batch, pool.map(submit, batch)):
+                results[action.address] = outcome
+    return results
+
+
+def main():
+    fleet_path = os.getenv("FLEET_FILE")
+    app_id = os.getenv("GROWPOD_APP_ID")
+
+    if not all([fleet_path, app_id]):
+        print("ERROR: Required environment variables not set:")
+        print("  FLEET_FILE - One account mnemonic per line")
+        print("  GROWPOD_APP_ID - Contract application ID")
+        sys.exit(1)
+
+    config = resolve(algod_client, int(app_id))
+    if not (config.bud_asset and config.slot_asset):
+        print("ERROR: Contract has no $BUD/Slot assets configured. Run the bootstrap first.")
+        sys.exit(1)
+    app_id, bud_asset_id, slot_asset_id = config.app_id, config.bud_asset, config.slot_asset
+    app_address = config.app_address
+    budget = os.getenv("SLOT_BUD_BUDGET")  # Whole $BUD
+    budget = int(float(budget) * 1_000_000) if budget else None
+    dry_run = os.getenv("DRY_RUN", "").lower() in ("1", "true", "yes")
+
+    print("=" * 50)
+    print("GrowPod Empire - Slot Planner")
+    print("=" * 50)
+
+    fleet = load_fleet(fleet_path)
+    with ThreadPoolExecutor(max_workers=BATCH_SIZE) as pool:
+        scanned = list(pool.map(
+            lambda address: read_account(address, app_id, bud_asset_id, slot_asset_id), fleet
+        ))
+    accounts = {acct.address: acct for acct in scanned}
+    actions = plan_fleet(scanned, budget)
+
+    actionable = [a for a in actions if a.claims or a.unlocks]
+    deferred = [a for a in actions if a.when == "after_harvest"]
+    print(f"Accounts: {len(fleet)}")
+    print(f"  Claims now: {sum(a.claims for a in actionable)}")
+    print(f"  Unlocks now: {sum(a.unlocks for a in actionable)}")
+    print(f"  $BUD to burn: {sum(a.bud_cost for a in actionable) / 1_000_000:,.0f}")
+    print(f"  Deferred until next harvest: {len(deferred)}")
+    blocked = sum(1 for a in actions if a.reason == NO_POD_METHODS)
+    if blocked:
+        print(f"  Not planned: {blocked} account(s), {NO_POD_METHODS}")
+    for action in actionable:
+        print(f"  {action.address[:8]}...  claim x{action.claims}, unlock x{action.unlocks}")
+
+    if dry_run or not actionable:
+        return
+
+    results = execute_plan(actions, accounts, fleet, app_id, bud_asset_id, slot_asset_id, app_address)
+    failed = {address: outcome for address, outcome in results.items() if outcome != "ok"}
+    print(f"\nSubmitted {len(results)} group(s): {len(results) - len(failed)} confirmed")
+    print(algod_client.limiter.summary())
+    for address, outcome in failed.items():
+        print(f"  {address[:8]}...  {outcome}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Typed state decoding for GrowPod Empire
+Reads account and app state from algod in its msgpack format and decodes the
+TEAL key-value maps straight into fixed-layout records (LocalState,
+GlobalState), skipping the JSON parse and the per-key base64 decoding.
+
+Key lookups go through tables built once from the contract's key names, keyed
+by the raw key bytes (msgpack) and by their base64 form (JSON), so no key is
+decoded or allocated per account. Unknown keys are ignored.
+
+algod serves msgpack for /v2/accounts/{address} and
+/v2/accounts/{address}/applications/{id}; /v2/applications/{id} is JSON only,
+so global state is read through the creator's account or decoded from JSON
+with the same tables.
+
+Run directly to measure decode cost per account on a synthetic snapshot:
+    STATE_BENCH_ACCOUNTS=100000 python contracts/statecodec.py
+"""
+from algosdk import encoding
+from algosdk.error import AlgodHTTPError
+from appconfig import decode_state
+from model import initial_local_state, pod_key
+from typing import NamedTuple
+import base64
+import json
+import msgpack
+import os
+import time
+
+TEAL_UINT = 2
+
+
+class LocalState(NamedTuple):
+    """The contract's 16 local keys, in on-chain key names."""
+    stage: int = 0
+    water_count: int = 0
+    last_watered: int = 0
+    nutrient_count: int = 0
+    last_nutrients: int = 0
+    dna: bytes = b""
+    terpene_profile: bytes = b""
+    stage_2: int = 0
+    water_count_2: int = 0
+    last_watered_2: int = 0
+    nutrient_count_2: int = 0
+    last_nutrients_2: int = 0
+    dna_2: bytes = b""
+    terpene_profile_2: bytes = b""
+    harvest_count: int = 0
+    pod_slots: int = 0
+
+    def get(self, key: str, default=None):
+        """Dict-style access by on-chain key name ("stage_2", ...)."""
+        return getattr(self, key, default)
+
+
+class GlobalState(NamedTuple):
+    owner: bytes = b""
+    period: int = 0
+    cleanup_cost: int = 0
+    breed_cost: int = 0
+    bud_asset: int = 0
+    terp_asset: int = 0
+    slot_asset: int = 0
+    terp_registry: bytes = b""
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+
+class AccountState(NamedTuple):
+    address: str
+    amount: int  # microAlgos
+    holdings: tuple  # Units held of each requested asset, -1 if not opted in
+    local: LocalState  # None if not opted in to the app
+
+
+def _slots(record) -> tuple:
+    """(raw key bytes -> field index, base64 key -> field index) for a record type."""
+    raw = {name.encode(): index for index, name in enumerate(record._fields)}
+    b64 = {base64.b64encode(key).decode(): index for key, index in raw.items()}
+    return raw, b64
+
+
+_LOCAL_RAW, _LOCAL_B64 = _slots(LocalState)
+_GLOBAL_RAW, _GLOBAL_B64 = _slots(GlobalState)
+_LOCAL_DEFAULTS = tuple(LocalState._field_defaults[name] for name in LocalState._fields)
+_GLOBAL_DEFAULTS = tuple(GlobalState._field_defaults[name] for name in GlobalState._fields)
+
+
+def _from_tkv(record, slots: dict, defaults: tuple, tkv: dict):
+    """Record from a msgpack TealKeyValue map ({key: {tt, tb, ui}}, empty fields omitted)."""
+    values = list(defaults)
+    for key, value in tkv.items():
+        index = slots.get(key)
+        if index is not None:
+            # Only the non-empty field is present; zero and b"" are already the defaults
+            field = value.get(b"ui")
+            if field is None:
+                field = value.get(b"tb")
+            if field is not None:
+                values[index] = field
+    return record._make(values)
+
+
+def _from_json(record, slots: dict, defaults: tuple, key_values: list):
+    """Record from algod's JSON key-value list (only values are base64-decoded)."""
+    values = list(defaults)
+    for kv in key_values:
+        index = slots.get(kv['key'])
+        if index is not None:
+            value = kv['value']
+            values[index] = value.get('uint', 0) if value['type'] == TEAL_UINT else base64.b64decode(value.get('bytes', ''))
+    return record._make(values)
+
+
+def local_from_tkv(tkv: dict) -> LocalState:
+    return _from_tkv(LocalState, _LOCAL_RAW, _LOCAL_DEFAULTS, tkv)
+
+
+def global_from_tkv(tkv: dict) -> GlobalState:
+    return _from_tkv(GlobalState, _GLOBAL_RAW, _GLOBAL_DEFAULTS, tkv)
+
+
+def local_from_json(key_values: list) -> LocalState:
+    return _from_json(LocalState, _LOCAL_B64, _LOCAL_DEFAULTS, key_values)
+
+
+def global_from_json(key_values: list) -> GlobalState:
+    return _from_json(GlobalState, _GLOBAL_B64, _GLOBAL_DEFAULTS, key_values)
+
+
+def account_from_msgpack(data: bytes, address: str, app_id: int, asset_ids: tuple = ()) -> AccountState:
+    """Decode a /v2/accounts/{address}?format=msgpack body (algod's account record)."""
+    record = msgpack.unpackb(data, raw=True, strict_map_key=False)
+    app = record.get(b"appl", {}).get(app_id)
+    assets = record.get(b"asset", {})
+    return AccountState(
+        address,
+        record.get(b"algo", 0),
+        tuple(assets[asset_id].get(b"a", 0) if asset_id in assets else -1 for asset_id in asset_ids),
+        local_from_tkv(app.get(b"tkv", {})) if app is not None else None,
+    )
+
+
+def account_from_json(account_info: dict, app_id: int, asset_ids: tuple = ()) -> AccountState:
+    """Decode an account_info JSON response."""
+    local = None
+    for app_local in account_info.get('apps-local-state', []):
+        if app_local['id'] == app_id:
+            local = local_from_json(app_local.get('key-value', []))
+    assets = {holding['asset-id']: holding['amount'] for holding in account_info.get('assets', [])}
+    return AccountState(
+        account_info['address'],
+        account_info.get('amount', 0),
+        tuple(assets.get(asset_id, -1) for asset_id in asset_ids),
+        local,
+    )
+
+
+def _get_msgpack(algod_client, path: str) -> bytes:
+    return algod_client.algod_request("GET", path, {"format": "msgpack"}, response_format="msgpack")
+
+
+def read_account(algod_client, address: str, app_id: int, asset_ids: tuple = ()) -> AccountState:
+    """Balance, asset holdings and local state of an account from one msgpack read."""
+    return account_from_msgpack(_get_msgpack(algod_client, f"/accounts/{address}"), address, app_id, asset_ids)
+
+
+def read_local(algod_client, address: str, app_id: int) -> LocalState:
+    """Local state of one account (None if not opted in), from the account-application endpoint."""
+    try:
+        data = _get_msgpack(algod_client, f"/accounts/{address}/applications/{app_id}")
+    except AlgodHTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    app_local = msgpack.unpackb(data, raw=True, strict_map_key=False).get(b"app-local-state")
+    return local_from_tkv(app_local.get(b"tkv", {})) if app_local is not None else None
+
+
+def read_app(algod_client, creator: str, app_id: int) -> tuple:
+    """
+    Global state and approval program of an app, through its creator's account.
+
+    Returns:
+        tuple: (GlobalState, approval program bytes), or (None, b"") if `creator` did not create it
+    """
+    try:
+        data = _get_msgpack(algod_client, f"/accounts/{creator}/applications/{app_id}")
+    except AlgodHTTPError as e:
+        if e.code == 404:
+            return None, b""
+        raise
+    params = msgpack.unpackb(data, raw=True, strict_map_key=False).get(b"app-params")
+    if params is None:
+        return None, b""
+    return global_from_tkv(params.get(b"gs", {})), params.get(b"approv", b"")
+
+
+def _snapshot(accounts: int, app_id: int, bud_asset: int) -> tuple:
+    """JSON and msgpack bodies for `accounts` opted-in accounts, as algod serves them."""
+    json_bodies, msgpack_bodies = [], []
+    for i in range(accounts):
+        address = encoding.encode_address(i.to_bytes(32, "big"))
+        local = initial_local_state()
+        for pod in (1, 2):
+            local[pod_key("stage", pod)] = 1 + (i + pod) % 6
+            local[pod_key("water_count", pod)] = i % 11
+            local[pod_key("last_watered", pod)] = 1_700_000_000 + i
+            local[pod_key("dna", pod)] = i.to_bytes(32, "big")
+            local[pod_key("terpene_profile", pod)] = (i + pod).to_bytes(32, "big")
+        tkv = {
+            key.encode(): {b"tt": 1, b"tb": value} if isinstance(value, bytes) else {b"tt": TEAL_UINT, b"ui": value}
+            for key, value in local.items()
+        }
+        msgpack_bodies.append(msgpack.packb({
+            b"algo": 5_000_000 + i,
+            b"asset": {bud_asset: {b"a": i * 1000}},
+            b"appl": {app_id: {b"hsch": {b"nui": 12, b"nbs": 4}, b"tkv": tkv}},
+        }, use_bin_type=True))
+        json_bodies.append(json.dumps({
+            "address": address,
+            "amount": 5_000_000 + i,
+            "assets": [{"asset-id": bud_asset, "amount": i * 1000, "is-frozen": False}],
+            "apps-local-state": [{"id": app_id, "schema": {"num-uint": 12, "num-byte-slice": 4}, "key-value": [
+                {"key": base64.b64encode(key.encode()).decode(),
+                 "value": {"type": 1, "bytes": base64.b64encode(value).decode(), "uint": 0}
+                 if isinstance(value, bytes) else {"type": TEAL_UINT, "bytes": "", "uint": value}}
+                for key, value in local.items()
+            ]}],
+        }).encode())
+    return json_bodies, msgpack_bodies
+
+
+def main():
+    accounts = int(os.getenv("STATE_BENCH_ACCOUNTS", "100000"))
+    app_id, bud_asset = 1001, 1002
+
+    print("=" * 50)
+    print("GrowPod Empire - State Decode Benchmark")
+    print("=" * 50)
+    print(f"Building a snapshot of {accounts:,} accounts...")
+    json_bodies, msgpack_bodies = _snapshot(accounts, app_id, bud_asset)
+    address = encoding.encode_address(bytes(32))
+
+    def before(body):
+        # The previous read path: JSON parse, then decode_state over every key
+        info = json.loads(body)
+        for app_local in info.get('apps-local-state', []):
+            if app_local['id'] == app_id:
+                decode_state(app_local.get('key-value', []))
+        return {a['asset-id']: a['amount'] for a in info.get('assets', [])}.get(bud_asset, 0)
+
+    runs = (
+        ("JSON + decode_state (before)", json_bodies, before),
+        ("JSON + typed record", json_bodies, lambda body: account_from_json(json.loads(body), app_id, (bud_asset,))),
+        ("msgpack + typed record", msgpack_bodies,
+         lambda body: account_from_msgpack(body, address, app_id, (bud_asset,))),
+    )
+    baseline = None
+    for label, bodies, decode in runs:
+        start = time.perf_counter()
+        for body in bodies:
+            decode(body)
+        per_account = (time.perf_counter() - start) / accounts * 1e6
+        baseline = baseline or per_account
+        size = sum(map(len, bodies)) / accounts
+        print(f"  {label:<30} {per_account:6.2f} us/account  {size:5.0f} B/account  "
+              f"{baseline / per_account:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
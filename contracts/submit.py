@@ -0,0 +1,383 @@
+"""
+Idempotent transaction submission for GrowPod Empire
+Attaches a deterministic lease to each logical operation and retries under load
+without executing the same operation twice within its lease window.
+
+How at-most-once (within the lease window) works:
+- The lease is sha256 of (sender, app, action, pod, cycle), so every rerun of the
+  same logical operation produces the same 32-byte lease.
+- The validity window is aligned to LEASE_WINDOW round buckets, so reruns inside
+  one bucket rebuild a byte-identical transaction (same txid), and reruns in the
+  next bucket overlap the previous window and are rejected by the ledger with
+  "overlapping lease" instead of executing again.
+- The guarantee ends with the earlier group's LastValid round (at most
+  MAX_VALIDITY rounds, about an hour): a later rerun is a new operation to the
+  ledger. Operations the contract does not guard by state (breed) also check
+  the journal for an earlier confirmed group with the same lease.
+- Retries always resend the exact signed bytes, which the node deduplicates by txid.
+- Once a node answers "already in ledger", the group is never reported expired:
+  if pending info cannot say in which round it confirmed, the blocks can.
+"""
+from algosdk import encoding
+from algosdk.error import AlgodHTTPError
+from metrics import phase, record_success, registry
+from model import pod_key
+from statecodec import read_local
+from urllib.error import URLError
+import base64
+import hashlib
+import msgpack
+import random
+import time
+
+# Rounds per lease bucket; windows span two buckets so consecutive reruns overlap
+LEASE_WINDOW = 500
+MAX_VALIDITY = 1000  # Protocol maximum LastValid - FirstValid + 1
+
+# Backoff defaults (seconds)
+BASE_DELAY = 0.5
+MAX_DELAY = 16.0
+MAX_ATTEMPTS = 8
+
+# HTTP status codes worth retrying (throttling and node overload)
+TRANSIENT_CODES = (408, 429, 500, 502, 503, 504)
+
+# What broadcast() learned from the node
+SENT = "sent"
+IN_POOL = "in pool"
+IN_LEDGER = "in ledger"
+
+# Per-round decisions of outcome_step()
+CONFIRMED = "confirmed"
+REJECTED = "rejected"
+EXPIRED = "expired"
+LOOKUP = "lookup"  # Committed per the node, but pending info has no round: search the blocks
+RESEND = "resend"
+WAIT = "wait"
+
+
+class DuplicateOperationError(Exception):
+    """The lease is held by an earlier submission of the same operation."""
+
+
+class TransactionRejectedError(Exception):
+    """The node rejected the group (pool error); it did not execute."""
+
+
+class OperationExpiredError(Exception):
+    """The validity window passed without confirmation; the operation did not execute."""
+
+
+class OutcomeUnknownError(Exception):
+    """The node reported the group committed, but it was not found in the blocks of its window."""
+
+
+def operation_lease(sender: str, app_id: int, action: str, pod: int = 1, cycle=0) -> bytes:
+    """
+    Derive the 32-byte lease for one logical operation.
+
+    Args:
+        sender: Account address submitting the operation
+        app_id: GrowPod smart contract application ID
+        action: Contract method name (e.g. "cleanup", "breed")
+        pod: Pod number the operation targets
+        cycle: Growth cycle identifier (int, str or bytes, e.g. the pod's DNA)
+
+    Returns:
+        bytes: Lease value for the first transaction of the group
+    """
+    if isinstance(cycle, int):
+        cycle = cycle.to_bytes(8, 'big')
+    elif isinstance(cycle, str):
+        cycle = cycle.encode()
+    return hashlib.sha256(b"".join([
+        b"growpod-lease",
+        encoding.decode_address(sender),
+        app_id.to_bytes(8, 'big'),
+        action.encode(),
+        pod.to_bytes(8, 'big'),
+        cycle,
+    ])).digest()
+
+
+def pod_cycle(algod_client, address: str, app_id: int, pod: int = 1) -> bytes:
+    """Identify the pod's current growth cycle by its on-chain DNA hash."""
+    state = read_local(algod_client, address, app_id)
+    return state.get(pod_key("dna", pod), b"") if state is not None else b""
+
+
+def leased_params(algod_client):
+    """
+    Get suggested params with a validity window aligned to the lease bucket.
+
+    Every call within the same LEASE_WINDOW rounds returns the same window, and
+    consecutive buckets overlap, so a leased operation runs at most once within
+    the lease window (until the earlier group's LastValid round).
+    """
+    return align_lease_window(call_with_retry(algod_client.suggested_params))
+
+
+def align_lease_window(params):
+    """Align suggested params' validity window to the lease bucket (in place)."""
+    params.first = (params.first // LEASE_WINDOW) * LEASE_WINDOW
+    params.last = params.first + MAX_VALIDITY - 1
+    return params
+
+
+def backoff_delay(attempt: int, base: float = BASE_DELAY, cap: float = MAX_DELAY) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def is_transient(err: Exception) -> bool:
+    """Check whether an algod error is worth retrying."""
+    if isinstance(err, AlgodHTTPError):
+        return err.code is None or err.code in TRANSIENT_CODES
+    return isinstance(err, (URLError, TimeoutError, ConnectionError))
+
+
+def call_with_retry(fn, *args, max_attempts: int = MAX_ATTEMPTS, **kwargs):
+    """Call an algod client method, retrying transient failures with backoff."""
+    for attempt in range(max_attempts):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not is_transient(e) or attempt == max_attempts - 1:
+                raise
+            time.sleep(backoff_delay(attempt))
+
+
+def broadcast(algod_client, signed_txns: list, max_attempts: int = MAX_ATTEMPTS, method: str = None) -> str:
+    """
+    Send signed transactions; an already-known txid counts as success.
+
+    Returns:
+        str: SENT, IN_POOL, or IN_LEDGER when the group had already committed
+    """
+    for attempt in range(max_attempts):
+        if attempt and method:
+            registry.count_call(method, "retry")
+        try:
+            algod_client.send_transactions(signed_txns)
+            return SENT
+        except Exception as e:
+            message = str(e)
+            if "already in ledger" in message:
+                return IN_LEDGER
+            if "already in the pool" in message:
+                return IN_POOL
+            if "overlapping lease" in message:
+                raise DuplicateOperationError(message) from e
+            if not is_transient(e) or attempt == max_attempts - 1:
+                raise
+            time.sleep(backoff_delay(attempt))
+
+
+def submit_with_retry(
+    algod_client,
+    signed_txns: list,
+    max_attempts: int = MAX_ATTEMPTS,
+    method: str = "submit",
+    journal=None
+) -> dict:
+    """
+    Submit a signed group and wait for its outcome, at most once within its lease window.
+
+    The same signed bytes are rebroadcast whenever the node loses track of them,
+    until the group confirms or its LastValid round passes.
+
+    Args:
+        algod_client: Algod client to submit through
+        signed_txns: Signed transactions of one atomic group (one carrying the lease)
+        max_attempts: Retry budget for each individual algod call
+        method: Contract method label for latency metrics
+        journal: Optional journal.Journal recording the group before the first
+            send and its outcome after (transport failures leave it unresolved)
+
+    Returns:
+        dict: Pending transaction info of the confirmed first transaction
+
+    Raises:
+        DuplicateOperationError: An earlier submission already holds the lease
+        TransactionRejectedError: The node rejected the group
+        OperationExpiredError: The window passed; the group definitely did not execute
+    """
+    txid = signed_txns[0].get_txid()
+    last_valid = max(stxn.transaction.last_valid_round for stxn in signed_txns)
+
+    if journal is not None:
+        journal.begin(signed_txns, method)
+    try:
+        with phase(method, "send_transaction"):
+            sent = broadcast(algod_client, signed_txns, max_attempts, method)
+        with phase(method, "wait_for_confirmation"):
+            confirmed = _await_outcome(
+                algod_client, signed_txns, txid, last_valid, max_attempts, method, sent == IN_LEDGER
+            )
+    except Exception as e:
+        # Rejections, held leases and expiry are final; transport errors and unknown outcomes are not
+        if journal is not None and not is_transient(e) and not isinstance(e, OutcomeUnknownError):
+            journal.resolve(txid, "failed", detail=str(e))
+        raise
+    if journal is not None:
+        journal.resolve(txid, "confirmed", confirmed.get('confirmed-round', 0))
+    record_success(method)
+    return confirmed
+
+
+def outcome_step(pending: dict, current_round: int, last_valid: int, in_ledger: bool) -> str:
+    """
+    Decide what to do with a sent group after one pending-info read.
+
+    Args:
+        pending: Pending transaction info ({} if the node does not know the txid)
+        current_round: Latest round seen
+        last_valid: LastValid round of the group
+        in_ledger: A node answered "already in ledger" to a send of this group
+
+    Returns:
+        str: CONFIRMED, REJECTED, LOOKUP, EXPIRED, RESEND or WAIT
+    """
+    if pending.get('confirmed-round', 0) > 0:
+        return CONFIRMED
+    if pending.get('pool-error'):
+        return REJECTED
+    if in_ledger:
+        # Committed, so never expired; the round is in a block of the window
+        return LOOKUP
+    if current_round > last_valid:
+        return EXPIRED
+    return RESEND if not pending else WAIT
+
+
+def committed_txn(stxn) -> dict:
+    """A signed transaction's body as blocks store it (without the genesis fields blocks may omit)."""
+    record = msgpack.unpackb(base64.b64decode(encoding.msgpack_encode(stxn)), raw=False, strict_map_key=False)
+    return {key: value for key, value in record["txn"].items() if key not in ("gh", "gen")}
+
+
+def find_in_blocks(algod_client, windows: dict) -> dict:
+    """
+    Rounds in which transactions were committed, from the blocks of their windows.
+
+    Args:
+        windows: txid -> (signed transaction, first round, last round) to search
+
+    Returns:
+        dict: txid -> round for the transactions found; raises if a block cannot be read
+    """
+    wanted = {}
+    for txid, (stxn, _, _) in windows.items():
+        txn = committed_txn(stxn)
+        wanted.setdefault((txn["snd"], txn.get("fv", 0), txn.get("lv", 0)), []).append((txn, txid))
+
+    found = {}
+    rounds = sorted({r for _, first, last in windows.values() for r in range(max(first, 1), last + 1)})
+    for round_num in rounds:
+        raw = call_with_retry(algod_client.block_info, round_num, response_format="msgpack")
+        block = msgpack.unpackb(raw, raw=False, strict_map_key=False)["block"]
+        for stxn in block.get("txns", []):
+            txn = {key: value for key, value in stxn["txn"].items() if key not in ("gh", "gen")}
+            for candidate, txid in wanted.get((txn.get("snd"), txn.get("fv", 0), txn.get("lv", 0)), ()):
+                if txid not in found and txn == candidate:
+                    found[txid] = round_num
+        if len(found) == len(windows):
+            break
+    return found
+
+
+def confirmed_in_blocks(algod_client, signed_txns: list, current_round: int) -> dict:
+    """
+    Confirmation of a group the node reported committed, looked up in its blocks.
+
+    Returns:
+        dict: {"confirmed-round": round} in the shape of pending transaction info
+
+    Raises:
+        OutcomeUnknownError: Not in any block up to `current_round`
+    """
+    txid = signed_txns[0].get_txid()
+    first_valid = min(stxn.transaction.first_valid_round for stxn in signed_txns)
+    last_round = min(current_round, max(stxn.transaction.last_valid_round for stxn in signed_txns))
+    found = find_in_blocks(algod_client, {txid: (signed_txns[0], first_valid, last_round)})
+    if txid not in found:
+        raise OutcomeUnknownError(
+            f"{txid} reported already in ledger but not found in rounds {first_valid}-{last_round}; do not rebuild"
+        )
+    return {"confirmed-round": found[txid], "pool-error": ""}
+
+
+def confirm_groups(algod_client, pool, sent: dict, max_rounds: int, label: str) -> dict:
+    """
+    Watch many sent groups at once, with one pending-info read per group per round.
+
+    A node that does not know a txid (404: not yet propagated to it, or already
+    dropped from its pending cache) leaves the group pending, like an empty answer.
+
+    Args:
+        pool: Executor the reads run on
+        sent: key -> txid of each group's watched transaction
+        max_rounds: Rounds to wait before giving up on the rest
+        label: Metrics operation the reads are timed under
+
+    Returns:
+        dict: key -> pending info of each group that left the pool ('confirmed-round'
+              or 'pool-error' set); keys absent were not confirmed within max_rounds
+    """
+    def pending_info(txid):
+        try:
+            return call_with_retry(algod_client.pending_transaction_info, txid)
+        except AlgodHTTPError as e:
+            if e.code != 404:
+                raise
+            return {}
+
+    waiting = dict(sent)
+    settled = {}
+    current_round = call_with_retry(algod_client.status)['last-round'] if waiting else 0
+    for _ in range(max_rounds):
+        if not waiting:
+            break
+        call_with_retry(algod_client.status_after_block, current_round)
+        current_round += 1
+        with phase(label, "wait_for_confirmation"):
+            infos = list(pool.map(pending_info, waiting.values()))
+        for key, info in zip(list(waiting), infos):
+            if info.get('confirmed-round') or info.get('pool-error'):
+                settled[key] = info
+                del waiting[key]
+    return settled
+
+
+def _await_outcome(algod_client, signed_txns, txid, last_valid, max_attempts, method, in_ledger=False) -> dict:
+    """Poll round by round until the group confirms or its window passes."""
+    current_round = call_with_retry(algod_client.status)['last-round']
+
+    while True:
+        try:
+            pending = call_with_retry(algod_client.pending_transaction_info, txid)
+        except AlgodHTTPError as e:
+            if e.code != 404:
+                raise
+            pending = {}
+
+        step = outcome_step(pending, current_round, last_valid, in_ledger)
+        if step == CONFIRMED:
+            return pending
+        if step == REJECTED:
+            raise TransactionRejectedError(f"Transaction rejected: {pending['pool-error']}")
+        if step == LOOKUP:
+            latest = call_with_retry(algod_client.status)['last-round']
+            return confirmed_in_blocks(algod_client, signed_txns, max(current_round, latest))
+        if step == EXPIRED:
+            raise OperationExpiredError(
+                f"{txid} not confirmed by round {last_valid}; safe to rebuild"
+            )
+        if step == RESEND:
+            # Node dropped or never saw the group: resend the identical bytes
+            if broadcast(algod_client, signed_txns, max_attempts, method) == IN_LEDGER:
+                in_ledger = True
+                continue
+
+        call_with_retry(algod_client.status_after_block, current_round)
+        current_round += 1
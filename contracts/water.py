@@ -5,34 +5,26 @@ Waters plant with 10 minute cooldown (TestNet), advances growth stage
 """
 from algosdk import account, mnemonic
 from algosdk.transaction import ApplicationNoOpTxn, wait_for_confirmation
-from algosdk.v2client import algod
+from fees import set_group_fees
+from metrics import phase, record_success
+from multinode import connect
+from statecodec import LocalState, read_local
 import os
 import sys
 import time
 
-# Algorand TestNet configuration
-ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
-ALGOD_TOKEN = ""
-algod_client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
+# Algorand TestNet configuration (override ALGOD_ADDRESS to target another node, or a comma-separated list)
+ALGOD_ADDRESS = os.getenv("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+ALGOD_TOKEN = os.getenv("ALGOD_TOKEN", "")
+algod_client = connect(ALGOD_ADDRESS, ALGOD_TOKEN)
 
 # Constants
 WATER_COOLDOWN = 600  # 10 minutes in seconds (TestNet)
 
 
-def get_local_state(address: str, app_id: int) -> dict:
-    """Get user's local state from the contract."""
-    account_info = algod_client.account_info(address)
-    for app_local in account_info.get('apps-local-state', []):
-        if app_local['id'] == app_id:
-            state = {}
-            for kv in app_local.get('key-value', []):
-                key = bytes.fromhex(kv['key']).decode('utf-8', errors='ignore')
-                if kv['value']['type'] == 2:  # uint
-                    state[key] = kv['value']['uint']
-                else:  # bytes
-                    state[key] = kv['value']['bytes']
-            return state
-    return {}
+def get_local_state(address: str, app_id: int) -> LocalState:
+    """Get user's local state from the contract (all zero if not opted in)."""
+    return read_local(algod_client, address, app_id) or LocalState()
 
 
 def check_water_cooldown(address: str, app_id: int) -> tuple:
@@ -79,7 +71,8 @@ def water_plant(user_mnemonic: str, app_id: int) -> dict:
     """
     private_key = mnemonic.to_private_key(user_mnemonic)
     sender = account.address_from_private_key(private_key)
-    params = algod_client.suggested_params()
+    with phase("water", "suggested_params"):
+        params = algod_client.suggested_params()
 
     # Check cooldown before submitting
     can_water, remaining, stage = check_water_cooldown(sender, app_id)
@@ -108,12 +101,17 @@ def water_plant(user_mnemonic: str, app_id: int) -> dict:
         index=app_id,
         app_args=["water"]
     )
+    set_group_fees([txn], params)
 
-    signed_txn = txn.sign(private_key)
-    txid = algod_client.send_transaction(signed_txn)
+    with phase("water", "sign"):
+        signed_txn = txn.sign(private_key)
+    with phase("water", "send_transaction"):
+        txid = algod_client.send_transaction(signed_txn)
     print(f"Watering plant... TXID: {txid}")
     
-    confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    with phase("water", "wait_for_confirmation"):
+        confirmed_txn = wait_for_confirmation(algod_client, txid, 4)
+    record_success("water")
     
     # Get updated state
     new_state = get_local_state(sender, app_id)